@@ -0,0 +1,166 @@
+"""
+Measure the fixed overhead tox-uv adds to tox, independent of the time uv spends creating and installing.
+
+Covers the plugin import time, ``tox l`` / ``tox c`` wall time on generated ``tox.toml`` files (compared against the
+same run with the plugin disabled) and the per environment cost of ``register_config``, ``python_cache`` and
+``env_version_spec``. Nothing is installed, so the numbers only reflect the plugin's own work. Run it via
+``tox r -e bench`` or directly with ``python benchmarks/run.py --output bench.json``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess  # ruff:ignore[suspicious-subprocess-import]
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from functools import wraps
+from importlib.metadata import version
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from unittest import mock
+
+from tox.run import setup_state
+
+from tox_uv._venv import UvVenv
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    from tox.session.state import State
+
+_IMPORT_SCRIPT = "import tox.plugin, tox.config.loader.str_convert\nimport tox_uv.plugin\n"
+# config keys owned by tox-uv or resolved through it, avoiding the ones that need a virtual environment on disk
+_CONFIG_KEYS = ("base_python", "uv_seed", "uv_python_preference", "uv_resolution", "system_site_packages")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", type=Path, default=Path("bench.json"), help="where to write the JSON results")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="environment counts to measure")
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions per measurement")
+    args = parser.parse_args(argv)
+
+    result: dict[str, Any] = {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": sys.platform,
+            "tox": version("tox"),
+            "tox_uv": version("tox-uv-bare"),
+            "repeat": args.repeat,
+        },
+        "import_us": _summary(_import_time() for _ in range(args.repeat)),
+        "cli": {},
+        "per_env_us": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="tox-uv-bench-") as folder:
+        for size in args.sizes:
+            project = Path(folder) / str(size)
+            _write_project(project, size)
+            result["cli"][str(size)] = {
+                "list": _cli_times(project, ["l"], args.repeat),
+                "config": _cli_times(project, ["c", "-k", *_CONFIG_KEYS], args.repeat),
+            }
+            result["per_env_us"][str(size)] = _per_env_costs(project, size)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    sys.stdout.write(f"wrote {args.output}\n")
+    return 0
+
+
+def _write_project(path: Path, size: int) -> None:
+    path.mkdir(parents=True)
+    # spread the environments over python factors so env_version_spec has real work to do
+    names = [f"3.{10 + index % 5}-e{index}" for index in range(size)]
+    env_list = ", ".join(f'"{name}"' for name in names)
+    (path / "tox.toml").write_text(
+        f"env_list = [{env_list}]\n"
+        "[env_run_base]\n"
+        'package = "skip"\n'
+        'deps = ["tomli>=2"]\n'
+        'commands = [["python", "-c", "pass"]]\n',
+        encoding="utf-8",
+    )
+
+
+def _import_time() -> int:
+    outcome = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _IMPORT_SCRIPT], capture_output=True, text=True, check=True
+    )
+    return next(
+        int(line.split("|")[1])
+        for line in outcome.stderr.splitlines()
+        if line.split("|")[-1].strip() == "tox_uv.plugin"
+    )
+
+
+def _cli_times(project: Path, args: list[str], repeat: int) -> dict[str, Any]:
+    with_plugin = [_wall_time(project, args, {}) for _ in range(repeat)]
+    without_plugin = [_wall_time(project, args, {"TOX_DISABLED_EXTERNAL_PLUGINS": "tox-uv"}) for _ in range(repeat)]
+    return {
+        "plugin_s": _summary(with_plugin),
+        "baseline_s": _summary(without_plugin),
+        "overhead_s": statistics.median(with_plugin) - statistics.median(without_plugin),
+    }
+
+
+def _wall_time(project: Path, args: list[str], extra_env: dict[str, str]) -> float:
+    env = {**os.environ, "TOX_USER_CONFIG_FILE": os.devnull, **extra_env}
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "tox", *args], cwd=project, env=env, capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+def _per_env_costs(project: Path, size: int) -> dict[str, Any]:
+    timings: dict[str, list[float]] = {"register_config": [], "python_cache": [], "env_version_spec": []}
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch.dict(os.environ, {"TOX_USER_CONFIG_FILE": os.devnull}))
+        for name, values in timings.items():
+            stack.enter_context(mock.patch.object(UvVenv, name, _timed(getattr(UvVenv, name), values)))
+        state = setup_state(["c", "-c", str(project / "tox.toml"), "--root", str(project)])
+        for env in _run_envs(state):
+            env.python_cache()
+            env.env_version_spec()
+    result: dict[str, Any] = {name: _summary(value * 1_000_000 for value in values) for name, values in timings.items()}
+    result["environments"] = size
+    return result
+
+
+def _run_envs(state: State) -> Iterator[UvVenv]:
+    for name in state.envs.iter(package=False):
+        if isinstance(env := state.envs[name], UvVenv):
+            yield env
+
+
+def _timed(func: Callable[..., Any], into: list[float]) -> Callable[..., Any]:
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:  # ruff:ignore[any-type]
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            into.append(time.perf_counter() - start)
+
+    return wrapper
+
+
+def _summary(values: Iterable[float]) -> dict[str, float]:
+    data = sorted(values)
+    return {
+        "count": len(data),
+        "min": data[0],
+        "median": statistics.median(data),
+        "mean": statistics.fmean(data),
+        "max": data[-1],
+    }
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,58 @@
+"""User level cache shared by all tox invocations."""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from contextlib import suppress
+from pathlib import Path
+from typing import Any
+
+from platformdirs import user_cache_dir
+
+
+def cache_dir() -> Path:
+    """:return: the folder holding data tox-uv persists between runs (``TOX_UV_CACHE_DIR`` overrides it)"""
+    if value := os.environ.get("TOX_UV_CACHE_DIR"):
+        return Path(value)
+    return Path(user_cache_dir("tox-uv", appauthor=False))
+
+
+def load_json(name: str) -> Any:  # ruff:ignore[any-type]
+    """
+    Load a cache entry.
+
+    :param name: the name of the entry within the cache folder
+    :return: the stored value, ``None`` if missing or unreadable
+    """
+    try:
+        return json.loads((cache_dir() / name).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def dump_json(name: str, value: Any) -> None:  # ruff:ignore[any-type]
+    """
+    Store a cache entry; the write is atomic so concurrent tox processes never observe a partial file.
+
+    :param name: the name of the entry within the cache folder
+    :param value: the JSON serializable value to store
+    """
+    path = cache_dir() / name
+    with suppress(OSError):  # the cache is an optimization, never fail the run because of it
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as file_handler:
+                json.dump(value, file_handler)
+            Path(tmp).replace(path)
+        finally:
+            Path(tmp).unlink(missing_ok=True)
+
+
+__all__ = [
+    "cache_dir",
+    "dump_json",
+    "load_json",
+]
@@ -0,0 +1,122 @@
+"""Copy virtual environment trees cheaply, sharing file content with the source where the file system allows it."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+import threading
+from contextlib import suppress
+from pathlib import Path
+from typing import Final
+
+# ioctl request of Linux file systems with copy on write support (btrfs, xfs, ...) to share the extents of a file
+_FICLONE: Final[int] = 0x40049409
+# environments may be cloned from parallel-mode threads, guard the flag below
+_LOCK: Final[threading.Lock] = threading.Lock()
+_REFLINK: dict[str, bool] = {"supported": sys.platform == "linux"}
+# files holding the absolute location of the environment, as written by uv and the installers it runs
+_SCRIPT_DIRS: Final[frozenset[str]] = frozenset({"bin", "Scripts"})
+
+
+def clone_tree(
+    src: Path, dst: Path, *, relocate: tuple[str, str] | None = None, exclude: frozenset[str] = frozenset()
+) -> None:
+    """
+    Copy a directory tree, keeping entries that already exist at the destination.
+
+    Files are reflinked when the file system supports it, hard linked otherwise and only copied as the last resort;
+    installers replace files rather than writing into them, so a shared file is never modified through the copy.
+
+    :param src: the tree to copy
+    :param dst: the destination, created if missing
+    :param relocate: the absolute location the tree was built for and the one it is copied to; files referring to the
+        former are rewritten rather than shared
+    :param exclude: names of top level entries to leave out
+    """
+    dst.mkdir(parents=True, exist_ok=True)
+    for entry in os.scandir(src):
+        if entry.name in exclude:
+            continue
+        source, target = Path(entry.path), dst / entry.name
+        if entry.is_symlink():
+            if not target.is_symlink() and not target.exists():
+                link = str(source.readlink())
+                if relocate is not None and link.startswith(relocate[0]):
+                    link = relocate[1] + link[len(relocate[0]) :]
+                target.symlink_to(link)
+        elif entry.is_dir():
+            clone_tree(source, target, relocate=relocate)
+        elif not target.exists() and (
+            relocate is None or not _rewrite(source, target, relocate, in_scripts=src.name in _SCRIPT_DIRS)
+        ):
+            link_file(source, target)
+
+
+def _rewrite(source: Path, target: Path, relocate: tuple[str, str], *, in_scripts: bool) -> bool:
+    # scripts carry the interpreter in their shebang, path files may point into the environment itself
+    if not (in_scripts or source.name == "pyvenv.cfg" or source.suffix == ".pth"):
+        return False
+    content = source.read_bytes()
+    old, new = (value.encode() for value in relocate)
+    if old not in content:
+        return False
+    target.write_bytes(content.replace(old, new))
+    shutil.copymode(source, target)
+    return True
+
+
+def link_file(source: Path, target: Path) -> None:
+    """
+    Copy a file, sharing its content with the source where the file system allows it.
+
+    :param source: the file to copy
+    :param target: the destination, must not exist
+    """
+    if _try_reflink(source, target):
+        return
+    try:
+        os.link(source, target)
+    except OSError:  # another device, or a file system without hard links
+        shutil.copy2(source, target)
+
+
+def copy_file(source: Path, target: Path) -> None:
+    """
+    Copy a file whose copy must not change when the source is written into, sharing its content only copy on write.
+
+    :param source: the file to copy
+    :param target: the destination, must not exist
+    """
+    if not _try_reflink(source, target):
+        shutil.copy2(source, target)
+
+
+def _try_reflink(source: Path, target: Path) -> bool:
+    if not _REFLINK["supported"]:
+        return False
+    try:
+        _reflink(source, target)
+    except OSError:
+        target.unlink(missing_ok=True)
+        with _LOCK:  # the answer is per file system, but a failed attempt is cheap enough to not track each one
+            _REFLINK["supported"] = False
+        return False
+    return True
+
+
+def _reflink(source: Path, target: Path) -> None:  # pragma: win32 no cover
+    import fcntl  # only available on POSIX  # ruff:ignore[import-outside-top-level]
+
+    with source.open("rb") as src, target.open("wb") as dst:
+        fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+    with suppress(OSError):
+        shutil.copystat(source, target)
+    shutil.copymode(source, target)
+
+
+__all__ = [
+    "clone_tree",
+    "copy_file",
+    "link_file",
+]
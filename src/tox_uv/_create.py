@@ -0,0 +1,270 @@
+"""Set up virtual environments for interpreters uv already reported, without running uv."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess  # ruff:ignore[suspicious-subprocess-import]
+import sys
+import threading
+from contextlib import suppress
+from pathlib import Path
+from typing import Any, Final
+
+from packaging.version import InvalidVersion, Version
+
+from ._cache import cache_dir
+from ._uv import uv_identity
+
+_REFERENCES_DIR: Final[str] = "references"
+# the prompt of the reference environments, replaced by the prompt of the environment the scripts are copied into
+_PROMPT: Final[str] = "tox-uv-prompt"
+# uv writes these as is within the quotes of every activation script, anything else may be escaped per shell
+_LITERAL: Final[re.Pattern[str]] = re.compile(r"[\w.,+/@=\[\]-]+")
+# what uv venv writes next to the interpreter links, copied from the reference environment
+_TOP_LEVEL: Final[tuple[str, ...]] = (".gitignore", "CACHEDIR.TAG")
+
+
+def base_executable(installation: dict[str, Any]) -> Path | None:
+    """
+    Check if a virtual environment for an interpreter can be laid out without uv.
+
+    :param installation: the ``uv python list`` entry of the interpreter
+    :return: the interpreter binary the environment links to, ``None`` if only uv can set the environment up
+    """
+    # Windows environments need launchers and macOS framework builds their stub executable; free-threaded and
+    # alternative implementations use other executable names, leave all of these to uv
+    if sys.platform in {"win32", "darwin"} or (installation.get("implementation"), installation.get("variant")) != (
+        "cpython",
+        "default",
+    ):
+        return None
+    try:
+        python = Path(installation["path"]).resolve(strict=True)
+        with python.open("rb") as handler:
+            script = handler.read(2) == b"#!"
+        Version(installation["version"])
+    except (KeyError, TypeError, OSError, InvalidVersion):
+        return None
+    # shims (pyenv, asdf) are scripts picking the interpreter at run time, only uv can ask them for the real one
+    return None if script else python
+
+
+def venv_matches(venv_dir: Path, python: Path, installation: dict[str, Any], *, system_site_packages: bool) -> bool:
+    """
+    Check if an existing virtual environment is set up for an interpreter, by reading its ``pyvenv.cfg``.
+
+    :param venv_dir: the virtual environment
+    :param python: the interpreter binary as returned by :func:`base_executable`
+    :param installation: the ``uv python list`` entry of the interpreter
+    :param system_site_packages: whether the environment should see the interpreter's site-packages
+    :return: ``True`` if the environment can be used as is
+    """
+    try:
+        config = _read_config(venv_dir / "pyvenv.cfg")
+        linked = (venv_dir / "bin" / "python").resolve(strict=True)
+    except OSError:
+        return False
+    return (
+        linked == python
+        and config.get("version_info") == installation["version"]
+        and config.get("include-system-site-packages") == str(system_site_packages).lower()
+    )
+
+
+def reference_venv(uv_path: str, python: Path, installation: dict[str, Any], *, relocatable: bool) -> Path | None:
+    """
+    Get an environment set up by ``uv venv``, for :func:`write_venv` to copy what uv writes.
+
+    What uv writes only depends on the uv build, the minor version of the interpreter and ``--relocatable``, apart from
+    the location and the prompt; one reference environment per combination is set up and kept in the user cache.
+
+    :param uv_path: the uv binary
+    :param python: the interpreter binary as returned by :func:`base_executable`
+    :param installation: the ``uv python list`` entry of the interpreter
+    :param relocatable: whether the environment is set up with ``--relocatable``
+    :return: the folder holding the environment in ``venv`` and the location uv set it up at in ``origin``, ``None`` if
+        uv could not set it up
+    """
+    if (binary := uv_identity(uv_path)) is None:
+        return None
+    version = Version(installation["version"])
+    inputs = [binary, f"{version.major}.{version.minor}", relocatable]
+    key = hashlib.sha256(json.dumps(inputs).encode()).hexdigest()[:32]
+    root = cache_dir() / _REFERENCES_DIR
+    folder = root / key
+    if (folder / "origin").is_file():
+        return folder
+    staging = root / f".{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+    if not _LITERAL.fullmatch(str(staging)):
+        return None
+    cmd = [uv_path, "venv", "--quiet", "--python", str(python), f"--prompt={_PROMPT}", str(staging / "venv")]
+    if relocatable:
+        cmd.insert(-1, "--relocatable")
+    env = {name: value for name, value in os.environ.items() if not name.startswith("UV_VENV_")}  # e.g. no seeding
+    with suppress(OSError, subprocess.TimeoutExpired):  # left to uv venv, which reports what went wrong
+        try:
+            outcome = subprocess.run(  # ruff:ignore[subprocess-without-shell-equals-true]
+                cmd, capture_output=True, check=False, timeout=60, env=env
+            )
+            if outcome.returncode == 0:
+                (staging / "origin").write_text(str(staging / "venv"), encoding="utf-8")
+                staging.rename(folder)  # fails if a concurrent run set one up first, theirs is as good
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+    return folder if (folder / "origin").is_file() else None
+
+
+def write_venv(  # ruff:ignore[too-many-arguments]
+    venv_dir: Path,
+    python: Path,
+    installation: dict[str, Any],
+    reference: Path,
+    *,
+    prompt: str,
+    system_site_packages: bool,
+) -> bool:
+    """
+    Lay out a virtual environment the way ``uv venv`` does.
+
+    The activation scripts and the configuration are those uv wrote for the reference environment, with its location,
+    prompt and interpreter replaced.
+
+    :param venv_dir: the virtual environment
+    :param python: the interpreter binary as returned by :func:`base_executable`
+    :param installation: the ``uv python list`` entry of the interpreter
+    :param reference: the reference environment as returned by :func:`reference_venv`
+    :param prompt: the prompt of the activation scripts
+    :param system_site_packages: whether the environment should see the interpreter's site-packages
+    :return: ``True`` if set up, ``False`` if the location or the prompt need quoting, which only uv venv gets right
+    """
+    if not all(_LITERAL.fullmatch(value) for value in (str(venv_dir), prompt)):
+        return False
+    template, origin = reference / "venv", (reference / "origin").read_text(encoding="utf-8")
+    version = Version(installation["version"])
+    bin_dir = venv_dir / "bin"
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    (venv_dir / "lib" / f"python{version.major}.{version.minor}" / "site-packages").mkdir(parents=True, exist_ok=True)
+    if "64" in (installation.get("arch") or ""):
+        _symlink(venv_dir / "lib64", "lib")
+    _symlink(bin_dir / "python", str(python))
+    for name in (f"python{version.major}", f"python{version.major}.{version.minor}"):
+        _symlink(bin_dir / name, "python")
+    for name in _TOP_LEVEL:
+        shutil.copyfile(template / name, venv_dir / name)
+    for script in (template / "bin").iterdir():  # the activation scripts
+        if not script.is_symlink():
+            content = script.read_bytes().replace(origin.encode(), str(venv_dir).encode())
+            (bin_dir / script.name).write_bytes(content.replace(_PROMPT.encode(), prompt.encode()))
+            shutil.copymode(script, bin_dir / script.name)
+    # written last, an interrupted run leaves no configuration behind that venv_matches would accept
+    config = _read_config(template / "pyvenv.cfg")
+    config.update({
+        "home": str(python.parent),
+        "version_info": installation["version"],
+        "include-system-site-packages": str(system_site_packages).lower(),
+        "prompt": prompt,
+    })
+    text = "".join(f"{key} = {value}\n" for key, value in config.items())
+    (venv_dir / "pyvenv.cfg").write_text(text, encoding="utf-8")
+    return True
+
+
+def repair_venv(venv_dir: Path, python: Path, installation: dict[str, Any]) -> bool:
+    """
+    Point an environment whose interpreter went away at a compatible one, keeping everything installed.
+
+    A patch release of CPython keeps the ABI, so what is installed for one works with the other.
+
+    :param venv_dir: the virtual environment
+    :param python: the interpreter binary as returned by :func:`base_executable`
+    :param installation: the ``uv python list`` entry of the interpreter
+    :return: ``True`` if the environment now uses the interpreter, ``False`` if it must be recreated
+    """
+    config_file = venv_dir / "pyvenv.cfg"
+    try:
+        config = _read_config(config_file)
+        old, new = Version(config.get("version_info", "")), Version(installation["version"])
+    except (OSError, InvalidVersion):
+        return False
+    # the library folder tells the ABI apart, free-threaded builds use a different one
+    lib = venv_dir / "lib" / f"python{new.major}.{new.minor}"
+    if config.get("implementation", "").lower() != "cpython" or old.release[:2] != new.release[:2] or not lib.is_dir():
+        return False
+    bin_dir = venv_dir / "bin"
+    for link in bin_dir.iterdir():  # the links uv creates point at the interpreter or at the python link
+        if link.is_symlink() and not link.exists() and link.readlink().is_absolute():
+            _symlink(link, str(python))
+    config.update({"home": str(python.parent), "version_info": installation["version"]})
+    config_file.write_text("".join(f"{key} = {value}\n" for key, value in config.items()), encoding="utf-8")
+    return (bin_dir / "python").resolve() == python
+
+
+def relocate_venv(venv_dir: Path, old: str) -> bool:
+    """
+    Fix up an environment moved to another folder, keeping everything installed.
+
+    Only the scripts, the activation scripts, ``pyvenv.cfg`` and the path files of site-packages hold the absolute
+    location of the environment; what Python compiled refers to its source location, which the import system corrects
+    on load.
+
+    :param venv_dir: the virtual environment, at its new location
+    :param old: the absolute location the environment was at before
+    :return: ``True`` if the environment now works at its new location, ``False`` if it must be recreated
+    """
+    new = str(venv_dir)
+    candidates = [venv_dir / "pyvenv.cfg"]
+    for scripts in ("bin", "Scripts"):
+        if (venv_dir / scripts).is_dir():
+            candidates.extend((venv_dir / scripts).iterdir())
+    candidates.extend(venv_dir.glob("lib*/*/site-packages/*.pth"))
+    candidates.extend(venv_dir.glob("Lib/site-packages/*.pth"))
+    try:
+        if not all(_relocate_file(path, old.encode(), new.encode()) for path in candidates):
+            return False
+    except OSError:
+        return False
+    return True
+
+
+def _relocate_file(path: Path, old: bytes, new: bytes) -> bool:
+    if path.is_symlink():
+        if (target := os.fsencode(path.readlink())).startswith(old):
+            _symlink(path, os.fsdecode(new + target[len(old) :]))
+    elif path.is_file() and old in (content := path.read_bytes()):
+        if b"\0" in content:  # launchers embed the location in binary form, with offsets that would shift
+            return False
+        # replace rather than write into, the file may share its content with a snapshot or the uv cache
+        staging = path.with_name(f".{path.name}.tmp")
+        staging.write_bytes(content.replace(old, new))
+        shutil.copymode(path, staging)
+        staging.replace(path)
+    return True
+
+
+def _read_config(path: Path) -> dict[str, str]:
+    result: dict[str, str] = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        key, sep, value = line.partition("=")
+        if sep:
+            result[key.strip()] = value.strip()
+    return result
+
+
+def _symlink(link: Path, target: str) -> None:
+    with suppress(FileNotFoundError):
+        link.unlink()
+    link.symlink_to(target)
+
+
+__all__ = [
+    "base_executable",
+    "reference_venv",
+    "relocate_venv",
+    "repair_venv",
+    "venv_matches",
+    "write_venv",
+]
@@ -0,0 +1,224 @@
+"""Discover interpreters through uv, once per tox process for all environments."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import platform
+import re
+import subprocess  # ruff:ignore[suspicious-subprocess-import]
+import sys
+import sysconfig
+import threading
+from pathlib import Path
+from typing import Any, Final
+
+from packaging.version import InvalidVersion, Version
+from tox.tox_env.python.api import PythonInfo, VersionInfo
+
+from ._interpreter import interpreter_key, load_interpreter, store_interpreter
+
+_LOGGER: Final[logging.Logger] = logging.getLogger(__name__)
+
+# environments may be set up from parallel-mode threads, guard the caches below
+_LOCK: Final[threading.Lock] = threading.Lock()
+_INSTALLATIONS: dict[tuple[str, str, str | None], list[dict[str, Any]] | None] = {}
+_RESOLVED: dict[tuple[str, str, str | None, str], tuple[dict[str, Any] | None, bool]] = {}
+
+# the shapes UvVenv.env_version_spec produces, e.g. cpython3.12, pypy3.10, cpython3.13+freethreaded or
+# cpython-3.12-linux-x86_64-gnu; anything else is left to uv's own discovery
+_SPEC: Final[re.Pattern[str]] = re.compile(
+    r"^(?P<implementation>[a-z]+)-?(?P<major>\d+)(?:\.(?P<minor>\d+))?(?P<freethreaded>\+freethreaded)?"
+    r"(?:-(?P<os>[^-]+)-(?P<arch>[^-]+)-(?P<libc>[^-]+))?$"
+)
+_IMPLEMENTATIONS: Final[dict[str, str]] = {"cpython": "CPython", "pypy": "PyPy", "graalpy": "GraalPy"}
+_PLATFORMS: Final[dict[str, str]] = {"macos": "darwin", "windows": "win32"}
+_RELEASE_LEVELS: Final[dict[str, str]] = {"a": "alpha", "b": "beta", "rc": "candidate"}
+
+
+def find_interpreter(uv_path: str, preference: str, spec: str) -> str | None:
+    """
+    Resolve an interpreter request to an installed interpreter.
+
+    All interpreters uv knows about are listed by one ``uv python list`` call per tox process, every environment then
+    matches its request against that list instead of having uv search the system again.
+
+    :param uv_path: the uv binary
+    :param preference: the ``uv_python_preference`` of the environment, ``none`` for uv's default
+    :param spec: the interpreter request as passed to ``uv venv -p``
+    :return: the absolute path of the matching interpreter, ``None`` if uv has to discover it
+    """
+    installation = _resolve(uv_path, preference, spec)[0]
+    return None if installation is None else str(installation["path"])
+
+
+def find_installation(uv_path: str, preference: str, spec: str) -> dict[str, Any] | None:
+    """
+    Look up what uv reported about the interpreter a request resolves to.
+
+    :param uv_path: the uv binary
+    :param preference: the ``uv_python_preference`` of the environment, ``none`` for uv's default
+    :param spec: the interpreter request as passed to ``uv venv -p``, or the absolute path of an interpreter
+    :return: the ``uv python list`` entry of the installed interpreter, ``None`` if uv has to discover it
+    """
+    if Path(spec).is_absolute():
+        return _describe(uv_path, Path(spec))
+    return _resolve(uv_path, preference, spec)[0]
+
+
+def interpreter_missing(uv_path: str, preference: str, spec: str) -> bool:
+    """
+    Check if uv certainly cannot provide an interpreter for a request, answered from the same listing as
+    :func:`find_interpreter`.
+
+    :param uv_path: the uv binary
+    :param preference: the ``uv_python_preference`` of the environment, ``none`` for uv's default
+    :param spec: the interpreter request as passed to ``uv venv -p``
+    :return: ``True`` if neither an installed interpreter nor a download matches, ``False`` if one does or if the
+        listing cannot tell
+    """
+    return _resolve(uv_path, preference, spec)[1]
+
+
+def _resolve(uv_path: str, preference: str, spec: str) -> tuple[dict[str, Any] | None, bool]:
+    key = uv_path, preference, os.environ.get("PATH")
+    request = *key, spec
+    with _LOCK:
+        if request not in _RESOLVED:
+            if key not in _INSTALLATIONS:
+                _INSTALLATIONS[key] = _list_installations(uv_path, preference)
+            matches, missing = _match(_INSTALLATIONS[key], spec)
+            _RESOLVED[request] = _choose(preference, spec, matches), missing
+        return _RESOLVED[request]
+
+
+def _choose(preference: str, spec: str, matches: list[dict[str, Any]]) -> dict[str, Any] | None:
+    """
+    Pick the installed interpreter uv itself would use for a request.
+
+    The listing is sorted by version rather than in the order uv discovers interpreters, so the installations satisfying
+    the request are ranked the way uv searches for them: for its default and the ``managed`` preferences the
+    interpreters uv manages come first, newest first, otherwise those on ``PATH`` in the order of its entries.
+
+    :return: the listing entry of the interpreter, ``None`` if uv has to discover it
+    """
+    installed = [entry for entry in matches if entry.get("path")]
+    managed_first = preference in {"none", "managed", "only-managed"}
+    search_path = [os.path.normcase(i) for i in os.environ.get("PATH", "").split(os.pathsep) if i]
+
+    def discovery_order(entry: dict[str, Any]) -> tuple[bool, int]:
+        path = Path(entry["path"])
+        if entry.get("key") in path.parts:  # uv installs the interpreters it manages in a folder named after the key
+            return not managed_first, 0
+        folder = os.path.normcase(str(path.parent))
+        return managed_first, search_path.index(folder) if folder in search_path else len(search_path)
+
+    if (chosen := min(installed, key=discovery_order, default=None)) is not None:  # first listed among equals
+        _LOGGER.debug("resolved Python request %s to %s", spec, chosen["path"])
+    return chosen
+
+
+def interpreter_info(uv_path: str, path: Path) -> PythonInfo | None:
+    """
+    Describe the interpreter at an absolute path as uv sees it.
+
+    The result is persisted per interpreter build, so later tox invocations do not need to ask uv again.
+
+    :param uv_path: the uv binary
+    :param path: the interpreter executable
+    :return: the interpreter information, ``None`` if uv does not recognize it as a Python interpreter
+    """
+    if (found := _describe(uv_path, path)) is None:
+        return None
+    try:
+        version = Version(found["version"])
+    except InvalidVersion:
+        return None
+    release_level, serial = (_RELEASE_LEVELS[version.pre[0]], version.pre[1]) if version.pre else ("final", 0)
+    arch = found.get("arch") or ""
+    return PythonInfo(
+        implementation=_IMPLEMENTATIONS.get(found["implementation"], found["implementation"]),
+        version_info=VersionInfo(version.major, version.minor, version.micro, release_level, serial),
+        version=found["version"],
+        is_64="64" in arch or arch == "s390x",
+        platform=_PLATFORMS.get(found.get("os") or "", found.get("os") or sys.platform),
+        extra={"executable": str(path)},
+        free_threaded="freethreaded" in (found.get("variant") or ""),
+        machine=arch or None,
+    )
+
+
+def _describe(uv_path: str, path: Path) -> dict[str, Any] | None:
+    if path == Path(sys.executable):  # tox's own interpreter needs no subprocess to describe
+        return _running_installation()
+    if (key := interpreter_key(path)) is None or (found := load_interpreter(key)) is None:
+        found = next(iter(_list_installations(uv_path, "none", str(path)) or []), None)
+        if found is not None and key is not None:
+            store_interpreter(key, found)
+    return found
+
+
+def _running_installation() -> dict[str, Any]:
+    # mirrors an entry of uv python list
+    return {
+        "implementation": sys.implementation.name,
+        "version": platform.python_version(),
+        "variant": "freethreaded" if sysconfig.get_config_var("Py_GIL_DISABLED") else "default",
+        "os": {"darwin": "macos", "win32": "windows"}.get(sys.platform, sys.platform),
+        "arch": platform.machine().lower(),
+        "path": sys.executable,
+    }
+
+
+def _list_installations(uv_path: str, preference: str, request: str | None = None) -> list[dict[str, Any]] | None:
+    cmd = [uv_path, "python", "list", "--output-format", "json", "--color", "never"]
+    # without a request list the downloads for every architecture too, so a missing match means uv cannot provide it
+    cmd.extend(("--all-arches",) if request is None else ("--only-installed", request))
+    if preference != "none":
+        cmd.extend(("--python-preference", preference))
+    try:
+        result = subprocess.run(  # ruff:ignore[subprocess-without-shell-equals-true]
+            cmd,
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=60,
+        )
+        installations = json.loads(result.stdout) if result.returncode == 0 else None
+    except (subprocess.TimeoutExpired, OSError, ValueError):
+        installations = None
+    if not isinstance(installations, list):
+        _LOGGER.debug("could not list Python installations via uv, each environment discovers its own")
+        return None
+    return [entry for entry in installations if isinstance(entry, dict)]
+
+
+def _match(installations: list[dict[str, Any]] | None, spec: str) -> tuple[list[dict[str, Any]], bool]:
+    """:return: the entries of the listing satisfying the request, and whether uv certainly cannot provide it"""
+    if installations is None or (request := _SPEC.match(spec)) is None:
+        return [], False
+    wanted = {
+        "implementation": request["implementation"],
+        "variant": "freethreaded" if request["freethreaded"] else "default",
+        **{field: request[field] for field in ("os", "arch", "libc") if request[field] is not None},
+    }
+    version = [int(request["major"])] + ([] if request["minor"] is None else [int(request["minor"])])
+
+    def satisfies(entry: dict[str, Any]) -> bool:
+        parts = entry.get("version_parts") or {}
+        return [parts.get("major"), parts.get("minor")][: len(version)] == version and all(
+            entry.get(field, "default" if field == "variant" else None) == value for field, value in wanted.items()
+        )
+
+    matches = [entry for entry in installations if satisfies(entry)]
+    # platform names differ between uv and tox for some architectures, only trust a miss on the version itself
+    return matches, not matches and request["os"] is None
+
+
+__all__ = [
+    "find_installation",
+    "find_interpreter",
+    "interpreter_info",
+    "interpreter_missing",
+]
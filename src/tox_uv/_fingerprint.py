@@ -0,0 +1,137 @@
+"""Fingerprint source trees, hashing only the files that changed since the last run."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess  # ruff:ignore[suspicious-subprocess-import]
+from pathlib import Path
+from typing import Any, Final
+
+# kept within the tox environment folder, recreating the environment starts over
+INDEX_FILE: Final[str] = ".tox-fingerprint.json"
+# left out unless git tracks them: version control data, tool caches and build output
+_SKIP_DIRS: Final[frozenset[str]] = frozenset({
+    ".git",
+    ".hg",
+    ".mypy_cache",
+    ".nox",
+    ".pytest_cache",
+    ".ruff_cache",
+    ".svn",
+    ".tox",
+    ".venv",
+    "__pycache__",
+    "build",
+    "dist",
+    "node_modules",
+})
+_SHA256_HEX_LENGTH: Final[int] = 64
+
+
+def fingerprint(root: Path, index: Path, *, exclude: Path | None = None) -> str:
+    """
+    Digest the content of a source tree.
+
+    Within a git checkout git tells which files differ from its index, leaving out what it ignores; the object ids of
+    all other files are taken from the git index as they are. Files that differ are only read again when their size or
+    modification time differs from what our own index recorded for them. Files are digested the way git names
+    objects, so staging a change leaves the fingerprint as is. The checked out commit is part of the fingerprint too,
+    build backends such as hatch-vcs or setuptools-scm derive the project version from it.
+
+    :param root: the source tree
+    :param index: the file recording size, modification time and digest of each file read by the last run
+    :param exclude: a folder to leave out, e.g. the tox working folder when it is not ignored
+    :return: the fingerprint of the tree, changes whenever a file is added, removed, renamed or changed
+    """
+    content = _load(index)
+    known: dict[str, list[Any]] = content.get(str(root), {})
+    skip = f"{exclude.relative_to(root).as_posix()}/" if exclude is not None and exclude.is_relative_to(root) else "\0"
+    staged, changed, head = _git_listing(root) or ({}, _walk(root), "")
+    digests = {name: digest for name, digest in staged.items() if not name.startswith(skip)}
+    algorithm = "sha256" if len(next(iter(staged.values()), "")) == _SHA256_HEX_LENGTH else "sha1"
+    entries: dict[str, list[Any]] = {}
+    base = f"{root}{os.sep}"  # plain strings, path objects cost more than the stat calls on large trees
+    for name in changed:
+        digests.pop(name, None)
+        if name.startswith(skip):
+            continue
+        path = f"{base}{name}"
+        try:
+            stat = os.stat(path)  # ruff:ignore[os-stat]
+            if (entry := known.get(name)) is None or entry[0] != stat.st_size or entry[1] != stat.st_mtime_ns:
+                entry = [stat.st_size, stat.st_mtime_ns, _object_id(Path(path).read_bytes(), algorithm)]
+        except OSError:  # deleted, or not a regular file
+            continue
+        entries[name], digests[name] = entry, entry[2]
+    if entries != known:
+        content[str(root)] = entries
+        staging = index.with_name(f"{index.name}.tmp")
+        staging.write_text(json.dumps(content), encoding="utf-8")
+        staging.replace(index)
+    result = hashlib.sha256(f"{head}\0".encode())
+    for name in sorted(digests):
+        result.update(f"{name}\0{digests[name]}\0".encode())
+    return result.hexdigest()
+
+
+def _git_listing(root: Path) -> tuple[dict[str, str], list[str], str] | None:
+    """
+    :return: the object id of each file git tracks, the files differing from those and the checked out commit (empty
+             before the first commit), ``None`` if not a checkout
+    """
+    if (git := shutil.which("git")) is None:
+        return None
+    base = [git, "-C", str(root)]
+    listing = [*base, "ls-files", "-z", "--exclude-standard"]
+    try:  # all run at the same time, the second listing scans the working tree
+        processes = [
+            subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)  # ruff:ignore[subprocess-without-shell-equals-true]
+            for cmd in ([*listing, "--stage"], [*listing, "--modified", "--others"], [*base, "rev-parse", "HEAD"])
+        ]
+        outputs = [process.communicate(timeout=30)[0] for process in processes]
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+    if processes[0].returncode or processes[1].returncode:
+        return None
+    staged, changed = ([name for name in output.decode().split("\0") if name] for output in outputs[:2])
+    objects: dict[str, str] = {}
+    for record in staged:  # <mode> SP <object> SP <stage> TAB <file>
+        tab = record.index("\t")
+        objects[record[tab + 1 :]] = record[7 : tab - 2]
+    changed = [name for name in changed if name in objects or not any(map(_skipped, name.split("/")[:-1]))]
+    return objects, changed, "" if processes[2].returncode else outputs[2].decode().strip()
+
+
+def _walk(root: Path) -> list[str]:
+    result: list[str] = []
+    for folder, dirs, files in os.walk(root):
+        dirs[:] = [i for i in dirs if not _skipped(i)]
+        prefix = Path(folder).relative_to(root).as_posix()
+        result.extend(name if prefix == "." else f"{prefix}/{name}" for name in files)
+    return result
+
+
+def _skipped(folder: str) -> bool:
+    return folder in _SKIP_DIRS or folder.endswith(".egg-info")
+
+
+def _object_id(data: bytes, algorithm: str) -> str:
+    """:return: the name git gives to a file with this content"""
+    return hashlib.new(algorithm, b"blob %d\0%b" % (len(data), data)).hexdigest()
+
+
+def _load(index: Path) -> dict[str, Any]:
+    try:
+        value = json.loads(index.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return value if isinstance(value, dict) else {}
+
+
+__all__ = [
+    "INDEX_FILE",
+    "fingerprint",
+]
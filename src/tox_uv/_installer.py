@@ -8,21 +8,30 @@ from collections import defaultdict
 from collections.abc import Sequence
 from functools import cached_property
 from itertools import chain
-from typing import TYPE_CHECKING, Any, Final
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final, cast
 
 if sys.version_info >= (3, 11):  # pragma: no cover (py311+)
     import tomllib
 else:  # pragma: no cover (py311+)
     import tomli as tomllib
-from packaging.requirements import Requirement
-from packaging.utils import parse_sdist_filename, parse_wheel_filename
+from packaging.markers import default_environment
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.utils import canonicalize_name, parse_sdist_filename, parse_wheel_filename
 from tox.config.types import Command
+from tox.execute.request import StdinSource
 from tox.tox_env.errors import Fail, Recreate
 from tox.tox_env.python.package import EditableLegacyPackage, EditablePackage, SdistPackage, WheelPackage
 from tox.tox_env.python.pip.pip_install import Pip
 from tox.tox_env.python.pip.req_file import PythonDeps
 
+from ._fingerprint import INDEX_FILE, fingerprint
+from ._interpreter import interpreter_key, query_interpreter
+from ._layer import layer_excludes
 from ._package_types import UvEditablePackage, UvPackage
+from ._requirements import diff_requirements
+from ._template import restore_template, store_template, template_key
+from ._uv import ensure_uv_supports
 
 if TYPE_CHECKING:
     from tox.config.main import Config
@@ -32,6 +41,7 @@ if TYPE_CHECKING:
 
 
 _LOGGER: Final[logging.Logger] = logging.getLogger(__name__)
+_SEED_PACKAGES: Final[frozenset[str]] = frozenset({"pip", "setuptools", "wheel"})  # what uv venv --seed may install
 
 _UV_RESOLUTION_ENV_VARS: frozenset[str] = frozenset({
     "UV_CONSTRAINT",
@@ -64,6 +74,7 @@ class UvInstaller(Pip):
 
     def __init__(self, tox_env: UvVenv, with_list_deps: bool = True) -> None:  # ruff:ignore[boolean-type-hint-positional-argument, boolean-default-value-positional-argument]
         self._with_list_deps = with_list_deps
+        self._from_template = False
         super().__init__(tox_env)
 
     def freeze_cmd(self) -> list[str]:
@@ -90,6 +101,18 @@ class UvInstaller(Pip):
             desc="Define the resolution strategy for uv",
             post_process=uv_resolution_post_process,
         )
+        self._env.conf.add_config(
+            keys=["uv_template"],
+            of_type=bool,
+            default=False,
+            desc="populate new environments from the dependencies an identical environment installed before",
+        )
+        self._env.conf.add_config(
+            keys=["uv_reconcile"],
+            of_type=bool,
+            default=False,
+            desc="uninstall what removed dependencies pulled in rather than recreating the environment",
+        )
 
     def default_install_command(self, conf: Config, env_name: str | None) -> Command:  # ruff:ignore[unused-method-argument]
         cmd = [self.uv, "pip", "install", "{opts}", "{packages}"]
@@ -101,26 +124,27 @@ class UvInstaller(Pip):
         install_command = cmd.args
         pip_pre: bool = self._env.conf["pip_pre"]
         uv_resolution: str = self._env.conf["uv_resolution"]
+        if install_command[:3] == [self.uv, "pip", "install"]:
+            ensure_uv_supports(
+                self.uv, "pip install", ["--prerelease"] * pip_pre + ["--resolution"] * bool(uv_resolution)
+            )
+        flags: list[str] = []
+        if pip_pre:
+            flags.extend(("--prerelease", "allow"))
+        if uv_resolution:
+            flags.extend(("--resolution", uv_resolution))
         try:
             opts_at = install_command.index("{opts}")
         except ValueError:
-            if pip_pre:
-                install_command.extend(("--prerelease", "allow"))
-            if uv_resolution:
-                install_command.extend(("--resolution", uv_resolution))
+            install_command.extend(flags)
         else:
-            opts: list[str] = []
-            if pip_pre:
-                opts.extend(("--prerelease", "allow"))
-            if uv_resolution:
-                opts.extend(("--resolution", uv_resolution))
-            install_command[opts_at : opts_at + 1] = opts
+            install_command[opts_at : opts_at + 1] = flags
         return cmd
 
     def install(self, arguments: Any, section: str, of_type: str) -> None:  # ruff:ignore[any-type]
         # can happen if the original python was upgraded to a newer version and
-        # the symlinks become orphan.
-        if not self._env.env_python().resolve().is_file():
+        # the symlinks become orphan, a patch upgrade is repaired in place.
+        if not self._env.env_python().resolve().is_file() and not self._env._repair_interpreter():  # ruff:ignore[private-member-access]
             msg = "existing venv is broken"
             raise Recreate(msg)
 
@@ -132,6 +156,160 @@ class UvInstaller(Pip):
             _LOGGER.warning("uv cannot install %r", arguments)  # pragma: no cover
             raise SystemExit(1)  # pragma: no cover
 
+    def _install_requirement_file(self, arguments: PythonDeps, section: str, of_type: str) -> None:
+        key = self._template_key(arguments, of_type)
+        self._from_template = key is not None and restore_template(key, self._env.venv_dir)
+        try:
+            try:
+                super()._install_requirement_file(arguments, section, of_type)
+            except Recreate as exception:
+                if not exception.args[0].startswith("requirements removed") or not self._reconcile_requirement_file(
+                    arguments, section, of_type
+                ):
+                    raise
+                super()._install_requirement_file(arguments, section, of_type)  # installs what was added, if any
+        finally:
+            from_template, self._from_template = self._from_template, False
+        if key is not None and not from_template:
+            store_template(key, self._env.venv_dir)
+
+    def _reconcile_requirement_file(self, arguments: PythonDeps, section: str, of_type: str) -> bool:
+        """:return: ``True`` if what removed requirements pulled in was uninstalled, the cache no longer lists them"""
+        old = self._cached(section, of_type)
+        _, lines = arguments.unroll()
+        new = [line for line in lines if not line.startswith("-c ")]
+        if not self._reconcile(section, of_type, old["requirements"], new):
+            return False
+        kept = [line for line in old["requirements"] if line in new]
+        with self._env.cache.compare({**old, "requirements": kept}, section, of_type):
+            pass
+        return True
+
+    def _reconcile(self, section: str, of_type: str, old: list[str], new: list[str]) -> bool:
+        """
+        Uninstall the packages only the removed requirements needed, the way ``uv pip sync`` would.
+
+        What each requirement set needs is resolved along with everything else installed into the environment, the
+        packages needed before but not anymore are extraneous.
+
+        :param section: the cache section of the requirements
+        :param of_type: the kind of install within the section
+        :param old: the requirements the environment was set up with
+        :param new: the requirements the environment is asked for now
+        :return: ``True`` if reconciled, ``False`` if the environment has to be recreated
+        """
+        if not self._env.conf["uv_reconcile"]:
+            return False
+        options: list[str] = []
+        others: list[str] = []
+        for name, sub_sections in self._cache_content().items():
+            for kind, value in sub_sections.items() if isinstance(sub_sections, dict) else ():
+                if isinstance(value, dict):
+                    options.extend(value.get("options") or [])
+                    if (name, kind) != (section, of_type):
+                        others.extend(value.get("requirements") or value.get("req") or [])
+        # local projects would need a build to tell what they depend on, that is as costly as recreating
+        if not all(_is_index_requirement(line) for line in chain(others, old, new)):
+            return False
+        before, after = self._resolve([*options, *others, *old]), self._resolve([*options, *others, *new])
+        if before is None or after is None:
+            return False
+        seeded = _SEED_PACKAGES if self._env.conf["uv_seed"] else frozenset()
+        if extraneous := sorted(before - after - seeded):
+            _LOGGER.warning("uninstall %s, no longer needed", ", ".join(extraneous))
+            cmd = [self.uv, "pip", "uninstall", "--python", str(self._env.env_python()), *extraneous]
+            self._env.execute(cmd, stdin=StdinSource.OFF, run_id="uninstall_removed", show=None).assert_success()
+            self._forget_project_installs()
+        return True
+
+    def _forget_project_installs(self) -> None:
+        """Have the projects uv builds installed again, only a build tells what they depend on and so may be gone."""
+        for sub_sections in self._cache_content().values():
+            kinds = [i for i in sub_sections if i.endswith("_sources")] if isinstance(sub_sections, dict) else []
+            for kind in kinds:
+                del sub_sections[kind]
+
+    def _resolve(self, lines: list[str]) -> set[str] | None:
+        """:return: the names of all packages the requirements need, ``None`` if they cannot be resolved"""
+        requirements = self._env.env_tmp_dir / "reconcile.in"
+        requirements.parent.mkdir(parents=True, exist_ok=True)
+        requirements.write_text("".join(f"{line}\n" for line in lines), encoding="utf-8")
+        cmd = [self.uv, "--color", "never", "pip", "compile", str(requirements), "--no-header", "--no-annotate"]
+        cmd.extend(("--python", str(self._env.env_python())))
+        if self._env.conf["pip_pre"]:
+            cmd.extend(("--prerelease", "allow"))
+        if self._env.conf["uv_resolution"]:
+            cmd.extend(("--resolution", self._env.conf["uv_resolution"]))
+        outcome = self._env.execute(cmd, stdin=StdinSource.OFF, run_id="resolve", show=False)
+        if outcome.exit_code:
+            return None
+        pinned = (line.strip() for line in outcome.out.splitlines())
+        return {canonicalize_name(Requirement(line).name) for line in pinned if line and line[0] not in "#-"}
+
+    def _cached(self, section: str, of_type: str) -> Any:  # ruff:ignore[any-type]
+        """:return: what the last run stored for an install, ``None`` if nothing"""
+        value = self._cache_content().get(section)
+        return value.get(of_type) if isinstance(value, dict) else None
+
+    def _cache_content(self) -> dict[str, Any]:
+        return self._env.cache._content  # ruff:ignore[private-member-access]
+
+    def _execute_installer(self, deps: Sequence[Any], of_type: str) -> None:
+        if self._from_template:  # the template holds what this would install, tox still records it as installed
+            return
+        if self._env.conf["install_command"].args[:3] == [self.uv, "pip", "install"]:
+            # known once the environment is created, uv does not follow path files so tell it what the layer provides
+            if (layer := self._env._base_layer()) is not None:  # ruff:ignore[private-member-access]
+                deps = ["--excludes", str(layer_excludes(layer)), *deps]
+            ensure_uv_supports(self.uv, "pip install", [str(i) for i in deps])
+        super()._execute_installer(deps, of_type)
+
+    def _deps_cache_value(self, arguments: PythonDeps) -> dict[str, Any]:
+        """
+        :param arguments: the dependencies
+        :return: what installing the dependencies records in the cache of the environment, known without installing
+        :raises ValueError: if the dependencies or the constraints cannot be read
+        """
+        options, lines = arguments.unroll()
+        _, constraints = self.constraints.unroll()
+        return {
+            "options": options,
+            "requirements": [line for line in lines if not line.startswith("-c ")],
+            "constraints": [line for line in lines if line.startswith("-c ")] + constraints,
+            "constraint_options": {
+                "constrain_package_deps": self.constrain_package_deps,
+                "use_frozen_constraints": self.use_frozen_constraints,
+            },
+            "env": self._install_env_vars(),
+        }
+
+    def _template_key(self, arguments: PythonDeps, of_type: str) -> str | None:
+        # only the dependencies of a fresh environment, the template has nothing to offer for one already populated
+        if of_type != "deps" or not self._env.conf["uv_template"] or not self._env._created:  # ruff:ignore[private-member-access]
+            return None
+        try:
+            options, requirements = arguments.unroll()
+            _, constraints = self.constraints.unroll()
+        except ValueError:
+            return None  # reported by the install itself
+        if not requirements or not all(_is_index_requirement(line.removeprefix("-c ")) for line in requirements):
+            return None
+        interpreter = interpreter_key(self._env.env_python(), self._env.venv_dir / "pyvenv.cfg")
+        if interpreter is None:
+            return None
+        inputs = {
+            "seed": self._env.conf["uv_seed"],
+            "resolution": self._env.conf["uv_resolution"],
+            "pip_pre": self._env.conf["pip_pre"],
+            "options": options,
+            "requirements": requirements,
+            "constraints": constraints,
+            "constraint_options": [self.constrain_package_deps, self.use_frozen_constraints],
+            "env": self._install_env_vars(),
+            "base_layer": None if (layer := self._env._base_layer()) is None else layer.name,  # ruff:ignore[private-member-access]
+        }
+        return template_key(interpreter, inputs)
+
     @cached_property
     def _sourced_pkg_names(self) -> set[str]:
         pyproject_file = self._env.conf._conf.src_path.parent / "pyproject.toml"  # ruff:ignore[private-member-access]
@@ -150,17 +328,17 @@ class UvInstaller(Pip):
         of_type: str,
     ) -> None:
         groups: dict[str, list[str]] = defaultdict(list)
+        sourced = False  # a dependency of a package comes from the workspace rather than from an index
         for arg in arguments:
             if isinstance(arg, Requirement):  # pragma: no branch
                 groups["req"].append(str(arg))  # pragma: no cover
             elif isinstance(arg, (WheelPackage, SdistPackage, EditablePackage)):
                 for pkg in arg.deps:
-                    if (
-                        isinstance(pkg, Requirement)
-                        and pkg.name in self._sourced_pkg_names
-                        and "." not in groups["uv_editable"]
-                    ):
-                        groups["uv_editable"].append(".")
+                    if isinstance(pkg, Requirement) and pkg.name in self._sourced_pkg_names:
+                        sourced = True
+                        if "." not in groups["uv_editable"]:  # the root provides the workspace members
+                            groups["uv_editable"].append(".")
+                            groups["projects"].append(str(self._env.core["tox_root"]))
                         continue
                     groups["req"].append(str(pkg))
                 parser = parse_sdist_filename if isinstance(arg, SdistPackage) else parse_wheel_filename
@@ -172,46 +350,155 @@ class UvInstaller(Pip):
             elif isinstance(arg, UvPackage):
                 extras_suffix = f"[{','.join(arg.extras)}]" if arg.extras else ""
                 groups["uv"].append(f"{arg.path}{extras_suffix}")
+                groups["projects"].append(str(arg.path))  # built by uv itself
             elif isinstance(arg, UvEditablePackage):
                 extras_suffix = f"[{','.join(arg.extras)}]" if arg.extras else ""
                 groups["uv_editable"].append(f"{arg.path}{extras_suffix}")
+                groups["projects"].append(str(arg.path))
             else:  # pragma: no branch
                 _LOGGER.warning("uv install %r", arg)  # pragma: no cover
                 raise SystemExit(1)  # pragma: no cover
+        groups["reinstall"] = self._reinstall_flags(groups["projects"])
         req_of_type = f"{of_type}_deps" if groups["pkg"] or groups["dev_pkg"] else of_type
         for value in groups.values():
             value.sort()
         constraint_args = self.constraints.as_root_args
         cache_value = {"req": groups["req"], "env": self._install_env_vars(), "constraints": constraint_args}
         with self._env.cache.compare(cache_value, section, req_of_type) as (eq, old):
+            new_deps: list[str] = []
             if not eq:  # pragma: no branch
                 old_req: list[str] = old["req"] if isinstance(old, dict) else (old or [])
-                miss = sorted(set(old_req) - set(groups["req"]))
-                if miss:  # no way yet to know what to uninstall here (transitive dependencies?)  # pragma: no branch
-                    msg = f"dependencies removed: {', '.join(str(i) for i in miss)}"  # pragma: no cover
-                    raise Recreate(msg)  # pragma: no cover
-                new_deps = sorted(set(groups["req"]) - set(old_req)) or list(groups["req"])
-                if new_deps:  # pragma: no branch
-                    new_deps.extend(constraint_args)
-                    self._execute_installer(new_deps, req_of_type)
-        install_args = ["--reinstall"]
-        if groups["uv"]:
-            self._execute_installer(install_args + groups["uv"] + constraint_args, of_type)
-        if groups["uv_editable"]:
-            requirements = list(chain.from_iterable(("-e", entry) for entry in groups["uv_editable"]))
-            self._execute_installer(install_args + requirements + constraint_args, of_type)
-        install_args.append("--no-deps")
-        if groups["pkg"]:
-            self._execute_installer(install_args + groups["pkg"], of_type)
-        if groups["dev_pkg"]:
-            for entry in groups["dev_pkg"]:
-                install_args.extend(("-e", str(entry)))
-            self._execute_installer(install_args, of_type)
+                changes = diff_requirements(old_req, groups["req"], self._marker_environment())
+                if changes["removed"] and (
+                    sourced or not self._reconcile(section, req_of_type, old_req, groups["req"])
+                ):
+                    msg = f"dependencies removed: {', '.join(sorted(changes['removed']))}"
+                    raise Recreate(msg)
+                for change, lines in changes.items():
+                    if lines:
+                        _LOGGER.info("dependencies %s: %s", change, ", ".join(sorted(lines)))
+                # a loosened requirement is satisfied by what is installed, a spelling change needs no install at all
+                new_deps = sorted(changes["added"] + changes["tightened"])
+                resolution = {key: cache_value[key] for key in ("env", "constraints")}
+                if not new_deps and (
+                    not isinstance(old, dict) or {key: old.get(key) for key in resolution} != resolution
+                ):
+                    new_deps = list(groups["req"])  # resolved differently now, let uv revisit all of them
+            self._install_planned(groups, new_deps, constraint_args, (req_of_type, of_type), merge=not sourced)
+        self._install_projects(groups, constraint_args, section, of_type)
+
+    def _reinstall_flags(self, projects: list[str]) -> list[str]:
+        """
+        :param projects: the folders of the projects uv builds
+        :return: the flags reinstalling the projects and the workspace members they may depend on, but not the
+            dependencies, which ``--reinstall`` would; ``--reinstall`` if a project does not state its name
+        """
+        names = [_project_name(Path(path)) for path in projects]
+        if None in names:
+            return ["--reinstall"]
+        members = {canonicalize_name(name) for name in self._sourced_pkg_names}
+        return [f"--reinstall-package={name}" for name in sorted({*cast("list[str]", names), *members})]
+
+    def _install_planned(
+        self,
+        groups: dict[str, list[str]],
+        new_deps: list[str],
+        constraint_args: list[str],
+        of_types: tuple[str, str],
+        *,
+        merge: bool,
+    ) -> None:
+        """
+        Install the groups with as few uv invocations, and so resolutions and site-packages scans, as possible.
+
+        :param groups: what to install, by group
+        :param new_deps: the dependencies of the packages not installed yet
+        :param constraint_args: the constraint arguments of the environment
+        :param of_types: the kind of install the dependencies of the packages and the packages are reported as
+        :param merge: whether the packages may be resolved along with their dependencies, not the case when some of
+            those come from the workspace instead of an index
+        """
+        req_of_type, of_type = of_types
+        packages = groups["pkg"]
+        if merge and new_deps and packages:
+            # tox lists the dependencies of built packages, resolving the packages along with them finds the same set;
+            # reinstall only the packages by name, --reinstall would reinstall every dependency too
+            reinstall = [f"--reinstall-package={entry.partition('@')[0]}" for entry in packages]
+            self._execute_installer([*reinstall, *new_deps, *packages, *constraint_args], of_type)
+            packages = []
+        elif new_deps:
+            self._execute_installer([*new_deps, *constraint_args], req_of_type)
+        # dependencies installed above already, the packages themselves only
+        without_deps = packages + list(chain.from_iterable(("-e", entry) for entry in groups["dev_pkg"]))
+        if without_deps:
+            self._execute_installer(["--reinstall", "--no-deps", *without_deps], of_type)
+
+    def _install_projects(
+        self, groups: dict[str, list[str]], constraint_args: list[str], section: str, of_type: str
+    ) -> None:
+        """
+        Install the projects uv builds itself, their dependencies are resolved by the same invocation.
+
+        Skipped when neither the invocation nor the sources of the projects changed since the last install, building
+        the projects again would produce what is installed already.
+
+        :param groups: what to install, by group
+        :param constraint_args: the constraint arguments of the environment
+        :param section: the cache section of the install
+        :param of_type: the kind of install the projects are reported as
+        """
+        with_deps = groups["uv"] + list(chain.from_iterable(("-e", entry) for entry in groups["uv_editable"]))
+        if not with_deps:
+            return
+        cmd = [*groups["reinstall"], *with_deps, *constraint_args]
+        index, work_dir = self._env.env_dir / INDEX_FILE, self._env.core["work_dir"]
+        sources = {path: fingerprint(Path(path), index, exclude=work_dir) for path in groups["projects"]}
+        value = {"cmd": cmd, "env": self._install_env_vars(), "sources": sources}
+        with self._env.cache.compare(value, section, f"{of_type}_sources") as (eq, _):
+            if eq:
+                _LOGGER.info("skip reinstalling %s, sources unchanged", ", ".join(groups["projects"]))
+            else:
+                self._execute_installer(cmd, of_type)
+
+    def _marker_environment(self) -> dict[str, str]:
+        """:return: the environment markers evaluate against, for the interpreter of the environment"""
+        request = Path(self._env.python_request())
+        if request.is_absolute() and (query := query_interpreter(request)) is not None:
+            return cast("dict[str, str]", query["markers"])
+        python = self._env.base_python  # not installed yet, uv downloads it
+        version = python.version_info
+        return {
+            **default_environment(),  # the host values, the environment runs on the same machine
+            "implementation_name": python.impl_lower,
+            "platform_python_implementation": python.implementation,
+            "python_version": python.version_dot,
+            "python_full_version": f"{version.major}.{version.minor}.{version.micro}",
+            "sys_platform": python.platform,
+        }
 
     def _install_env_vars(self) -> dict[str, str]:
         return {k: v for k, v in self._env.environment_variables.items() if k in _UV_RESOLUTION_ENV_VARS}
 
 
+def _project_name(path: Path) -> str | None:
+    # the name is only known without a build when the project states it statically
+    try:
+        with (path / "pyproject.toml").open("rb") as file_handler:
+            name = tomllib.load(file_handler).get("project", {}).get("name")
+    except (OSError, tomllib.TOMLDecodeError):
+        return None
+    return canonicalize_name(name) if isinstance(name, str) else None
+
+
+def _is_index_requirement(line: str) -> bool:
+    # local paths and files change without their requirement line changing, those cannot be shared
+    try:
+        requirement = Requirement(line)
+    except InvalidRequirement:
+        return False
+    return not (requirement.url or "").startswith("file:")
+
+
 __all__ = [
     "UvInstaller",
 ]
@@ -0,0 +1,127 @@
+"""Remember what the interpreter of a virtual environment reported across tox invocations."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import subprocess  # ruff:ignore[suspicious-subprocess-import]
+import threading
+from functools import cache
+from importlib.resources import as_file, files
+from typing import TYPE_CHECKING, Any, Final
+
+from ._cache import cache_dir, dump_json, load_json
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# environments may be set up from parallel-mode threads, guard the cache below
+_LOCK: Final[threading.Lock] = threading.Lock()
+_LOADED: dict[str, dict[str, Any]] = {}
+_INTERPRETERS_FILE: Final[str] = "interpreters.json"
+
+
+def interpreter_key(python: Path, pyvenv_cfg: Path | None = None, *, queried: bool = False) -> str | None:
+    """
+    Identify what an interpreter would report when queried.
+
+    The key is built from the interpreter a virtual environment links to rather than the environment itself, so all
+    environments created from the same base interpreter share one entry.
+
+    :param python: the python executable
+    :param pyvenv_cfg: the configuration file of the virtual environment, ``None`` for a base interpreter
+    :param queried: for a base interpreter, whether the key is for what it reports when queried itself rather than for
+        what uv reports about it
+    :return: the cache key, ``None`` if the interpreter cannot be inspected
+    """
+    try:
+        interpreter = python.resolve(strict=True)
+        stat = interpreter.stat()
+        config = "" if pyvenv_cfg is None else pyvenv_cfg.read_text(encoding="utf-8")
+    except OSError:
+        return None
+    # the prompt is the only per environment value, everything else is determined by the base interpreter
+    lines = sorted({
+        line.strip() for line in config.splitlines() if line.split("=", 1)[0].strip() not in {"", "prompt"}
+    })
+    source = "uv" if pyvenv_cfg is None and not queried else _query_digest()
+    digest = hashlib.sha256("\n".join([source, *lines]).encode()).hexdigest()[:16]
+    return f"{interpreter}|{stat.st_mtime_ns}|{stat.st_size}|{digest}"
+
+
+def load_interpreter(key: str) -> dict[str, Any] | None:
+    """
+    :param key: the key as returned by :func:`interpreter_key`
+    :return: the stored query result, ``None`` if the interpreter has not been queried yet
+    """
+    with _LOCK:
+        result = _entries().get(key)
+    return result if isinstance(result, dict) else None
+
+
+def store_interpreter(key: str, info: dict[str, Any]) -> None:
+    """
+    Persist a query result.
+
+    :param key: the key as returned by :func:`interpreter_key`
+    :param info: the query result
+    """
+    with _LOCK:
+        entries = _entries()
+        # drop entries for previous builds of the same interpreter so the file does not grow across upgrades
+        path, build = key.split("|", 1)[0], key.rsplit("|", 1)[0]
+        for other in [i for i in entries if i.split("|", 1)[0] == path and i.rsplit("|", 1)[0] != build]:
+            del entries[other]
+        entries[key] = info
+        dump_json(_INTERPRETERS_FILE, entries)
+
+
+def query_interpreter(python: Path) -> dict[str, Any] | None:
+    """
+    Query a base interpreter the way environments are queried, to learn the layout of the environments it creates.
+
+    :param python: the interpreter executable
+    :return: the query result, stored per interpreter build; ``None`` if the interpreter could not be queried
+    """
+    if (key := interpreter_key(python, queried=True)) is not None and (result := load_interpreter(key)) is not None:
+        return result
+    with as_file(files("tox_uv") / "_venv_query.py") as filename:
+        try:
+            outcome = subprocess.run(  # ruff:ignore[subprocess-without-shell-equals-true]
+                [str(python), str(filename)],
+                capture_output=True,
+                text=True,
+                check=False,
+                timeout=60,
+            )
+        except (subprocess.TimeoutExpired, OSError):
+            return None
+    try:
+        result = json.loads(outcome.stdout) if outcome.returncode == 0 else None
+    except ValueError:
+        return None
+    if isinstance(result, dict) and key is not None:
+        store_interpreter(key, result)
+    return result if isinstance(result, dict) else None
+
+
+def _entries() -> dict[str, Any]:
+    location = str(cache_dir() / _INTERPRETERS_FILE)
+    if location not in _LOADED:
+        stored = load_json(_INTERPRETERS_FILE)
+        _LOADED[location] = stored if isinstance(stored, dict) else {}
+    return _LOADED[location]
+
+
+@cache
+def _query_digest() -> str:
+    # a changed query script produces different results, so it must not reuse what the previous one stored
+    return hashlib.sha256((files("tox_uv") / "_venv_query.py").read_bytes()).hexdigest()[:16]
+
+
+__all__ = [
+    "interpreter_key",
+    "load_interpreter",
+    "query_interpreter",
+    "store_interpreter",
+]
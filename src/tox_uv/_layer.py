@@ -0,0 +1,171 @@
+"""Base layers: environments holding heavy dependencies once, for many environments to see through a path file."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import shutil
+from contextlib import suppress
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final
+
+from filelock import Timeout
+from packaging.utils import canonicalize_name
+
+from ._cache import cache_dir
+from ._recreate import move_aside, remove_in_background
+from ._store import store_lock
+
+if TYPE_CHECKING:
+    from packaging.requirements import Requirement
+
+_LOGGER: Final[logging.Logger] = logging.getLogger(__name__)
+
+_LAYERS_DIR: Final[str] = "layers"
+# named to sort before the path files of installed packages, so the layer is on sys.path before they run
+_PTH_FILE: Final[str] = "_tox_uv_base_layer.pth"
+# written once the layer is complete, lists what it holds so uv leaves those packages out of the environment
+_EXCLUDES_FILE: Final[str] = "excludes.txt"
+# written along with the excludes, the version of each package of the layer by normalized name
+_VERSIONS_FILE: Final[str] = "versions.json"
+_FREEZE_LINE: Final[re.Pattern[str]] = re.compile(
+    r"^\s*(?P<name>[A-Za-z0-9][A-Za-z0-9._-]*)(\s*==\s*(?P<version>[^\s;]+))?"
+)
+
+
+def layer_entry(inputs: dict[str, Any]) -> Path:
+    """
+    :param inputs: the JSON serializable values that determine the content of the layer
+    :return: the folder of the layer, its virtual environment lives in the ``venv`` sub-folder
+    """
+    key = hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()[:32]
+    return cache_dir() / _LAYERS_DIR / key
+
+
+def layer_excludes(entry: Path) -> Path:
+    """
+    :param entry: the folder of the layer
+    :return: the requirement file naming the packages of the layer, only present once the layer is built
+    """
+    return entry / _EXCLUDES_FILE
+
+
+def complete_layer(entry: Path, freeze: str) -> Path:
+    """
+    Mark a layer as built.
+
+    :param entry: the folder of the layer
+    :param freeze: the output of ``uv pip freeze`` for the layer
+    :return: the requirement file naming the packages of the layer
+    """
+    matches = [match for line in freeze.splitlines() if (match := _FREEZE_LINE.match(line))]
+    names = sorted({match["name"] for match in matches})
+    versions = {canonicalize_name(match["name"]): match["version"] for match in matches if match["version"]}
+    (entry / _VERSIONS_FILE).write_text(json.dumps(versions, sort_keys=True), encoding="utf-8")
+    excludes = layer_excludes(entry)
+    staging = excludes.with_suffix(".tmp")
+    staging.write_text("".join(f"{name}\n" for name in names), encoding="utf-8")
+    staging.replace(excludes)
+    return excludes
+
+
+def layer_conflicts(entry: Path, requirements: list[Requirement], environment: dict[str, str]) -> list[str]:
+    """
+    :param entry: the folder of the built layer
+    :param requirements: the dependencies of an environment
+    :param environment: the values the markers of the dependencies evaluate against
+    :return: the dependencies asking for a package of the layer in a version, or from a source, the layer does not
+        provide; excluding those from the install would silently leave the environment with the layer's version
+    """
+    try:
+        versions = json.loads((entry / _VERSIONS_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+    result: list[str] = []
+    for requirement in requirements:
+        if (version := versions.get(canonicalize_name(requirement.name))) is None or (
+            requirement.marker is not None and not requirement.marker.evaluate(environment)
+        ):
+            continue
+        if requirement.url or not requirement.specifier.contains(version, prereleases=True):
+            result.append(f"{requirement} (base layer has {version})")
+    return result
+
+
+def layer_linked(site_packages: Path) -> bool:
+    """
+    :param site_packages: the site-packages folder of the environment
+    :return: whether the environment sees the packages of a layer
+    """
+    return (site_packages / _PTH_FILE).is_file()
+
+
+def link_layer(entry: Path, site_packages: Path, layer_site_packages: list[Path]) -> None:
+    """
+    Make the packages of a layer importable from an environment.
+
+    :param entry: the folder of the layer, records the environment as one of its users
+    :param site_packages: the site-packages folder of the environment
+    :param layer_site_packages: the site-packages folders of the layer
+    """
+    site_packages.mkdir(parents=True, exist_ok=True)
+    content = "".join(f"{path}\n" for path in dict.fromkeys(layer_site_packages))
+    pth = site_packages / _PTH_FILE
+    pth.write_text(content, encoding="utf-8")
+    refs = entry / "refs"
+    refs.mkdir(exist_ok=True)
+    (refs / hashlib.sha256(str(pth).encode()).hexdigest()[:16]).write_text(str(pth), encoding="utf-8")
+
+
+def collect_layers() -> None:
+    """Delete the layers no environment links to anymore, e.g. as the environments were recreated or deleted."""
+    try:
+        entries = [i for i in (cache_dir() / _LAYERS_DIR).iterdir() if i.is_dir() and not i.name.startswith(".")]
+    except OSError:
+        return
+    for entry in entries:
+        lock = store_lock(entry)
+        try:  # held while a layer is built and linked, such a layer is in use
+            lock.acquire(timeout=0)
+        except Timeout:
+            continue
+        try:
+            if any(_links(entry, ref) for ref in _refs(entry)):
+                continue
+            _LOGGER.warning("remove unused base layer %s", entry)
+            if (aside := move_aside(entry)) is None:
+                shutil.rmtree(entry, ignore_errors=True)
+                continue
+            remove_in_background(aside)
+            with suppress(OSError):
+                entry.rmdir()
+        finally:
+            lock.release()
+
+
+def _refs(entry: Path) -> list[Path]:
+    try:
+        return list((entry / "refs").iterdir())
+    except OSError:
+        return []
+
+
+def _links(entry: Path, ref: Path) -> bool:
+    """:return: whether the path file the reference names still points into the layer"""
+    try:
+        return f"{entry / 'venv'}" in Path(ref.read_text(encoding="utf-8")).read_text(encoding="utf-8")
+    except OSError:
+        return False
+
+
+__all__ = [
+    "collect_layers",
+    "complete_layer",
+    "layer_conflicts",
+    "layer_entry",
+    "layer_excludes",
+    "layer_linked",
+    "link_layer",
+]
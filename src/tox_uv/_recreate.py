@@ -0,0 +1,125 @@
+"""Recreate environments without waiting for the old one to be deleted."""
+
+from __future__ import annotations
+
+import os
+import subprocess  # ruff:ignore[suspicious-subprocess-import]
+import sys
+from itertools import count
+from typing import TYPE_CHECKING, Any, Final
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# tox keeps its lock of the environment folder for the whole run, it never moves
+_KEEP: Final[frozenset[str]] = frozenset({"file.lock"})
+_COUNTER = count()
+_REMOVE: Final[str] = "import shutil, sys; shutil.rmtree(sys.argv[1], ignore_errors=True)"
+# stands in for a value a cache did not have, distinct from ``None`` which is a valid JSON value
+MISSING: Final[str] = "<missing>"
+
+
+def move_aside(env_dir: Path) -> Path | None:
+    """
+    Move the content of an environment folder into a sibling folder, leaving the environment folder empty.
+
+    Renames within a folder are atomic and independent of how many files the environment holds.
+
+    :param env_dir: the environment folder
+    :return: the folder now holding the old content, ``None`` if it could not be moved and must be deleted in place
+    """
+    aside = env_dir.with_name(f".{env_dir.name}.old-{os.getpid()}-{next(_COUNTER)}")
+    moved: list[str] = []
+    try:
+        aside.mkdir()
+        for entry in env_dir.iterdir():
+            if entry.name not in _KEEP:
+                entry.rename(aside / entry.name)
+                moved.append(entry.name)
+    except OSError:  # e.g. a file held open on Windows, put back what moved already
+        for name in moved:
+            (aside / name).rename(env_dir / name)
+        if aside.exists():
+            aside.rmdir()
+        return None
+    return aside
+
+
+def restore(aside: Path, env_dir: Path) -> None:
+    """
+    Put the old content back after the new environment failed to build, discarding what the build left behind.
+
+    :param aside: the folder returned by :func:`move_aside`
+    :param env_dir: the environment folder
+    """
+    if (failed := move_aside(env_dir)) is not None:
+        remove_in_background(failed)
+    for entry in aside.iterdir():
+        entry.rename(env_dir / entry.name)
+    aside.rmdir()
+
+
+def remove_in_background(path: Path) -> None:
+    """
+    Delete a folder from a detached process, so neither this process nor its exit waits for it.
+
+    :param path: the folder to delete
+    """
+    if sys.platform == "win32":  # pragma: win32 cover
+        flags = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:  # pragma: win32 no cover
+        flags = {"start_new_session": True}
+    subprocess.Popen(  # ruff:ignore[subprocess-without-shell-equals-true]
+        [sys.executable, "-c", _REMOVE, str(path)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        **flags,
+    )
+
+
+def leftovers(env_dir: Path) -> list[Path]:
+    """
+    :param env_dir: the environment folder
+    :return: old content of the environment a previous run did not get to delete
+    """
+    return [i for i in env_dir.parent.glob(f".{env_dir.name}.old-*") if i.is_dir()]
+
+
+def cache_diff(old: dict[str, Any], new: dict[str, Any], prefix: str = "") -> dict[str, tuple[Any, Any]]:
+    """
+    Compare two cache values key by key, descending into nested mappings.
+
+    :param old: the value stored by the previous run
+    :param new: the value of this run
+    :param prefix: the dotted path of the mappings compared, empty at the top level
+    :return: the dotted path of each key that differs, mapped to its old and new value (:data:`MISSING` if absent)
+    """
+    result: dict[str, tuple[Any, Any]] = {}
+    for key in dict.fromkeys([*old, *new]):
+        before, after = old.get(key, MISSING), new.get(key, MISSING)
+        if isinstance(before, dict) and isinstance(after, dict):
+            result.update(cache_diff(before, after, f"{prefix}{key}."))
+        elif before != after:
+            result[f"{prefix}{key}"] = before, after
+    return result
+
+
+def is_tolerated(key: str, tolerate: list[str]) -> bool:
+    """
+    :param key: the dotted path of a changed cache key, as returned by :func:`cache_diff`
+    :param tolerate: the keys allowed to change, a key also covers everything nested below it
+    :return: ``True`` if the change does not require recreating the environment
+    """
+    return any(key == allowed or key.startswith(f"{allowed}.") for allowed in tolerate)
+
+
+__all__ = [
+    "MISSING",
+    "cache_diff",
+    "is_tolerated",
+    "leftovers",
+    "move_aside",
+    "remove_in_background",
+    "restore",
+]
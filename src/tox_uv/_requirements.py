@@ -0,0 +1,70 @@
+"""Compare requirement lists by what they ask for, rather than by how they are spelled."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Final
+
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.utils import canonicalize_name
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+# how a requirement changed between two runs, the first two ask for something the environment may not have yet
+CHANGES: Final[tuple[str, ...]] = ("added", "tightened", "loosened", "removed")
+_Key = tuple[frozenset[str], frozenset[str], str | None]
+
+
+def diff_requirements(old: Iterable[str], new: Iterable[str], markers: dict[str, str]) -> dict[str, list[str]]:
+    """
+    Classify the difference between two requirement lists per project.
+
+    Names and extras are normalized and requirements whose markers do not apply to the environment are left out, so
+    ``Foo[b,a]`` and ``foo[a,b]`` are the same requirement. A project asking for additional extras, specifiers or a
+    different URL is tightened: what is installed may no longer satisfy it. One asking for a subset of those is
+    loosened: what is installed still does.
+
+    :param old: the requirements the environment was set up with
+    :param new: the requirements the environment is asked for now
+    :param markers: the marker environment of the interpreter of the environment
+    :return: the lines of ``new`` (of ``old`` for removed) by kind of change, see :data:`CHANGES`
+    """
+    before, after = _by_project(old, markers), _by_project(new, markers)
+    result: dict[str, list[str]] = {change: [] for change in CHANGES}
+    for name, (lines, key) in after.items():
+        if name not in before:
+            result["added"].extend(lines)
+        elif key != (old_key := before[name][1]):
+            loosened = key[0] <= old_key[0] and key[1] <= old_key[1] and key[2] in {None, old_key[2]}
+            result["loosened" if loosened else "tightened"].extend(lines)
+    for name, (lines, _) in before.items():
+        if name not in after:
+            result["removed"].extend(lines)
+    return result
+
+
+def _by_project(lines: Iterable[str], markers: dict[str, str]) -> dict[str, tuple[list[str], _Key]]:
+    result: dict[str, tuple[list[str], _Key]] = {}
+    for line in lines:
+        try:
+            req = Requirement(line)
+        except InvalidRequirement:  # compared as written
+            result[line] = [line], (frozenset(), frozenset(), line)
+            continue
+        if req.marker is not None and not req.marker.evaluate({**markers, "extra": ""}):
+            continue
+        name = canonicalize_name(req.name)
+        extras = frozenset(canonicalize_name(extra) for extra in req.extras)
+        specifiers = frozenset(str(spec) for spec in req.specifier)
+        if name in result:  # a project listed more than once must satisfy all of its lines
+            seen, (seen_extras, seen_specifiers, seen_url) = result[name]
+            result[name] = [*seen, line], (seen_extras | extras, seen_specifiers | specifiers, seen_url or req.url)
+        else:
+            result[name] = [line], (extras, specifiers, req.url)
+    return result
+
+
+__all__ = [
+    "CHANGES",
+    "diff_requirements",
+]
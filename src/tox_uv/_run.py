@@ -3,26 +3,204 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
+import shutil
+from functools import cached_property
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
 
 from packaging.requirements import Requirement
+from tox.execute.request import StdinSource
 from tox.tox_env.python.dependency_groups import resolve as resolve_dependency_groups
 from tox.tox_env.python.runner import PythonRun
 
+from ._interpreter import interpreter_key
+from ._layer import (
+    collect_layers,
+    complete_layer,
+    layer_conflicts,
+    layer_entry,
+    layer_excludes,
+    layer_linked,
+    link_layer,
+)
 from ._package_types import UvEditablePackage, UvPackage
+from ._store import acquire_entry, entry_lock, release_entry, store_entry, store_lock
 from ._venv import UvVenv
 
 if TYPE_CHECKING:
-    from pathlib import Path
+    from filelock import ReadWriteLock
+    from tox.tox_env.api import ToxEnvCreateArgs
+
+    from ._installer import UvInstaller
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class UvVenvRunner(UvVenv, PythonRun):
+    def __init__(self, create_args: ToxEnvCreateArgs) -> None:
+        self._keying_shared_entry = False  # while set, venv_dir is the one of an environment that shares nothing
+        self._reading_entry = False
+        super().__init__(create_args)
+
     @staticmethod
     def id() -> str:
         return "uv-venv-runner"
 
+    def register_config(self) -> None:
+        super().register_config()
+        self.conf.add_config(
+            keys=["uv_shared_env"],
+            of_type=bool,
+            default=False,
+            desc="share one virtual environment between environments with the same interpreter and installs",
+        )
+        self.conf.add_config(
+            keys=["uv_base_deps"],
+            of_type=list[str],
+            default=[],
+            desc="dependencies installed once into a base layer, shared by all environments asking for the same ones",
+        )
+
+    def python_cache(self) -> dict[str, Any]:
+        result = super().python_cache()
+        if (layer := self._layer_entry) is not None:  # the layer asked for, whether the environment could use it or not
+            result["base_layer"] = layer.name
+        return result
+
+    @property
+    def venv_dir(self) -> Path:
+        # the default of system_site_packages reads the environment variables, which contain this very folder
+        if self.conf["uv_shared_env"] and not self._keying_shared_entry:
+            return self._shared_entry / "venv"
+        return super().venv_dir
+
+    @cached_property
+    def _shared_entry(self) -> Path:
+        self._keying_shared_entry = True
+        try:
+            return store_entry(self._shared_entry_inputs())
+        finally:
+            self._keying_shared_entry = False
+
+    def _interpreter_build(self) -> list[str | None]:
+        request = self.python_request()
+        # the build of the interpreter, so an upgraded interpreter gets a new entry instead of a broken one
+        return [request, interpreter_key(Path(request)) if Path(request).is_absolute() else None]
+
+    def _shared_entry_inputs(self) -> dict[str, Any]:
+        installer = cast("UvInstaller", self.installer)
+        try:
+            deps = installer._deps_cache_value(self.conf["deps"])  # ruff:ignore[private-member-access]
+        except ValueError:  # reported by the install, until then key on the configuration as written
+            deps = {"lines": [self.conf["deps"].lines(), self.conf["constraints"].lines()]}
+        return {
+            "python": {**self.python_cache(), "build": self._interpreter_build()},
+            "deps": deps,
+            # what neither of the caches above records, yet changes what ends up installed
+            "system_site_packages": self.conf["system_site_packages"],
+            "install_command": self.conf["install_command"].args,
+            "pip_pre": self.conf["pip_pre"],
+            "resolution": self.conf["uv_resolution"],
+            "package": [self.conf["package"], sorted(self.conf["extras"]), sorted(self.conf["dependency_groups"])],
+        }
+
+    def _base_layer(self) -> Path | None:
+        if (entry := self._layer_entry) is None or not layer_linked(self.env_site_package_dir()):
+            return None  # none asked for, or skipped as the dependencies conflict with it
+        return entry
+
+    def _layer_conflicts(self, entry: Path) -> list[str]:
+        installer = cast("UvInstaller", self.installer)
+        try:
+            parsed = [i.requirement for i in self.conf["deps"].requirements]
+        except ValueError:  # reported by the install
+            return []
+        requirements = [i for i in parsed if isinstance(i, Requirement)]
+        return layer_conflicts(entry, requirements, installer._marker_environment())  # ruff:ignore[private-member-access]
+
+    @cached_property
+    def _layer_entry(self) -> Path | None:
+        if not (deps := self.conf["uv_base_deps"]):
+            return None
+        return layer_entry({
+            "python": self._interpreter_build(),
+            "python_preference": self.conf["uv_python_preference"],
+            "deps": sorted(deps),
+            "pip_pre": self.conf["pip_pre"],
+            "resolution": self.conf["uv_resolution"],
+            "env": cast("UvInstaller", self.installer)._install_env_vars(),  # ruff:ignore[private-member-access]
+        })
+
+    def create_python_env(self) -> None:
+        super().create_python_env()
+        if (entry := self._layer_entry) is None:
+            collect_layers()  # left by environments of other projects, which might not be created again
+            return
+        with store_lock(entry):  # linked before releasing it, so the layer is not collected as unused meanwhile
+            self._build_layer(entry)
+            if conflicts := self._layer_conflicts(entry):
+                _LOGGER.warning("skip base layer %s, dependencies ask for %s", entry.name, ", ".join(conflicts))
+            else:
+                site_packages = self.env_site_package_dir()
+                layouts = {site_packages, self.env_site_package_dir_plat()}
+                # the layer is set up from the same interpreter, so its folders sit at the same place within it
+                layer_site_packages = sorted(entry / "venv" / path.relative_to(self.venv_dir) for path in layouts)
+                link_layer(entry, site_packages, layer_site_packages)
+        collect_layers()
+
+    def _build_layer(self, entry: Path) -> None:
+        with store_lock(entry):  # environments asking for the same layer wait for the first to build it
+            if layer_excludes(entry).exists():
+                return
+            shutil.rmtree(entry, ignore_errors=True)  # left behind by an interrupted build
+            venv = entry / "venv"
+            python = venv / self.env_python().relative_to(self.venv_dir)
+            cmd: list[str] = [self.uv, "venv", "-p", self.python_request()]
+            if self.conf["uv_python_preference"] != "none":
+                cmd.extend(["--python-preference", self.conf["uv_python_preference"]])
+            cmd.append(str(venv))
+            self.execute(cmd, stdin=StdinSource.OFF, run_id="base-layer-venv", show=None).assert_success()
+            cmd = [self.uv, "pip", "install", "--python", str(python)]
+            if self.conf["pip_pre"]:
+                cmd.extend(("--prerelease", "allow"))
+            if self.conf["uv_resolution"]:
+                cmd.extend(("--resolution", self.conf["uv_resolution"]))
+            cmd.extend(self.conf["uv_base_deps"])
+            self.execute(cmd, stdin=StdinSource.OFF, run_id="base-layer-install", show=None).assert_success()
+            cmd = [self.uv, "--color", "never", "pip", "freeze", "--python", str(python)]
+            outcome = self.execute(cmd, stdin=StdinSource.OFF, run_id="base-layer-freeze", show=False)
+            outcome.assert_success()
+            complete_layer(entry, outcome.out)
+
+    @cached_property
+    def _entry_lock(self) -> ReadWriteLock:
+        return entry_lock(self._shared_entry)
+
+    def setup(self) -> None:
+        if not self.conf["uv_shared_env"] or self._run_state["setup"]:
+            super().setup()
+            return
+        # environments sharing the entry take turns installing, none while another one runs its commands
+        with self._entry_lock.write_lock():
+            super().setup()
+            acquire_entry(self._shared_entry, self.env_dir)
+        self._entry_lock.acquire_read()  # released on teardown, once the commands ran
+        self._reading_entry = True
+
+    def _teardown(self) -> None:
+        try:
+            super()._teardown()
+        finally:
+            if self._reading_entry:
+                self._reading_entry = False
+                self._entry_lock.release()
+
+    def _clean(self, transitive: bool = False) -> None:  # ruff:ignore[boolean-type-hint-positional-argument, boolean-default-value-positional-argument]
+        if self.conf["uv_shared_env"] and not self._run_state["clean"]:
+            with self._entry_lock.write_lock():
+                release_entry(self._shared_entry, self.env_dir)
+        super()._clean(transitive)
+
     @property
     def _package_tox_env_type(self) -> str:
         return "uv-venv-pep-517"
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import hashlib
+import logging
 import sys
 from pathlib import Path
-from typing import TYPE_CHECKING, Literal, cast
+from typing import TYPE_CHECKING, Any, Final, Literal, cast
 
 from tox.execute.request import StdinSource
 from tox.report import HandledError
@@ -12,6 +14,9 @@ from tox.tox_env.python.package import SdistPackage, WheelPackage
 from tox.tox_env.python.runner import add_extras_to_env, add_skip_missing_interpreters_to_core
 from tox.tox_env.runner import RunToxEnv
 
+from ._fingerprint import INDEX_FILE, fingerprint
+from ._interpreter import interpreter_key
+from ._uv import ensure_uv_supports
 from ._venv import UvVenv
 
 if sys.version_info >= (3, 11):  # pragma: no cover (py311+)
@@ -22,6 +27,10 @@ else:  # pragma: no cover (py311+)
 if TYPE_CHECKING:
     from tox.tox_env.package import Package
 
+_LOGGER: Final[logging.Logger] = logging.getLogger(__name__)
+# the files describing a project to uv, a local source changing any of them needs a new sync
+_PROJECT_FILES: Final[tuple[str, ...]] = ("pyproject.toml", "setup.py", "setup.cfg")
+
 
 class UvVenvLockRunner(UvVenv, RunToxEnv):
     @staticmethod
@@ -93,13 +102,15 @@ class UvVenvLockRunner(UvVenv, RunToxEnv):
         super()._setup_env()
         install_pkg = getattr(self.options, "install_pkg", None)
         if not getattr(self.options, "skip_uv_sync", False):
-            outcome = self.execute(
-                self._build_uv_sync_cmd(install_pkg),
-                stdin=StdinSource.OFF,
-                run_id="uv-sync",
-                show=self.options.verbosity > 2,  # ruff:ignore[magic-value-comparison]
-            )
-            outcome.assert_success()
+            cmd = self._build_uv_sync_cmd(install_pkg)
+            if (state := self._sync_state(cmd)) is None:
+                self._uv_sync(cmd)
+            else:
+                with self.cache.compare(state, "uv-sync") as (eq, _):
+                    if eq:
+                        _LOGGER.info("skip uv sync, the lock, project and environment are unchanged")
+                    else:
+                        self._uv_sync(cmd)
         if install_pkg is not None:
             path = Path(install_pkg)
             self._install(
@@ -108,6 +119,41 @@ class UvVenvLockRunner(UvVenv, RunToxEnv):
                 of_type="external",
             )
 
+    def _uv_sync(self, cmd: list[str]) -> None:
+        outcome = self.execute(
+            cmd,
+            stdin=StdinSource.OFF,
+            run_id="uv-sync",
+            show=self.options.verbosity > 2,  # ruff:ignore[magic-value-comparison]
+        )
+        outcome.assert_success()
+
+    def _sync_state(self, cmd: list[str]) -> dict[str, Any] | None:
+        """:return: what the outcome of ``uv sync`` depends on, ``None`` if it has to run regardless"""
+        package_root = self._resolved_package_root()
+        # uv uses the lock of the workspace the project belongs to, the closest one up the tree
+        lock = next((i / "uv.lock" for i in (package_root, *package_root.parents) if (i / "uv.lock").is_file()), None)
+        python = interpreter_key(self.env_python(), self.venv_dir / "pyvenv.cfg")
+        if lock is None or python is None:
+            return None
+        files, trees = [lock, *(package_root / name for name in _PROJECT_FILES)], [package_root]
+        for source in _local_sources(lock):  # workspace members and path dependencies
+            if source.is_dir():
+                files.extend(source / name for name in _PROJECT_FILES if source != package_root)
+                trees.append(source)
+            else:
+                files.append(source)
+        state = {
+            "cmd": cmd,
+            "python": python,
+            "env": {k: v for k, v in sorted(self.environment_variables.items()) if k.startswith("UV_")},
+            "files": {str(path): _digest(path) for path in files},
+        }
+        if self.conf["package"] in {"wheel", "uv"}:  # built from source, a changed source file needs a new sync
+            index, work_dir = self.env_dir / INDEX_FILE, self.core["work_dir"]
+            state["sources"] = {str(tree): fingerprint(tree, index, exclude=work_dir) for tree in dict.fromkeys(trees)}
+        return state
+
     def _build_uv_sync_cmd(self, install_pkg: str | None) -> list[str]:
         package_root = self._resolved_package_root()
         cmd = [self.uv, "sync"]
@@ -132,8 +178,9 @@ class UvVenvLockRunner(UvVenv, RunToxEnv):
         if package in {"wheel", "uv"}:
             cmd.extend(_no_editable_args(package_root))
         self._add_group_args(cmd)
+        ensure_uv_supports(self.uv, "sync", cmd)
         cmd.extend(self.conf["uv_sync_flags"])
-        cmd.extend(("-p", self.env_version_spec()))
+        cmd.extend(("-p", self.python_request()))
         return cmd
 
     def _resolved_package_root(self) -> Path:
@@ -163,6 +210,30 @@ class UvVenvLockRunner(UvVenv, RunToxEnv):
         return env
 
 
+def _local_sources(lock: Path) -> list[Path]:
+    try:
+        with lock.open("rb") as file_handler:
+            packages = tomllib.load(file_handler).get("package", [])
+    except (OSError, tomllib.TOMLDecodeError):
+        return []
+    result: list[Path] = []
+    for package in packages:
+        source = package.get("source", {}) if isinstance(package, dict) else {}
+        result.extend(
+            (lock.parent / location).resolve()
+            for kind in ("editable", "directory", "virtual", "path")
+            if isinstance(location := source.get(kind), str)
+        )
+    return sorted(set(result))
+
+
+def _digest(path: Path) -> str | None:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
 def _no_editable_args(package_root: Path) -> list[str]:
     project_file = package_root / "pyproject.toml"
     name = None
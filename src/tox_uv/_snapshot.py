@@ -0,0 +1,134 @@
+"""Snapshot environments after setup, to undo what commands changed in them before the next run."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Final
+
+from ._clone import copy_file
+from ._fingerprint import INDEX_FILE
+
+# lives within the environment, so recreating or moving the environment takes the snapshot along
+SNAPSHOT_DIR: Final[str] = ".tox-snapshot"
+# what tox keeps within the environment folder about its own state, never part of a snapshot
+_TOX_ENTRIES: Final[frozenset[str]] = frozenset({
+    SNAPSHOT_DIR,
+    INDEX_FILE,
+    ".tox-info.json",
+    ".lock",
+    "file.lock",
+    "log",
+    "tmp",
+})
+# written by the interpreter as modules get imported, rebuilt from the sources when missing or stale
+_BYTECODE_DIR: Final[str] = "__pycache__"
+_DIR: Final[str] = "dir"
+_LINK: Final[str] = "link"
+
+
+def take_snapshot(venv_dir: Path) -> None:
+    """
+    Record the current content of an environment, updating only what changed since the last snapshot.
+
+    Files are reflinked into the snapshot where the file system supports it and copied otherwise, never hard linked:
+    commands may write into files of the environment, which would change a snapshot sharing them.
+
+    :param venv_dir: the virtual environment
+    """
+    folder = venv_dir / SNAPSHOT_DIR
+    recorded, current = _load_manifest(folder), _scan(venv_dir)
+    if recorded == current:
+        return
+    tree = folder / "tree"
+    if recorded is None:  # nothing tells what an interrupted update left behind, start over
+        shutil.rmtree(tree, ignore_errors=True)
+    (folder / "manifest.json").unlink(missing_ok=True)  # invalid until the tree matches again
+    _sync(venv_dir, tree, current, recorded or {})
+    staging = folder / "manifest.json.tmp"
+    staging.write_text(json.dumps(current), encoding="utf-8")
+    staging.replace(folder / "manifest.json")
+
+
+def rollback(venv_dir: Path) -> bool:
+    """
+    Bring an environment back to its last snapshot.
+
+    :param venv_dir: the virtual environment
+    :return: ``True`` if the environment changed since the snapshot and was restored, ``False`` if it was unchanged or
+        has no snapshot
+    """
+    folder = venv_dir / SNAPSHOT_DIR
+    if (recorded := _load_manifest(folder)) is None:
+        return False
+    current = _scan(venv_dir)
+    if current == recorded:
+        return False
+    _sync(folder / "tree", venv_dir, recorded, current)
+    return True
+
+
+def _sync(src: Path, dst: Path, wanted: dict[str, list[Any]], present: dict[str, list[Any]]) -> None:
+    """Make ``dst``, whose content is described by ``present``, hold the entries of ``src`` described by ``wanted``."""
+    dst.mkdir(parents=True, exist_ok=True)
+    # deepest first, so folders are empty by the time they are removed
+    for name in sorted(present.keys() - wanted.keys(), key=lambda i: i.count("/"), reverse=True):
+        path = dst / name
+        if present[name][0] == _DIR and not path.is_symlink():
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            path.unlink(missing_ok=True)
+    # parents first, so files always have their folder to go into
+    for name in sorted(wanted, key=lambda i: i.count("/")):
+        if present.get(name) == wanted[name]:
+            continue
+        path, kind = dst / name, wanted[name][0]
+        if present.get(name, [None])[0] == _DIR and not path.is_symlink():
+            shutil.rmtree(path, ignore_errors=True)
+        elif name in present:
+            path.unlink(missing_ok=True)
+        if kind == _DIR:
+            path.mkdir(exist_ok=True)
+        elif kind == _LINK:
+            path.symlink_to(wanted[name][1])
+        else:
+            copy_file(src / name, path)
+
+
+def _scan(venv_dir: Path) -> dict[str, list[Any]]:
+    """:return: the entries of the environment by relative path, with what tells whether they changed"""
+    result: dict[str, list[Any]] = {}
+    pending: list[tuple[str, str]] = [(str(venv_dir), "")]
+    while pending:
+        folder, prefix = pending.pop()
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if (not prefix and entry.name in _TOX_ENTRIES) or entry.name == _BYTECODE_DIR:
+                    continue
+                name = f"{prefix}{entry.name}"
+                if entry.is_symlink():
+                    result[name] = [_LINK, str(Path(entry.path).readlink())]
+                elif entry.is_dir():
+                    result[name] = [_DIR]
+                    pending.append((entry.path, f"{name}/"))
+                else:
+                    stat = entry.stat()
+                    result[name] = [stat.st_size, stat.st_mtime_ns]
+    return result
+
+
+def _load_manifest(folder: Path) -> dict[str, list[Any]] | None:
+    try:
+        value = json.loads((folder / "manifest.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return value if isinstance(value, dict) and (folder / "tree").is_dir() else None
+
+
+__all__ = [
+    "SNAPSHOT_DIR",
+    "rollback",
+    "take_snapshot",
+]
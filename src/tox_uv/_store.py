@@ -0,0 +1,120 @@
+"""Let environments with identical inputs live in one shared virtual environment."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import shutil
+from contextlib import suppress
+from pathlib import Path
+from typing import Any, Final
+
+from filelock import FileLock, ReadWriteLock
+
+from ._cache import cache_dir
+from ._recreate import move_aside, remove_in_background
+
+_LOGGER: Final[logging.Logger] = logging.getLogger(__name__)
+_STORE_DIR: Final[str] = "envs"
+# what the tox environment folder holds in place of the virtual environment, pointing into the store
+_POINTER: Final[str] = "venv"
+
+
+def store_entry(inputs: dict[str, Any]) -> Path:
+    """
+    :param inputs: the JSON serializable values that determine the content of the environment
+    :return: the folder of the shared entry, its virtual environment lives in the ``venv`` sub-folder
+    """
+    key = hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()[:32]
+    return cache_dir() / _STORE_DIR / key
+
+
+def store_lock(entry: Path) -> FileLock:
+    """
+    :param entry: the shared entry
+    :return: the lock to hold while building the entry
+    """
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    # next to the entry, so it outlives the entry being deleted; one instance per entry keeps it reentrant
+    return FileLock(entry.parent / f"{entry.name}.lock", is_singleton=True)
+
+
+def entry_lock(entry: Path) -> ReadWriteLock:
+    """
+    :param entry: the shared entry
+    :return: the lock of one tox environment on the entry, to hold exclusively while the environment sets up,
+        populates or releases the entry, and shared while its commands run in it
+    """
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    # an instance per environment, environments set up from parallel-mode threads wait for each other like processes
+    return ReadWriteLock(entry.parent / f"{entry.name}.db", is_singleton=False)
+
+
+def acquire_entry(entry: Path, env_dir: Path) -> None:
+    """
+    Record that a tox environment uses a shared entry.
+
+    :param entry: the shared entry
+    :param env_dir: the folder of the tox environment
+    """
+    refs = entry / "refs"
+    refs.mkdir(parents=True, exist_ok=True)
+    (refs / _ref_name(env_dir)).write_text(str(env_dir), encoding="utf-8")
+    pointer = env_dir / _POINTER
+    if not pointer.is_symlink() or pointer.readlink() != entry / "venv":
+        pointer.unlink(missing_ok=True)
+        pointer.symlink_to(entry / "venv", target_is_directory=True)
+
+
+def release_entry(entry: Path, env_dir: Path) -> None:
+    """
+    Drop the reference of a tox environment, deleting the shared entry once no environment uses it.
+
+    :param entry: the shared entry
+    :param env_dir: the folder of the tox environment
+    """
+    refs = entry / "refs"
+    (refs / _ref_name(env_dir)).unlink(missing_ok=True)
+    remaining = 0
+    with suppress(OSError):
+        for ref in refs.iterdir():
+            if _in_use(entry, ref):
+                remaining += 1
+            else:  # the tox environment folder was deleted without tox
+                ref.unlink(missing_ok=True)
+    # an environment whose interpreter went away is of no use to the remaining references either
+    if remaining and (entry / "venv" / "pyvenv.cfg").exists() and _interpreter_exists(entry / "venv"):
+        _LOGGER.info("keep shared environment %s, used by %d other environment(s)", entry, remaining)
+        return
+    _LOGGER.warning("remove shared environment %s", entry)
+    if (aside := move_aside(entry)) is None:
+        shutil.rmtree(entry, ignore_errors=True)
+        return
+    remove_in_background(aside)
+    with suppress(OSError):  # empty by now, unless written into meanwhile
+        entry.rmdir()
+
+
+def _ref_name(env_dir: Path) -> str:
+    return hashlib.sha256(str(env_dir).encode()).hexdigest()[:16]
+
+
+def _in_use(entry: Path, ref: Path) -> bool:
+    try:
+        return (Path(ref.read_text(encoding="utf-8")) / _POINTER).readlink() == entry / "venv"
+    except OSError:
+        return False
+
+
+def _interpreter_exists(venv_dir: Path) -> bool:
+    return any(python.exists() for python in (venv_dir / "bin" / "python", venv_dir / "Scripts" / "python.exe"))
+
+
+__all__ = [
+    "acquire_entry",
+    "entry_lock",
+    "release_entry",
+    "store_entry",
+    "store_lock",
+]
@@ -0,0 +1,124 @@
+"""Share installed dependencies between environments built from the same interpreter and requirements."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from contextlib import suppress
+from typing import TYPE_CHECKING, Any, Final
+
+from filelock import Timeout
+
+from ._cache import cache_dir
+from ._clone import clone_tree
+from ._fingerprint import INDEX_FILE
+from ._recreate import move_aside, remove_in_background
+from ._snapshot import SNAPSHOT_DIR
+from ._store import store_lock
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_LOGGER: Final[logging.Logger] = logging.getLogger(__name__)
+_TEMPLATES_DIR: Final[str] = "templates"
+# what tox keeps within the environment folder about its own state, never part of a template
+_TOX_ENTRIES: Final[frozenset[str]] = frozenset({SNAPSHOT_DIR, INDEX_FILE, ".tox-info.json", ".lock", "log", "tmp"})
+# templates no environment was populated from for this long are deleted the next time a template is stored
+MAX_UNUSED_SECONDS: Final[int] = 30 * 24 * 60 * 60
+
+
+def template_key(interpreter: str, inputs: dict[str, Any]) -> str:
+    """
+    :param interpreter: the interpreter key of the environment, see :func:`tox_uv._interpreter.interpreter_key`
+    :param inputs: the JSON serializable values that determine what gets installed
+    :return: the name of the template
+    """
+    return hashlib.sha256(json.dumps([interpreter, inputs], sort_keys=True).encode()).hexdigest()[:32]
+
+
+def restore_template(key: str, venv_dir: Path) -> bool:
+    """
+    Populate an environment from a template, leaving what the environment already has as is.
+
+    :param key: the name of the template
+    :param venv_dir: the virtual environment
+    :return: ``True`` if a template was found and cloned
+    """
+    folder = cache_dir() / _TEMPLATES_DIR / key
+    with store_lock(folder):  # held while cloning, so the template is not pruned meanwhile
+        try:
+            origin = (folder / "origin").read_text(encoding="utf-8")
+        except OSError:
+            return False
+        with suppress(OSError):
+            os.utime(folder / "origin")  # the last use, which pruning goes by
+        clone_tree(folder / "venv", venv_dir, relocate=(origin, str(venv_dir)))
+    _LOGGER.info("populated %s from template %s", venv_dir, key)
+    return True
+
+
+def store_template(key: str, venv_dir: Path) -> None:
+    """
+    Remember an environment as template, unless one is stored already.
+
+    :param key: the name of the template
+    :param venv_dir: the virtual environment
+    """
+    root = cache_dir() / _TEMPLATES_DIR
+    folder = root / key
+    if folder.exists():
+        return
+    staging = root / f".{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with suppress(OSError):  # templates are an optimization, never fail the run because of them
+        try:
+            clone_tree(venv_dir, staging / "venv", exclude=_TOX_ENTRIES)
+            (staging / "origin").write_text(str(venv_dir), encoding="utf-8")
+            staging.rename(folder)  # fails if a concurrent run stored the same template first, theirs is as good
+            _LOGGER.info("stored %s as template %s", venv_dir, key)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+    prune_templates()
+
+
+def prune_templates() -> None:
+    """Delete the templates no environment was populated from for :data:`MAX_UNUSED_SECONDS`."""
+    try:
+        entries = [i for i in (cache_dir() / _TEMPLATES_DIR).iterdir() if i.is_dir() and not i.name.startswith(".")]
+    except OSError:
+        return
+    for entry in entries:
+        lock = store_lock(entry)
+        try:  # held while an environment is populated from the template
+            lock.acquire(timeout=0)
+        except Timeout:
+            continue
+        try:
+            try:
+                used = (entry / "origin").stat().st_mtime
+            except OSError:
+                used = 0  # never completed, nothing can be populated from it
+            if time.time() - used < MAX_UNUSED_SECONDS:
+                continue
+            _LOGGER.info("remove unused template %s", entry)
+            if (aside := move_aside(entry)) is None:
+                shutil.rmtree(entry, ignore_errors=True)
+                continue
+            remove_in_background(aside)
+            with suppress(OSError):
+                entry.rmdir()
+        finally:
+            lock.release()
+
+
+__all__ = [
+    "MAX_UNUSED_SECONDS",
+    "prune_templates",
+    "restore_template",
+    "store_template",
+    "template_key",
+]
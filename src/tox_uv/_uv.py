@@ -0,0 +1,214 @@
+"""Locate the uv binary once per tox process."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess  # ruff:ignore[suspicious-subprocess-import]
+import threading
+from itertools import chain
+from typing import Final
+
+from tox.tox_env.errors import Fail
+
+from ._cache import dump_json, load_json
+
+_LOGGER: Final[logging.Logger] = logging.getLogger(__name__)
+
+# environments may be set up from parallel-mode threads, guard the caches below; reentrant as the lazy version probe
+# can be formatted by a log call issued while the lock is held
+_LOCK: Final[threading.RLock] = threading.RLock()
+_FOUND: dict[tuple[str | None, str | None], str] = {}
+_VERSIONS: dict[str, str] = {}
+_UNSUPPORTED: dict[str, dict[str, list[str]] | None] = {}
+
+# flags tox-uv may pass to uv that are newer than uv itself, mapped to a dummy value when they need one; uv hides some
+# flags from its help output, so support is probed by parsing them alongside --help rather than by reading the help
+_PROBES: Final[dict[str, dict[str, str | None]]] = {
+    "venv": {
+        "--python-preference": "system",
+        "--seed": None,
+        "--system-site-packages": None,
+    },
+    "sync": {
+        "--frozen": None,
+        "--group": "x",
+        "--locked": None,
+        "--no-default-groups": None,
+        "--no-editable": None,
+        "--no-install-project": None,
+        "--only-group": "x",
+        "--python-preference": "system",
+        "--reinstall-package": "x",
+        "--resolution": "highest",
+    },
+    "pip install": {
+        "--excludes": "x",
+        "--prerelease": "allow",
+        "--reinstall-package": "x",
+        "--resolution": "highest",
+    },
+}
+_PROBES_DIGEST: Final[str] = hashlib.sha256(json.dumps(_PROBES, sort_keys=True).encode()).hexdigest()[:16]
+_UNEXPECTED_ARG: Final[re.Pattern[str]] = re.compile(r"unexpected argument '(--[\w-]+)'")
+_CAPABILITIES_FILE: Final[str] = "uv-capabilities.json"
+
+
+def find_uv() -> str:
+    """:return: the uv binary to use, discovered at most once per tox process"""
+    key = os.environ.get("TOX_UV_PATH"), os.environ.get("PATH")
+    with _LOCK:
+        if (uv_path := _FOUND.get(key)) is None:
+            uv_path = _FOUND[key] = _discover(key[0])
+    return uv_path
+
+
+def uv_version(uv_path: str) -> str:
+    """:return: the version reported by the uv binary, probed at most once per binary"""
+    with _LOCK:
+        if (version := _VERSIONS.get(uv_path)) is None:
+            version = _VERSIONS[uv_path] = _probe_version(uv_path)
+    return version
+
+
+def ensure_uv_supports(uv_path: str, command: str, args: list[str]) -> None:
+    """
+    Fail before invoking uv if it is too old to understand the flags tox-uv wants to pass.
+
+    :param uv_path: the uv binary
+    :param command: the uv sub-command, e.g. ``sync`` or ``pip install``
+    :param args: the arguments passed to the sub-command
+    """  # ruff:ignore[docstring-missing-exception]
+    used = {arg.split("=", 1)[0] for arg in args if arg.startswith("--")}
+    if missing := sorted(used.intersection(_unsupported_flags(uv_path).get(command, ()))):
+        msg = f"{uv_version(uv_path)} at {uv_path} does not support {', '.join(missing)} for uv {command}, upgrade uv"
+        raise Fail(msg)
+
+
+def uv_identity(uv_path: str) -> str | None:
+    """:return: what tells a build of the uv binary apart without running it, ``None`` if the binary is missing"""
+    try:
+        stat = os.stat(uv_path)  # ruff:ignore[os-stat]
+    except OSError:
+        return None
+    return f"{os.path.realpath(uv_path)}|{stat.st_ino}|{stat.st_mtime_ns}"
+
+
+def _unsupported_flags(uv_path: str) -> dict[str, list[str]]:
+    if (binary := uv_identity(uv_path)) is None:
+        return {}
+    identity = f"{binary}|{_PROBES_DIGEST}"
+    with _LOCK:
+        if identity not in _UNSUPPORTED:
+            _UNSUPPORTED[identity] = _load_unsupported_flags(uv_path, identity)
+        return _UNSUPPORTED[identity] or {}
+
+
+def _load_unsupported_flags(uv_path: str, identity: str) -> dict[str, list[str]] | None:
+    stored = load_json(_CAPABILITIES_FILE)
+    stored = stored if isinstance(stored, dict) else {}
+    if isinstance(result := stored.get(identity), dict):
+        return result
+    result = {}
+    for command, probes in _PROBES.items():
+        if (unsupported := _probe_flags(uv_path, command, probes)) is None:
+            return None  # could not tell, assume everything works and let uv report errors
+        result[command] = unsupported
+    # drop entries for previous builds of the same binary so the file does not grow across upgrades
+    prefix = identity.split("|", 1)[0]
+    stored = {key: value for key, value in stored.items() if key.split("|", 1)[0] != prefix}
+    stored[identity] = result
+    dump_json(_CAPABILITIES_FILE, stored)
+    return result
+
+
+def _probe_flags(uv_path: str, command: str, probes: dict[str, str | None]) -> list[str] | None:
+    pending = dict(probes)
+    unsupported: list[str] = []
+    while pending:
+        args = chain.from_iterable((flag,) if value is None else (flag, value) for flag, value in pending.items())
+        try:
+            result = subprocess.run(  # ruff:ignore[subprocess-without-shell-equals-true]
+                [uv_path, *command.split(), *args, "--help"],
+                capture_output=True,
+                text=True,
+                check=False,
+                timeout=10,
+            )
+        except (subprocess.TimeoutExpired, OSError):
+            return None
+        if result.returncode == 0:
+            break
+        if (match := _UNEXPECTED_ARG.search(result.stderr)) is None or match.group(1) not in pending:
+            return None
+        del pending[match.group(1)]
+        unsupported.append(match.group(1))
+    return sorted(unsupported)
+
+
+class _LazyVersion:
+    """Defers the ``uv --version`` probe until a log record mentioning it is actually emitted."""
+
+    def __init__(self, uv_path: str) -> None:
+        self._uv_path = uv_path
+
+    def __str__(self) -> str:
+        return uv_version(self._uv_path)
+
+
+def _discover(uv_env: str | None) -> str:
+    # Check for explicit override first
+    if uv_env:
+        if not (uv_path := shutil.which(uv_env)):
+            msg = f"TOX_UV_PATH={uv_env} not found in PATH"
+            raise RuntimeError(msg)
+        _LOGGER.warning("using uv from TOX_UV_PATH: %s (%s)", uv_path, _LazyVersion(uv_path))
+        return uv_path
+
+    # Try bundled uv (when installed via tox-uv meta package)
+    with contextlib.suppress(ImportError, FileNotFoundError):
+        from uv import find_uv_bin  # type: ignore[import-not-found]  # ruff:ignore[import-outside-top-level]
+
+        uv_bin = find_uv_bin()  # pragma: no cover
+        _LOGGER.debug("using bundled uv from: %s", uv_bin)  # pragma: no cover
+        return uv_bin  # pragma: no cover
+
+    # Fall back to system uv (when using tox-uv-bare)
+    if not (uv_path := shutil.which("uv")):  # pragma: no cover
+        msg = (  # pragma: no cover
+            "uv not found. Either:\n"
+            "  1. Install with bundled uv: pip install tox-uv\n"
+            "  2. Install tox-uv-bare and ensure system uv is in PATH: which uv\n"
+            "  3. Set TOX_UV_PATH environment variable to uv binary location"
+        )
+        raise RuntimeError(msg)  # pragma: no cover
+
+    _LOGGER.debug("using system uv from PATH: %s (%s)", uv_path, _LazyVersion(uv_path))
+    return uv_path
+
+
+def _probe_version(uv_path: str) -> str:
+    try:
+        result = subprocess.run(  # ruff:ignore[subprocess-without-shell-equals-true]
+            [uv_path, "--version"],
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=5,
+        )
+        return result.stdout.strip() if result.returncode == 0 else "unknown"
+    except (subprocess.TimeoutExpired, OSError):
+        return "unknown"
+
+
+__all__ = [
+    "ensure_uv_supports",
+    "find_uv",
+    "uv_identity",
+    "uv_version",
+]
@@ -2,12 +2,9 @@
 
 from __future__ import annotations
 
-import contextlib
 import json
 import logging
 import os
-import shutil
-import subprocess  # ruff:ignore[suspicious-subprocess-import]
 import sys
 import typing
 from abc import ABC
@@ -19,14 +16,18 @@ from typing import TYPE_CHECKING, Any, Final, Literal, TypeAlias, cast
 from tox.config.loader.str_convert import StrConvert
 from tox.execute.local_sub_process import LocalSubProcessExecutor
 from tox.execute.request import StdinSource
-from tox.tox_env.errors import Skip
+from tox.tox_env.errors import Recreate, Skip
 from tox.tox_env.python.api import PY_FACTORS_RE, PY_FACTORS_RE_EXPLICIT_VERSION, Python, PythonInfo, VersionInfo
-from virtualenv.app_data import make_app_data
-from virtualenv.discovery.cached_py_info import from_exe
-from virtualenv.discovery.py_info import PythonInfo as VirtualenvPythonInfo
+from tox.tox_env.runner import RunToxEnv
 from virtualenv.discovery.py_spec import PythonSpec
 
+from ._create import base_executable, reference_venv, relocate_venv, repair_venv, venv_matches, write_venv
+from ._discovery import find_installation, find_interpreter, interpreter_info, interpreter_missing
 from ._installer import UvInstaller
+from ._interpreter import interpreter_key, load_interpreter, query_interpreter, store_interpreter
+from ._recreate import cache_diff, is_tolerated, leftovers, move_aside, remove_in_background, restore
+from ._snapshot import rollback, take_snapshot
+from ._uv import ensure_uv_supports, find_uv
 
 if TYPE_CHECKING:
     from tox.execute.api import Execute
@@ -50,6 +51,8 @@ class UvVenv(Python, ABC):
         self._installer: UvInstaller | None = None
         self._created = False
         self._displayed_uv_constraint_warning = False
+        self._setting_up = False
+        self._previous: Path | None = None
         super().__init__(create_args)
 
     def register_config(self) -> None:
@@ -99,16 +102,114 @@ class UvVenv(Python, ABC):
             ),
             post_process=uv_python_preference_post_process,
         )
+        self.conf.add_config(
+            keys=["uv_relocatable"],
+            of_type=bool,
+            default=False,
+            desc="create virtual environments whose scripts keep working when the environment is moved",
+        )
+        self.conf.add_config(
+            keys=["uv_snapshot"],
+            of_type=bool,
+            default=False,
+            desc="snapshot the environment after setup and undo what commands changed in it before the next run",
+        )
+        self.conf.add_config(
+            keys=["uv_recreate_tolerate"],
+            of_type=list[str],
+            default=[],
+            desc=(
+                "keys of the python cache (such as python_preference or seed) allowed to change without recreating"
+                " the environment, as long as no other key changed"
+            ),
+        )
+
+    def setup(self) -> None:
+        snapshot = self.conf["uv_snapshot"] and self._run_state["setup"] is False
+        if snapshot and not self.conf.get("recreate", bool) and rollback(self.venv_dir):
+            _LOGGER.warning("rolled back changes made to %s since the last setup", self.venv_dir)
+        self._setting_up = True
+        try:
+            super().setup()
+        except BaseException:
+            if self._previous is not None:  # the old environment is still good, keep it rather than a half built one
+                _LOGGER.warning("restore previous environment at %s", self.env_dir)
+                restore(self._previous, self.env_dir)
+            raise
+        else:
+            if self._previous is not None:
+                remove_in_background(self._previous)
+            if snapshot:
+                take_snapshot(self.venv_dir)
+        finally:
+            self._setting_up, self._previous = False, None
+
+    def _clean(self, transitive: bool = False) -> None:  # ruff:ignore[boolean-type-hint-positional-argument, boolean-default-value-positional-argument]
+        if not isinstance(self, RunToxEnv):  # run environments first run their recreate commands in the old one
+            self._move_aside()
+        super()._clean(transitive)
+
+    def _run_recreate_commands(self) -> None:
+        # called by RunToxEnv._clean right before it empties the folder
+        try:
+            super()._run_recreate_commands()  # type: ignore[misc]
+        finally:
+            self._move_aside()
+
+    def _move_aside(self) -> None:
+        """Move the environment out of the way so it does not need to be deleted before the new one is built."""
+        if self._run_state["clean"] or self._previous is not None or not self.env_dir.is_dir():
+            return
+        for old in leftovers(self.env_dir):  # from runs that ended before their delete finished
+            remove_in_background(old)
+        if (aside := move_aside(self.env_dir)) is None:
+            return
+        if self._setting_up:
+            self._previous = aside
+        else:
+            remove_in_background(aside)
+
+    def ensure_python_env(self) -> None:
+        conf = self.python_cache()
+        with self.cache.compare(conf, Python.__name__) as (eq, old):
+            if old is None:  # does not exist -> create
+                self.create_python_env()
+            elif eq is False:  # exists but changed -> recreate, unless only tolerated keys changed
+                diff = cache_diff(old, conf)
+                tolerate = self.conf["uv_recreate_tolerate"]
+                if all(is_tolerated(key, tolerate) for key in diff):
+                    _LOGGER.warning("keep environment, tolerated %s", self._diff_msg(conf, old))
+                else:
+                    if self.journal:
+                        self.journal["recreate"] = {
+                            key: {"old": before, "new": after} for key, (before, after) in diff.items()
+                        }
+                    raise Recreate(self._diff_msg(conf, old))
+        self._ensure_location()
+
+    def _ensure_location(self) -> None:
+        """Follow the environment to the folder it is at now, if it was moved since the last run."""  # ruff:ignore[docstring-missing-exception]
+        location = str(self.venv_dir)
+        with self.cache.compare(location, UvVenv.__name__, "location") as (eq, old):
+            if old is not None and eq is False:
+                if not relocate_venv(self.venv_dir, old):
+                    msg = f"environment moved from {old} and cannot be relocated"
+                    raise Recreate(msg)
+                _LOGGER.warning("relocated environment from %s to %s", old, location)
 
     def python_cache(self) -> dict[str, Any]:
         result = super().python_cache()
         result["seed"] = self.conf["uv_seed"]
+        if self.conf["uv_relocatable"]:
+            result["relocatable"] = True
         if self.conf["uv_python_preference"] != "none":
             result["python_preference"] = self.conf["uv_python_preference"]
         env_dir = cast("Path", self.conf["env_dir"])
         if not env_dir.is_absolute():
             env_dir = cast("Path", self.core["tox_root"]) / env_dir
-        result["venv"] = str(self.venv_dir.relative_to(env_dir))
+        result["venv"] = str(
+            self.venv_dir.relative_to(env_dir) if self.venv_dir.is_relative_to(env_dir) else self.venv_dir
+        )
         return result
 
     @property
@@ -140,24 +241,7 @@ class UvVenv(Python, ABC):
                 elif (base_from_name := self.extract_base_python(self.name)) is not None:
                     spec = PythonSpec.from_string_spec(base_from_name)
                 else:
-                    info = self._get_virtualenv_py_info(base_path)
-                    vi = info.version_info
-                    return PythonInfo(
-                        implementation=info.implementation,
-                        version_info=VersionInfo(
-                            major=int(vi.major),
-                            minor=int(vi.minor),
-                            micro=int(vi.micro),
-                            releaselevel=str(vi.releaselevel),
-                            serial=int(vi.serial),
-                        ),
-                        version=info.version,
-                        is_64=info.architecture == 64,  # ruff:ignore[magic-value-comparison]
-                        platform=info.platform,
-                        extra={"executable": str(base_path)},
-                        free_threaded=bool(info.free_threaded),
-                        machine=info.machine,
-                    )
+                    return self._get_interpreter_info(base_path)
             else:
                 spec = PythonSpec.from_string_spec(base)
             return PythonInfo(
@@ -180,13 +264,8 @@ class UvVenv(Python, ABC):
         return None  # pragma: no cover
 
     @staticmethod
-    def _get_virtualenv_py_info(path: Path) -> VirtualenvPythonInfo:  # pragma: win32 no cover
-        result = from_exe(
-            VirtualenvPythonInfo,
-            make_app_data(None, read_only=False, env=os.environ),
-            str(path),
-        )
-        if result is None:  # pragma: no cover
+    def _get_interpreter_info(path: Path) -> PythonInfo:  # pragma: win32 no cover
+        if (result := interpreter_info(find_uv(), path)) is None:  # pragma: no cover
             msg = f"failed to discover Python info for {path}"
             raise RuntimeError(msg)
         return result
@@ -199,57 +278,15 @@ class UvVenv(Python, ABC):
         :param path: the path investigated
         :return: the found spec
         """
-        info = cls._get_virtualenv_py_info(path)  # pragma: win32 no cover
+        info = cls._get_interpreter_info(path)  # pragma: win32 no cover
+        free_threaded = "t" if info.free_threaded else ""  # pragma: win32 no cover
         return PythonSpec.from_string_spec(  # pragma: win32 no cover
-            f"{info.implementation}{info.version_info.major}{info.version_info.minor}-{info.architecture}",
+            f"{info.impl_lower}{info.version_no_dot}{free_threaded}-{64 if info.is_64 else 32}",
         )
 
-    @staticmethod
-    def _get_uv_version(uv_path: str) -> str:
-        try:
-            result = subprocess.run(  # ruff:ignore[subprocess-without-shell-equals-true]
-                [uv_path, "--version"],
-                capture_output=True,
-                text=True,
-                check=False,
-                timeout=5,
-            )
-            return result.stdout.strip() if result.returncode == 0 else "unknown"
-        except (subprocess.TimeoutExpired, OSError):
-            return "unknown"
-
-    @cached_property
+    @property
     def uv(self) -> str:
-        # Check for explicit override first
-        if uv_env := os.environ.get("TOX_UV_PATH"):
-            if not (uv_path := shutil.which(uv_env)):
-                msg = f"TOX_UV_PATH={uv_env} not found in PATH"
-                raise RuntimeError(msg)
-            version = self._get_uv_version(uv_path)
-            _LOGGER.warning("using uv from TOX_UV_PATH: %s (%s)", uv_path, version)
-            return uv_path
-
-        # Try bundled uv (when installed via tox-uv meta package)
-        with contextlib.suppress(ImportError, FileNotFoundError):
-            from uv import find_uv_bin  # type: ignore[import-not-found]  # ruff:ignore[import-outside-top-level]
-
-            uv_bin = find_uv_bin()  # pragma: no cover
-            _LOGGER.debug("using bundled uv from: %s", uv_bin)  # pragma: no cover
-            return uv_bin  # pragma: no cover
-
-        # Fall back to system uv (when using tox-uv-bare)
-        if not (uv_path := shutil.which("uv")):  # pragma: no cover
-            msg = (  # pragma: no cover
-                "uv not found. Either:\n"
-                "  1. Install with bundled uv: pip install tox-uv\n"
-                "  2. Install tox-uv-bare and ensure system uv is in PATH: which uv\n"
-                "  3. Set TOX_UV_PATH environment variable to uv binary location"
-            )
-            raise RuntimeError(msg)  # pragma: no cover
-
-        version = self._get_uv_version(uv_path)
-        _LOGGER.debug("using system uv from PATH: %s (%s)", uv_path, version)
-        return uv_path
+        return find_uv()
 
     @property
     def venv_dir(self) -> Path:
@@ -283,27 +320,74 @@ class UvVenv(Python, ABC):
 
     def create_python_env(self) -> None:
         version_spec = self.env_version_spec()
-
-        cmd: list[str] = [self.uv, "venv", "-p", version_spec, "--allow-existing"]
-        cmd.append(f"--prompt={self.core._root.name}[{self.name}]")  # ruff:ignore[private-member-access]
+        missing_msg = f"could not find python interpreter with spec(s): {version_spec}"
+        if self.core["skip_missing_interpreters"] and interpreter_missing(
+            self.uv, self.conf["uv_python_preference"], version_spec
+        ):
+            raise Skip(missing_msg)
+        prompt = f"{self.core._root.name}[{self.name}]"  # ruff:ignore[private-member-access]
+        if self._create_without_uv(version_spec, prompt):
+            self._created = True
+            return
+
+        cmd: list[str] = [self.uv, "venv", "-p", self.python_request(), "--allow-existing"]
+        cmd.append(f"--prompt={prompt}")
         if self.options.verbosity > 3:  # ruff:ignore[magic-value-comparison]
             cmd.append("-v")
         if self.conf["uv_seed"]:
             cmd.append("--seed")
+        if self.conf["uv_relocatable"]:
+            cmd.append("--relocatable")
         if self.conf["system_site_packages"]:
             cmd.append("--system-site-packages")
         if self.conf["uv_python_preference"] != "none":
             cmd.extend(["--python-preference", self.conf["uv_python_preference"]])
+        ensure_uv_supports(self.uv, "venv", cmd)
         cmd.append(str(self.venv_dir))
         outcome = self.execute(cmd, stdin=StdinSource.OFF, run_id="venv", show=None)
 
         if self.core["skip_missing_interpreters"] and outcome.exit_code in {1, 2}:
-            msg = f"could not find python interpreter with spec(s): {version_spec}"
-            raise Skip(msg)
+            raise Skip(missing_msg)
 
         outcome.assert_success()
         self._created = True
 
+    def _create_without_uv(self, version_spec: str, prompt: str) -> bool:
+        """:return: ``True`` if the environment was set up for an interpreter uv already reported, without running uv"""
+        # seeding installs packages, leave that and whatever else the UV_VENV_* variables ask for to uv
+        if self.conf["uv_seed"] or any(key.startswith("UV_VENV_") for key in self.environment_variables):
+            return False
+        installation = find_installation(self.uv, self.conf["uv_python_preference"], version_spec)
+        if installation is None or (python := base_executable(installation)) is None:
+            return False
+        system_site_packages = self.conf["system_site_packages"]
+        if venv_matches(self.venv_dir, python, installation, system_site_packages=system_site_packages):
+            _LOGGER.debug("virtual environment at %s is up to date", self.venv_dir)
+            return True
+        if (self.venv_dir / "pyvenv.cfg").exists():  # let uv update an environment set up for another interpreter
+            return False
+        reference = reference_venv(self.uv, python, installation, relocatable=self.conf["uv_relocatable"])
+        if reference is None or not write_venv(
+            self.venv_dir, python, installation, reference, prompt=prompt, system_site_packages=system_site_packages
+        ):
+            return False
+        _LOGGER.info("created virtual environment at %s for %s", self.venv_dir, python)
+        return True
+
+    def _repair_interpreter(self) -> bool:
+        """:return: ``True`` if the environment was pointed at a compatible interpreter in place of a missing one"""
+        installation = find_installation(self.uv, self.conf["uv_python_preference"], self.env_version_spec())
+        if installation is None or (python := base_executable(installation)) is None:
+            return False
+        if not repair_venv(self.venv_dir, python, installation):
+            return False
+        _LOGGER.warning("interpreter of %s went away, switched to compatible %s", self.venv_dir, python)
+        return True
+
+    def _base_layer(self) -> Path | None:  # ruff:ignore[no-self-use]
+        """:return: the base layer whose packages the environment sees, ``None`` if it has none"""
+        return None
+
     @property
     def _allow_externals(self) -> list[str]:
         result = super()._allow_externals
@@ -326,9 +410,12 @@ class UvVenv(Python, ABC):
     def env_site_package_dir(self) -> Path:  # pragma: win32 no cover
         if sys.platform == "win32":  # pragma: win32 cover
             return self.venv_dir / "Lib" / "site-packages"
-        py = self._py_info
-        impl = "pypy" if py.implementation == "pypy" else "python"
-        return self.venv_dir / "lib" / f"{impl}{py.version_dot}" / "site-packages"
+        return self.venv_dir / self._venv_layout()["purelib"]
+
+    def env_site_package_dir_plat(self) -> Path:  # pragma: win32 no cover
+        if sys.platform == "win32":  # pragma: win32 cover
+            return self.venv_dir / "Lib" / "site-packages"
+        return self.venv_dir / self._venv_layout()["platlib"]
 
     _OS_MAP: typing.ClassVar[typing.Mapping[str, str]] = {
         "darwin": "macos",
@@ -387,32 +474,42 @@ class UvVenv(Python, ABC):
             version_spec = f"{uv_imp}{base.major}.{base.minor}{free_threaded_tag}"
         return version_spec
 
-    @cached_property
-    def _py_info(self) -> PythonInfo:  # pragma: win32 no cover
+    def python_request(self) -> str:
+        """:return: the interpreter passed to uv, pinned to its absolute path when it is already installed"""
+        version_spec = self.env_version_spec()
+        if Path(version_spec).is_absolute():
+            return version_spec
+        return find_interpreter(self.uv, self.conf["uv_python_preference"], version_spec) or version_spec
+
+    def _venv_layout(self) -> dict[str, Any]:  # pragma: win32 no cover
         if not self._created and not self.env_python().exists():  # called during config, no environment setup
+            if (layout := self._expected_venv_layout()) is not None:
+                return layout
             self.create_python_env()
-        if not self._paths:
-            self._paths = self.prepend_env_var_path()
-        with as_file(files("tox_uv") / "_venv_query.py") as filename:
-            cmd = [str(self.env_python()), str(filename)]
-            outcome = self.execute(cmd, stdin=StdinSource.OFF, run_id="venv-query", show=False)
-        outcome.assert_success()
-        res = json.loads(outcome.out)
-        extras = {k: v for k, v in {"libc": next(iter(res["libc"]), None)}.items() if v}
-        return PythonInfo(
-            implementation=res["implementation"],
-            version_info=VersionInfo(
-                major=res["version_info"][0],
-                minor=res["version_info"][1],
-                micro=res["version_info"][2],
-                releaselevel=res["version_info"][3],
-                serial=res["version_info"][4],
-            ),
-            version=res["version"],
-            is_64=res["is_64"],
-            platform=sys.platform,
-            extra=extras,
-        )
+        return self._venv_query
+
+    def _expected_venv_layout(self) -> dict[str, Any] | None:  # pragma: win32 no cover
+        """:return: the layout uv will create for this environment, ``None`` if only creating it can tell"""
+        if not Path(request := self.python_request()).is_absolute():  # not installed, uv downloads it
+            return None
+        if (query := query_interpreter(Path(request))) is None or not query.get("venv_scheme"):
+            return None  # older interpreters may report the paths of a distribution patched scheme
+        return {key: query[key] for key in ("purelib", "platlib", "scripts")}
+
+    @cached_property
+    def _venv_query(self) -> dict[str, Any]:  # pragma: win32 no cover
+        key = interpreter_key(self.env_python(), self.venv_dir / "pyvenv.cfg")
+        if key is None or (res := load_interpreter(key)) is None:
+            if not self._paths:
+                self._paths = self.prepend_env_var_path()
+            with as_file(files("tox_uv") / "_venv_query.py") as filename:
+                cmd = [str(self.env_python()), str(filename)]
+                outcome = self.execute(cmd, stdin=StdinSource.OFF, run_id="venv-query", show=False)
+            outcome.assert_success()
+            res = json.loads(outcome.out)
+            if key is not None:
+                store_interpreter(key, res)
+        return res
 
 
 __all__ = [
@@ -1,16 +1,66 @@
 from __future__ import annotations
 
 import json
+import os
 import platform
 import sys
+import sysconfig
 from platform import python_implementation
 
+
+def libc() -> list[str]:
+    # platform.libc_ver() scans the interpreter binary for markers, which is slow for large static builds
+    try:
+        name, _, version = os.confstr("CS_GNU_LIBC_VERSION").partition(" ")
+    except (AttributeError, ValueError, OSError):
+        name, version = "", ""
+    if name == "glibc":
+        return [name, version]
+    target = f"{sysconfig.get_config_var('MULTIARCH') or ''} {sysconfig.get_config_var('HOST_GNU_TYPE') or ''}"
+    return ["musl", ""] if "musl" in target else ["", ""]
+
+
+def markers() -> dict[str, str]:
+    # the PEP 508 environment, as packaging.markers.default_environment reports it within this interpreter
+    info = sys.implementation.version
+    version = f"{info.major}.{info.minor}.{info.micro}"
+    if info.releaselevel != "final":
+        version += f"{info.releaselevel[0]}{info.serial}"
+    return {
+        "implementation_name": sys.implementation.name,
+        "implementation_version": version,
+        "os_name": os.name,
+        "platform_machine": platform.machine(),
+        "platform_release": platform.release(),
+        "platform_system": platform.system(),
+        "platform_version": platform.version(),
+        "python_full_version": platform.python_version(),
+        "platform_python_implementation": python_implementation(),
+        "python_version": ".".join(platform.python_version_tuple()[:2]),
+        "sys_platform": sys.platform,
+    }
+
+
+# the venv scheme (3.11+) is immune to distributions patching the default one, e.g. Debian with /usr/local
+venv_scheme = "venv" in sysconfig.get_scheme_names()
+paths = sysconfig.get_paths(scheme="venv") if venv_scheme else sysconfig.get_paths()
 print(  # ruff:ignore[print]
-    json.dumps({
-        "implementation": python_implementation().lower(),
-        "version_info": sys.version_info,
-        "version": sys.version,
-        "is_64": sys.maxsize > 2**32,
-        "libc": platform.libc_ver(),
-    })
+    json.dumps(
+        {
+            "implementation": python_implementation().lower(),
+            "version_info": sys.version_info,
+            "version": sys.version,
+            "is_64": sys.maxsize > 2**32,
+            "machine": platform.machine(),
+            "libc": libc(),
+            "abiflags": getattr(sys, "abiflags", ""),
+            "free_threaded": bool(sysconfig.get_config_var("Py_GIL_DISABLED")),
+            "markers": markers(),
+            # queried from a base interpreter the paths match its environments only when taken from the venv scheme
+            "venv_scheme": venv_scheme,
+            # relative to the environment so environments created from the same interpreter can share the result
+            **{key: os.path.relpath(paths[key], sys.prefix) for key in ("purelib", "platlib", "scripts")},
+        },
+        separators=(",", ":"),
+    )
 )
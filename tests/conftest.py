@@ -7,14 +7,33 @@ from unittest import mock
 
 import pytest
 
+from tox_uv._discovery import _INSTALLATIONS, _RESOLVED
+from tox_uv._interpreter import _LOADED
+from tox_uv._uv import _FOUND, _UNSUPPORTED, _VERSIONS
+
 if TYPE_CHECKING:
     from collections.abc import Generator
 
 
-@pytest.fixture(autouse=True)
-def mock_settings_env_vars() -> Generator[None, None, None]:
+@pytest.fixture(autouse=True)  # ruff:ignore[pytest-fixture-autouse]
+def mock_settings_env_vars(tmp_path_factory: pytest.TempPathFactory) -> Generator[None, None, None]:
     """Isolated testing from user's environment."""
-    with mock.patch.dict(os.environ, {"TOX_USER_CONFIG_FILE": os.devnull}):
+    cache = str(tmp_path_factory.mktemp("tox-uv-cache"))
+    with mock.patch.dict(os.environ, {"TOX_USER_CONFIG_FILE": os.devnull, "TOX_UV_CACHE_DIR": cache}):
+        yield
+
+
+@pytest.fixture(autouse=True)  # ruff:ignore[pytest-fixture-autouse]
+def reset_uv_discovery() -> Generator[None, None, None]:
+    """Every test starts with a fresh uv lookup, as a new tox process would."""
+    with (
+        mock.patch.dict(_FOUND, clear=True),
+        mock.patch.dict(_VERSIONS, clear=True),
+        mock.patch.dict(_UNSUPPORTED, clear=True),
+        mock.patch.dict(_INSTALLATIONS, clear=True),
+        mock.patch.dict(_RESOLVED, clear=True),
+        mock.patch.dict(_LOADED, clear=True),
+    ):
         yield
 
 
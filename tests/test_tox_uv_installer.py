@@ -1,15 +1,33 @@
 from __future__ import annotations
 
+import os
+import platform
+import re
 import sys
+import time
 from textwrap import dedent
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, cast
 
+import filelock
 import pytest
+from packaging.markers import default_environment
+
+from tox_uv._cache import cache_dir
+from tox_uv._clone import _REFLINK, _reflink, clone_tree, link_file
+from tox_uv._installer import _project_name
+from tox_uv._recreate import move_aside
+from tox_uv._requirements import diff_requirements
+from tox_uv._template import MAX_UNUSED_SECONDS, prune_templates, restore_template, store_template
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
     from tox.execute.request import ExecuteRequest
     from tox.pytest import ToxProjectCreator
 
+    from tox_uv._installer import UvInstaller
+
 
 def test_uv_install_in_ci_list(tox_project: ToxProjectCreator, monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("CI", "1")
@@ -279,7 +297,7 @@ def test_uv_env_var_change_reinstall(
         if "install" in r.run_id:
             install_count += 1
             return 0
-        return None
+        return None  # pragma: no cover (uv venv, where the environment cannot be set up without uv)
 
     project.patch_execute(handle)
 
@@ -326,12 +344,51 @@ def test_uv_install_broken_venv(tox_project: ToxProjectCreator) -> None:
         path = bin_dir / filename
         path.unlink(missing_ok=True)
         path.symlink_to("/broken-location")
+    # an interpreter of another minor version cannot take over
+    cfg = project.path / ".tox" / "py" / "pyvenv.cfg"
+    cfg.write_text(re.sub(r"version_info = .*", "version_info = 2.7.18", cfg.read_text()))
     # run again and ensure we did run the repair bits
     result = project.run("run", "-v")
     result.assert_success()
     assert "recreate env because existing venv is broken" in result.out
 
 
+def test_uv_install_broken_venv_unknown_interpreter(tox_project: ToxProjectCreator, mocker: MockerFixture) -> None:
+    project = tox_project({"tox.ini": "[testenv]\npackage = skip\ndeps = tomli"})
+    project.run("run").assert_success()
+    scripts = "Scripts" if sys.platform == "win32" else "bin"
+    python = project.path / ".tox" / "py" / scripts / ("python.exe" if sys.platform == "win32" else "python")
+    python.unlink()
+    python.symlink_to("/broken-location")
+
+    mocker.patch("tox_uv._venv.find_installation", return_value=None)  # uv cannot tell what replaces it
+    result = project.run("run")
+    result.assert_success()
+    assert "recreate env because existing venv is broken" in result.out
+
+
+@pytest.mark.skipif(sys.platform in {"win32", "darwin"}, reason="environments there are left to uv venv")
+def test_uv_install_broken_venv_repaired_in_place(tox_project: ToxProjectCreator) -> None:
+    project = tox_project({
+        "tox.ini": "[testenv]\npackage = skip\ncommands = python -c 'import sys; print(sys.version)'"
+    })
+    project.run("run").assert_success()
+    env_dir = project.path / ".tox" / "py"
+    (next(env_dir.glob("lib/*/site-packages")) / "marker.py").touch()
+    # what a patch upgrade of the base interpreter leaves behind
+    (env_dir / "bin" / "python").unlink()
+    (env_dir / "bin" / "python").symlink_to("/gone/bin/python3")
+    cfg = env_dir / "pyvenv.cfg"
+    cfg.write_text(re.sub(r"version_info = (\d+\.\d+)\..*", r"version_info = \1.0", cfg.read_text()))
+
+    result = project.run("run", "-v")
+    result.assert_success()
+    assert "switched to compatible" in result.out
+    assert "recreate env" not in result.out
+    assert (next(env_dir.glob("lib/*/site-packages")) / "marker.py").exists()
+    assert f"version_info = {platform.python_version()}" in cfg.read_text()
+
+
 def test_uv_install_with_constraints_for_deps(tox_project: ToxProjectCreator) -> None:
     project = tox_project({
         "tox.ini": dedent("""
@@ -361,3 +418,291 @@ def test_uv_install_with_constraints_for_deps(tox_project: ToxProjectCreator) ->
     assert cmd[0] == "install"
     assert "pytest>=8.0.0" in cmd
     assert "-c" in cmd
+
+
+def test_uv_install_from_template(tox_project: ToxProjectCreator) -> None:
+    project = tox_project({
+        "tox.ini": """
+    [tox]
+    env_list = a, b
+    [testenv]
+    package = skip
+    uv_template = true
+    deps = tomli
+    commands = python -c 'import sys, tomli; print(sys.prefix, tomli.__file__)'
+    """
+    })
+    result = project.run("run", "-e", "a,b")
+    result.assert_success()
+    assert result.out.count("install_deps>") == 1
+    assert "b: install_deps>" not in result.out
+    env_b = project.path / ".tox" / "b"
+    assert f"{env_b} {env_b}" in result.out
+
+
+@pytest.mark.parametrize(
+    ("deps", "interpreter_known"),
+    [
+        pytest.param("-r missing.txt", True, id="unreadable"),
+        pytest.param("demo @ file:///demo-1.0-py3-none-any.whl", True, id="local-file"),
+        pytest.param("tomli", False, id="unknown-interpreter"),
+    ],
+)
+def test_uv_install_template_not_stored(
+    tox_project: ToxProjectCreator, mocker: MockerFixture, deps: str, interpreter_known: bool
+) -> None:
+    if not interpreter_known:
+        mocker.patch("tox_uv._installer.interpreter_key", return_value=None)
+    project = tox_project({"tox.ini": f"[testenv]\npackage = skip\nuv_template = true\ndeps = {deps}"})
+    project.patch_execute(lambda _: 0)
+    project.run("run")
+    assert not (cache_dir() / "templates").exists()
+
+
+def test_uv_install_template_stored_once(tmp_path: Path) -> None:
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "first").touch()
+    store_template("demo", tmp_path / "a")
+    (tmp_path / "a" / "second").touch()
+    store_template("demo", tmp_path / "a")  # another environment got there first
+
+    assert restore_template("demo", tmp_path / "b")
+    assert sorted(i.name for i in (tmp_path / "b").iterdir()) == ["first"]
+
+
+def test_uv_install_template_pruned_when_unused(tmp_path: Path, mocker: MockerFixture) -> None:
+    prune_templates()  # nothing stored yet
+    (tmp_path / "a").mkdir()
+    for key in ("stale", "used", "busy"):
+        store_template(key, tmp_path / "a")
+    (cache_dir() / "templates" / "broken").mkdir()  # e.g. left by hand, without an origin
+    past = time.time() - MAX_UNUSED_SECONDS - 60
+    for key in ("stale", "used", "busy"):
+        os.utime(cache_dir() / "templates" / key / "origin", (past, past))
+    assert restore_template("used", tmp_path / "b")  # marks it as used
+
+    held = iter([True])  # the first could not be moved, e.g. a file in it is held open
+    mocker.patch("tox_uv._template.move_aside", side_effect=lambda i: None if next(held, False) else move_aside(i))
+    remove = mocker.patch("tox_uv._template.remove_in_background")
+    with filelock.FileLock(cache_dir() / "templates" / "busy.lock"):  # another tox process populates from it
+        prune_templates()
+    assert sorted(i.name for i in (cache_dir() / "templates").iterdir() if not i.name.endswith(".lock")) == [
+        remove.call_args.args[0].name,
+        "busy",
+        "used",
+    ]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="symlinks need privileges on Windows")
+def test_uv_install_template_clone_relocates(tmp_path: Path) -> None:
+    old, new = str(tmp_path / "old"), str(tmp_path / "new")
+    src = tmp_path / "src"
+    (src / "bin").mkdir(parents=True)
+    (src / "lib").mkdir()
+    (src / "bin" / "tool").write_text(f"#!{old}/bin/python\n", encoding="utf-8")
+    (src / "bin" / "plain").write_text("#!/bin/sh\n", encoding="utf-8")
+    (src / "pyvenv.cfg").write_text(f"home = {old}\n", encoding="utf-8")
+    (src / "lib" / "self.pth").write_text(f"{old}/lib\n", encoding="utf-8")
+    (src / "lib" / "data.txt").write_text(old, encoding="utf-8")  # neither a script nor a path file, shared as is
+    (src / "bin" / "python").symlink_to(f"{old}/bin/real")
+    (src / "bin" / "outside").symlink_to("/usr/bin/env")
+
+    clone_tree(src, tmp_path / "dst", relocate=(old, new))
+
+    dst = tmp_path / "dst"
+    assert (dst / "bin" / "tool").read_text(encoding="utf-8") == f"#!{new}/bin/python\n"
+    assert (dst / "bin" / "plain").stat().st_ino == (src / "bin" / "plain").stat().st_ino
+    assert (dst / "pyvenv.cfg").read_text(encoding="utf-8") == f"home = {new}\n"
+    assert (dst / "lib" / "self.pth").read_text(encoding="utf-8") == f"{new}/lib\n"
+    assert (dst / "lib" / "data.txt").read_text(encoding="utf-8") == old
+    assert str((dst / "bin" / "python").readlink()) == f"{new}/bin/real"
+    assert str((dst / "bin" / "outside").readlink()) == "/usr/bin/env"
+
+
+def test_uv_install_template_link_file_reflinked(tmp_path: Path, mocker: MockerFixture) -> None:
+    mocker.patch.dict(_REFLINK, {"supported": True})
+    reflink = mocker.patch("tox_uv._clone._reflink")
+    link = mocker.patch("os.link")
+    link_file(tmp_path / "a", tmp_path / "b")
+    reflink.assert_called_once_with(tmp_path / "a", tmp_path / "b")
+    link.assert_not_called()
+
+
+def test_uv_install_template_link_file_copied(tmp_path: Path, mocker: MockerFixture) -> None:
+    mocker.patch.dict(_REFLINK, {"supported": True})
+    mocker.patch("tox_uv._clone._reflink", side_effect=OSError)
+    mocker.patch("os.link", side_effect=OSError)  # e.g. another device
+    (tmp_path / "a").write_text("content", encoding="utf-8")
+    link_file(tmp_path / "a", tmp_path / "b")
+    assert _REFLINK["supported"] is False  # not tried again for the next file
+    assert (tmp_path / "b").read_text(encoding="utf-8") == "content"
+    assert (tmp_path / "b").stat().st_ino != (tmp_path / "a").stat().st_ino
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="reflinks are a Linux ioctl")
+def test_uv_install_template_reflink_keeps_mode(tmp_path: Path, mocker: MockerFixture) -> None:
+    ioctl = mocker.patch("fcntl.ioctl")  # file systems with copy on write support are not available everywhere
+    (tmp_path / "a").write_text("", encoding="utf-8")
+    (tmp_path / "a").chmod(0o750)
+    _reflink(tmp_path / "a", tmp_path / "b")
+    ioctl.assert_called_once()
+    assert (tmp_path / "b").stat().st_mode == (tmp_path / "a").stat().st_mode
+
+
+@pytest.mark.parametrize(
+    ("old", "new", "change"),
+    [
+        pytest.param(["foo>=1"], ["foo>=1", "bar"], {"added": ["bar"]}, id="added"),
+        pytest.param(["foo>=1"], ["foo>=2"], {"tightened": ["foo>=2"]}, id="spec-changed"),
+        pytest.param(["foo"], ["foo[x]"], {"tightened": ["foo[x]"]}, id="extra-added"),
+        pytest.param(["foo>=1,<3"], ["foo>=1"], {"loosened": ["foo>=1"]}, id="spec-dropped"),
+        pytest.param(["Foo[b,a]>=1"], ["foo[A,B] >= 1"], {}, id="spelling"),
+        pytest.param(["foo", "bar"], ["foo"], {"removed": ["bar"]}, id="removed"),
+        pytest.param(["foo"], ["foo", "bar; python_version < '3'"], {}, id="marker-not-applying"),
+        pytest.param(["foo>=1", "foo<3"], ["foo<3", "foo>=1"], {}, id="listed-twice"),
+        pytest.param(["foo>=1", "foo<3"], ["foo>=1"], {"loosened": ["foo>=1"]}, id="listed-twice-dropped"),
+        pytest.param(["-e ."], ["-e ."], {}, id="invalid-unchanged"),
+        pytest.param(["-e ."], ["-e ./x"], {"added": ["-e ./x"], "removed": ["-e ."]}, id="invalid-changed"),
+    ],
+)
+def test_uv_install_diff_requirements(old: list[str], new: list[str], change: dict[str, list[str]]) -> None:
+    changes = diff_requirements(old, new, {"python_version": "3.12", "python_full_version": "3.12.0"})
+    assert {kind: lines for kind, lines in changes.items() if lines} == change
+
+
+def test_uv_install_marker_environment_from_interpreter(tox_project: ToxProjectCreator, mocker: MockerFixture) -> None:
+    project = tox_project({"tox.ini": "[testenv]\npackage = skip"})
+    result = project.run("c", "-e", "py")
+    result.assert_success()
+    installer = cast("UvInstaller", result.state.envs["py"].installer)
+    assert installer._marker_environment() == default_environment()  # ruff:ignore[private-member-access]
+
+    mocker.patch("tox_uv._installer.query_interpreter", return_value=None)  # e.g. uv downloads the interpreter
+    markers = installer._marker_environment()  # ruff:ignore[private-member-access]
+    assert markers["python_version"] == f"{sys.version_info.major}.{sys.version_info.minor}"
+
+
+def test_uv_install_package_deps_tightened_in_place(tox_project: ToxProjectCreator) -> None:
+    toml = """
+    [build-system]
+    requires = ["setuptools>=61"]
+    build-backend = "setuptools.build_meta"
+    [project]
+    name = "demo"
+    version = "0.1"
+    dependencies = [{}]
+    """
+    project = tox_project({
+        "tox.ini": "[testenv]\npackage=wheel",
+        "pyproject.toml": toml.format('"tomli>=1"'),
+        "demo.py": "",
+    })
+    project.run().assert_success()
+
+    (project.path / "pyproject.toml").write_text(toml.format('"Tomli>=2"'), encoding="utf-8")
+    result = project.run("-vv")
+    result.assert_success()
+    assert "dependencies tightened: Tomli>=2" in result.out
+    assert "recreate env because" not in result.out
+
+
+def test_uv_install_package_deps_removed_recreates(tox_project: ToxProjectCreator) -> None:
+    toml = '[build-system]\nrequires = ["setuptools>=61"]\nbuild-backend = "setuptools.build_meta"\n'
+    toml += '[project]\nname = "demo"\nversion = "0.1"\ndependencies = [{}]\n'
+    project = tox_project({
+        "tox.ini": "[testenv]\npackage = wheel",
+        "pyproject.toml": toml.format('"tomli", "iniconfig"'),
+        "demo.py": "",
+    })
+    project.run().assert_success()
+
+    (project.path / "pyproject.toml").write_text(toml.format('"tomli"'), encoding="utf-8")
+    result = project.run()
+    result.assert_success()
+    assert "recreate env because dependencies removed: iniconfig" in result.out
+
+
+@pytest.mark.parametrize(
+    "content",
+    [None, "[project", "[project]\ndynamic = ['name']"],
+    ids=["missing", "invalid", "dynamic"],
+)
+def test_uv_install_project_name_unknown(tmp_path: Path, content: str | None) -> None:
+    if content is not None:
+        (tmp_path / "pyproject.toml").write_text(content, encoding="utf-8")
+    assert _project_name(tmp_path) is None
+
+
+def test_uv_install_reconcile_removed_deps(tox_project: ToxProjectCreator) -> None:
+    ini = "[testenv]\npackage = skip\nuv_reconcile = true\ndeps = {}\ncommands = python -c '{}'"
+    project = tox_project({"tox.ini": ini.format("pytest\n tomli", "import pluggy, tomli")})
+    project.run("run").assert_success()
+
+    gone = 'import importlib.util, sys; sys.exit(importlib.util.find_spec("pluggy") is not None)'
+    (project.path / "tox.ini").write_text(ini.format("tomli", gone), encoding="utf-8")
+    result = project.run("run")
+    result.assert_success()
+    assert "recreate env because" not in result.out
+    uninstalled = next(line for line in result.out.splitlines() if line.endswith("no longer needed"))
+    assert "pluggy" in uninstalled
+    assert "tomli" not in uninstalled
+
+
+def test_uv_install_reconcile_keeps_what_the_package_needs(tox_project: ToxProjectCreator) -> None:
+    toml = '[build-system]\nrequires = ["setuptools>=61"]\nbuild-backend = "setuptools.build_meta"\n'
+    toml += '[project]\nname = "demo"\nversion = "0.1"\ndependencies = ["pluggy"]\n'
+    ini = "[testenv]\npackage = wheel\nuv_reconcile = true\npip_pre = true\nuv_resolution = highest\ndeps = {}"
+    project = tox_project({"tox.ini": ini.format("pytest\n tomli"), "pyproject.toml": toml, "demo.py": ""})
+    project.run("run").assert_success()
+
+    (project.path / "tox.ini").write_text(ini.format("tomli"), encoding="utf-8")
+    result = project.run("run")
+    result.assert_success()
+    assert "recreate env because" not in result.out
+    uninstalled = next(line for line in result.out.splitlines() if line.endswith("no longer needed"))
+    assert "iniconfig" in uninstalled
+    assert "pluggy" not in uninstalled
+
+
+def test_uv_install_reconcile_reinstalls_uv_project(tox_project: ToxProjectCreator) -> None:
+    toml = '[build-system]\nrequires = ["setuptools>=61"]\nbuild-backend = "setuptools.build_meta"\n'
+    toml += '[project]\nname = "demo"\nversion = "0.1"\ndependencies = ["pluggy"]\n'
+    ini = "[testenv]\npackage = uv-editable\nuv_reconcile = true\nuv_seed = true\ndeps = {}\n"
+    ini += "commands = python -c 'import pluggy, pip'"
+    project = tox_project({"tox.ini": ini.format("pytest\n pip"), "pyproject.toml": toml, "demo.py": ""})
+    project.run("run").assert_success()
+
+    # pytest shares pluggy with the project, which only a build of the project tells
+    (project.path / "tox.ini").write_text(ini.format("tomli"), encoding="utf-8")
+    result = project.run("run")
+    result.assert_success()
+    assert "recreate env because" not in result.out
+    uninstalled = next(line for line in result.out.splitlines() if line.endswith("no longer needed"))
+    assert "iniconfig" in uninstalled
+    assert "pip" not in uninstalled.split()  # seeded into the environment
+    assert "skip reinstalling" not in result.out
+
+
+@pytest.mark.parametrize(
+    ("reconcile", "old", "resolve_exit_code", "recreate"),
+    [
+        pytest.param("false", "pluggy", 0, True, id="disabled"),
+        pytest.param("true", "./lib", 0, True, id="local-project"),
+        pytest.param("true", "pluggy", 1, True, id="unresolvable"),
+        pytest.param("true", "pluggy", 0, False, id="nothing-extraneous"),
+    ],
+)
+def test_uv_install_reconcile_removed_deps_fallback(
+    tox_project: ToxProjectCreator, reconcile: str, old: str, resolve_exit_code: int, recreate: bool
+) -> None:
+    ini = f"[testenv]\npackage = skip\nuv_reconcile = {reconcile}\ndeps = {{}}"
+    project = tox_project({"tox.ini": ini.format(f"tomli\n {old}"), "lib": {"setup.py": ""}})
+    execute_calls = project.patch_execute(lambda r: resolve_exit_code if r.run_id == "resolve" else 0)
+    project.run("run").assert_success()
+
+    (project.path / "tox.ini").write_text(ini.format("tomli"), encoding="utf-8")
+    result = project.run("run")
+    result.assert_success()
+    assert ("recreate env because requirements removed" in result.out) is recreate
+    run_ids = [i[0][3].run_id for i in execute_calls.call_args_list]
+    assert "uninstall_removed" not in run_ids
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import platform
 import shutil
 import sys
 from typing import TYPE_CHECKING
@@ -7,6 +8,7 @@ from typing import TYPE_CHECKING
 import pytest
 
 if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
     from tox.pytest import ToxProjectCreator
 
 
@@ -26,24 +28,7 @@ package_root = src
 
     calls = [(i[0][0].conf.name, i[0][3].run_id, i[0][3].cmd) for i in execute_calls.call_args_list]
     uv = shutil.which("uv")
-    prompt = f"{project.path.name}[py]"
     expected = [
-        (
-            "py",
-            "venv",
-            [
-                uv,
-                "venv",
-                "-p",
-                sys.executable,
-                "--allow-existing",
-                f"--prompt={prompt}",
-                "-v",
-                "--python-preference",
-                "system",
-                str(project.path / ".tox" / "py"),
-            ],
-        ),
         (
             "py",
             "uv-sync",
@@ -82,24 +67,7 @@ def test_uv_lock_list_dependencies_command(tox_project: ToxProjectCreator) -> No
 
     calls = [(i[0][0].conf.name, i[0][3].run_id, i[0][3].cmd) for i in execute_calls.call_args_list]
     uv = shutil.which("uv")
-    prompt = f"{project.path.name}[py]"
     expected = [
-        (
-            "py",
-            "venv",
-            [
-                uv,
-                "venv",
-                "-p",
-                sys.executable,
-                "--allow-existing",
-                f"--prompt={prompt}",
-                "-v",
-                "--python-preference",
-                "system",
-                str(project.path / ".tox" / "py"),
-            ],
-        ),
         (
             "py",
             "uv-sync",
@@ -146,24 +114,7 @@ def test_uv_lock_command(tox_project: ToxProjectCreator, verbose: str) -> None:
     calls = [(i[0][0].conf.name, i[0][3].run_id, i[0][3].cmd) for i in execute_calls.call_args_list]
     uv = shutil.which("uv")
     v_args = ["-v"] if verbose not in {"", "-v"} else []
-    prompt = f"{project.path.name}[py]"
     expected = [
-        (
-            "py",
-            "venv",
-            [
-                uv,
-                "venv",
-                "-p",
-                sys.executable,
-                "--allow-existing",
-                f"--prompt={prompt}",
-                *v_args,
-                "--python-preference",
-                "system",
-                str(project.path / ".tox" / "py"),
-            ],
-        ),
         (
             "py",
             "uv-sync",
@@ -185,7 +136,7 @@ def test_uv_lock_command(tox_project: ToxProjectCreator, verbose: str) -> None:
         ("py", "commands[0]", ["python", "hello"]),
     ]
     assert calls == expected
-    show_uv_output = execute_calls.call_args_list[1].args[4]
+    show_uv_output = execute_calls.call_args_list[0].args[4]
     assert show_uv_output is (bool(verbose))
 
 
@@ -204,24 +155,7 @@ def test_uv_lock_with_default_groups(tox_project: ToxProjectCreator) -> None:
 
     calls = [(i[0][0].conf.name, i[0][3].run_id, i[0][3].cmd) for i in execute_calls.call_args_list]
     uv = shutil.which("uv")
-    prompt = f"{project.path.name}[py]"
     expected = [
-        (
-            "py",
-            "venv",
-            [
-                uv,
-                "venv",
-                "-p",
-                sys.executable,
-                "--allow-existing",
-                f"--prompt={prompt}",
-                "-v",
-                "--python-preference",
-                "system",
-                str(project.path / ".tox" / "py"),
-            ],
-        ),
         ("py", "uv-sync", [uv, "sync", "--locked", "--python-preference", "system", "-v", "-p", sys.executable]),
     ]
     assert calls == expected
@@ -250,24 +184,7 @@ def test_uv_lock_with_install_pkg(tox_project: ToxProjectCreator, name: str) ->
 
     calls = [(i[0][0].conf.name, i[0][3].run_id, i[0][3].cmd) for i in execute_calls.call_args_list]
     uv = shutil.which("uv")
-    prompt = f"{project.path.name}[py]"
     expected = [
-        (
-            "py",
-            "venv",
-            [
-                uv,
-                "venv",
-                "-p",
-                sys.executable,
-                "--allow-existing",
-                f"--prompt={prompt}",
-                "-v",
-                "--python-preference",
-                "system",
-                str(project.path / ".tox" / "py"),
-            ],
-        ),
         (
             "py",
             "uv-sync",
@@ -312,24 +229,8 @@ def test_uv_sync_extra_flags(tox_project: ToxProjectCreator, uv_sync_locked: boo
 
     calls = [(i[0][0].conf.name, i[0][3].run_id, i[0][3].cmd) for i in execute_calls.call_args_list]
     uv = shutil.which("uv")
-    prompt = f"{project.path.name}[py]"
 
     expected = [
-        (
-            "py",
-            "venv",
-            [
-                uv,
-                "venv",
-                "-p",
-                sys.executable,
-                "--allow-existing",
-                f"--prompt={prompt}",
-                "--python-preference",
-                "system",
-                str(project.path / ".tox" / "py"),
-            ],
-        ),
         (
             "py",
             "uv-sync",
@@ -367,24 +268,8 @@ def test_uv_sync_extra_flags_toml(tox_project: ToxProjectCreator) -> None:
 
     calls = [(i[0][0].conf.name, i[0][3].run_id, i[0][3].cmd) for i in execute_calls.call_args_list]
     uv = shutil.which("uv")
-    prompt = f"{project.path.name}[py]"
 
     expected = [
-        (
-            "py",
-            "venv",
-            [
-                uv,
-                "venv",
-                "-p",
-                sys.executable,
-                "--allow-existing",
-                f"--prompt={prompt}",
-                "--python-preference",
-                "system",
-                str(project.path / ".tox" / "py"),
-            ],
-        ),
         (
             "py",
             "uv-sync",
@@ -456,24 +341,8 @@ def test_uv_sync_dependency_groups(tox_project: ToxProjectCreator) -> None:
 
     calls = [(i[0][0].conf.name, i[0][3].run_id, i[0][3].cmd) for i in execute_calls.call_args_list]
     uv = shutil.which("uv")
-    prompt = f"{project.path.name}[py]"
 
     expected = [
-        (
-            "py",
-            "venv",
-            [
-                uv,
-                "venv",
-                "-p",
-                sys.executable,
-                "--allow-existing",
-                f"--prompt={prompt}",
-                "--python-preference",
-                "system",
-                str(project.path / ".tox" / "py"),
-            ],
-        ),
         (
             "py",
             "uv-sync",
@@ -497,6 +366,22 @@ def test_uv_sync_dependency_groups(tox_project: ToxProjectCreator) -> None:
     assert calls == expected
 
 
+@pytest.mark.skipif(sys.platform in {"win32", "darwin"}, reason="launchers and framework stubs are left to uv")
+def test_uv_lock_venv_written_in_process(tox_project: ToxProjectCreator) -> None:
+    project = tox_project({"tox.ini": "[testenv]\nrunner = uv-venv-lock-runner\ncommands = python hello"})
+    execute_calls = project.patch_execute(lambda r: 0 if r.run_id != "venv" else None)
+    result = project.run("-v")
+    result.assert_success()
+
+    run_ids = [i[0][3].run_id for i in execute_calls.call_args_list]
+    assert run_ids == ["uv-sync", "commands[0]"]
+    env_dir = project.path / ".tox" / "py"
+    assert f"created virtual environment at {env_dir}" in result.out
+    config = (env_dir / "pyvenv.cfg").read_text(encoding="utf-8")
+    assert f"version_info = {platform.python_version()}" in config
+    assert (env_dir / "bin" / "activate").is_file()
+
+
 @pytest.mark.parametrize(
     ("uv_python_preference", "injected"),
     [
@@ -505,8 +390,9 @@ def test_uv_sync_dependency_groups(tox_project: ToxProjectCreator) -> None:
     ],
 )
 def test_uv_sync_uv_python_preference(
-    tox_project: ToxProjectCreator, uv_python_preference: str, injected: list[str]
+    tox_project: ToxProjectCreator, mocker: MockerFixture, uv_python_preference: str, injected: list[str]
 ) -> None:
+    mocker.patch("tox_uv._venv.base_executable", return_value=None)  # only uv can set the environment up
     project = tox_project({
         "tox.toml": f"""
     [env_run_base]
@@ -576,25 +462,8 @@ def test_skip_uv_sync(tox_project: ToxProjectCreator, monkeypatch: pytest.Monkey
     result.assert_success()
 
     calls = [(i[0][0].conf.name, i[0][3].run_id, i[0][3].cmd) for i in execute_calls.call_args_list]
-    uv = shutil.which("uv")
-    prompt = f"{project.path.name}[py]"
 
     expected = [
-        (
-            "py",
-            "venv",
-            [
-                uv,
-                "venv",
-                "-p",
-                sys.executable,
-                "--allow-existing",
-                f"--prompt={prompt}",
-                "--python-preference",
-                "system",
-                str(project.path / ".tox" / "py"),
-            ],
-        ),
         ("py", "commands[0]", ["python", "hello"]),
     ]
     assert calls == expected
@@ -620,24 +489,8 @@ def test_uv_package_non_editable(tox_project: ToxProjectCreator, monkeypatch: py
 
     calls = [(i[0][0].conf.name, i[0][3].run_id, i[0][3].cmd) for i in execute_calls.call_args_list]
     uv = shutil.which("uv")
-    prompt = f"{project.path.name}[py]"
 
     expected = [
-        (
-            "py",
-            "venv",
-            [
-                uv,
-                "venv",
-                "-p",
-                sys.executable,
-                "--allow-existing",
-                f"--prompt={prompt}",
-                "--python-preference",
-                "system",
-                str(project.path / ".tox" / "py"),
-            ],
-        ),
         (
             "py",
             "uv-sync",
@@ -692,24 +545,8 @@ def test_uv_package_uv_editable(tox_project: ToxProjectCreator, monkeypatch: pyt
 
     calls = [(i[0][0].conf.name, i[0][3].run_id, i[0][3].cmd) for i in execute_calls.call_args_list]
     uv = shutil.which("uv")
-    prompt = f"{project.path.name}[py]"
 
     expected = [
-        (
-            "py",
-            "venv",
-            [
-                uv,
-                "venv",
-                "-p",
-                sys.executable,
-                "--allow-existing",
-                f"--prompt={prompt}",
-                "--python-preference",
-                "system",
-                str(project.path / ".tox" / "py"),
-            ],
-        ),
         (
             "py",
             "uv-sync",
@@ -742,24 +579,8 @@ def test_skip_uv_package_skip(tox_project: ToxProjectCreator, monkeypatch: pytes
 
     calls = [(i[0][0].conf.name, i[0][3].run_id, i[0][3].cmd) for i in execute_calls.call_args_list]
     uv = shutil.which("uv")
-    prompt = f"{project.path.name}[py]"
 
     expected = [
-        (
-            "py",
-            "venv",
-            [
-                uv,
-                "venv",
-                "-p",
-                sys.executable,
-                "--allow-existing",
-                f"--prompt={prompt}",
-                "--python-preference",
-                "system",
-                str(project.path / ".tox" / "py"),
-            ],
-        ),
         (
             "py",
             "uv-sync",
@@ -793,23 +614,7 @@ def test_uv_lock_ith_resolution(tox_project: ToxProjectCreator) -> None:
 
     calls = [(i[0][0].conf.name, i[0][3].run_id, i[0][3].cmd) for i in execute_calls.call_args_list]
     uv = shutil.which("uv")
-    prompt = f"{project.path.name}[py]"
     expected = [
-        (
-            "py",
-            "venv",
-            [
-                uv,
-                "venv",
-                "-p",
-                sys.executable,
-                "--allow-existing",
-                f"--prompt={prompt}",
-                "--python-preference",
-                "system",
-                str(project.path / ".tox" / "py"),
-            ],
-        ),
         (
             "py",
             "uv-sync",
@@ -847,23 +652,7 @@ commands = [["python", "hello"]]
 
     calls = [(i[0][0].conf.name, i[0][3].run_id, i[0][3].cmd) for i in execute_calls.call_args_list]
     uv = shutil.which("uv")
-    prompt = f"{project.path.name}[py]"
     expected = [
-        (
-            "py",
-            "venv",
-            [
-                uv,
-                "venv",
-                "-p",
-                sys.executable,
-                "--allow-existing",
-                f"--prompt={prompt}",
-                "--python-preference",
-                "system",
-                str(project.path / ".tox" / "py"),
-            ],
-        ),
         (
             "py",
             "uv-sync",
@@ -910,3 +699,94 @@ def test_uv_lock_recreate_reinstall(
     calls = [(i[0][0].conf.name, i[0][3].run_id, i[0][3].cmd) for i in execute_calls.call_args_list]
     uv_sync_call = next(c for c in calls if c[1] == "uv-sync")
     assert uv_sync_call[2].count("--reinstall") == expected_count
+
+
+@pytest.mark.usefixtures("clear_python_preference_env_var")
+def test_uv_lock_sync_skipped_when_unchanged(tox_project: ToxProjectCreator) -> None:
+    project = tox_project({
+        "tox.ini": "[testenv]\nrunner = uv-venv-lock-runner\npackage = skip",
+        "pyproject.toml": "[project]\nname = 'demo'\nversion = '1'",
+        "uv.lock": "version = 1\n",
+    })
+    execute_calls = project.patch_execute(lambda r: 0 if r.run_id != "venv" else None)
+
+    def sync_calls() -> int:
+        return sum(i[0][3].run_id == "uv-sync" for i in execute_calls.call_args_list)
+
+    project.run("run", "--notest").assert_success()
+    assert sync_calls() == 1
+
+    result = project.run("run", "--notest", "-v")
+    result.assert_success()
+    assert sync_calls() == 1
+    assert "skip uv sync, the lock, project and environment are unchanged" in result.out
+
+    (project.path / "uv.lock").write_text("version = 1\nrevision = 3\n")
+    project.run("run", "--notest").assert_success()
+    assert sync_calls() == 2
+
+
+@pytest.mark.usefixtures("clear_python_preference_env_var")
+def test_uv_lock_sync_skipped_when_sources_unchanged(tox_project: ToxProjectCreator) -> None:
+    project = tox_project({
+        "tox.ini": "[testenv]\nrunner = uv-venv-lock-runner\npackage = wheel",
+        "pyproject.toml": "[project]\nname = 'demo'\nversion = '1'",
+        "uv.lock": "version = 1\n",
+        "demo.py": "",
+    })
+    execute_calls = project.patch_execute(lambda r: 0 if r.run_id != "venv" else None)
+
+    def sync_calls() -> int:
+        return sum(i[0][3].run_id == "uv-sync" for i in execute_calls.call_args_list)
+
+    project.run("run", "--notest").assert_success()
+    project.run("run", "--notest").assert_success()
+    assert sync_calls() == 1
+
+    (project.path / "demo.py").write_text("value = 1\n")
+    project.run("run", "--notest").assert_success()
+    assert sync_calls() == 2
+
+
+@pytest.mark.usefixtures("clear_python_preference_env_var")
+def test_uv_lock_sync_skipped_when_local_sources_unchanged(tox_project: ToxProjectCreator) -> None:
+    lock = """
+    version = 1
+    [[package]]
+    name = "demo"
+    source = { editable = "." }
+    [[package]]
+    name = "lib"
+    source = { directory = "lib" }
+    [[package]]
+    name = "vendored"
+    source = { path = "vendor/vendored-1.0-py3-none-any.whl" }
+    """
+    project = tox_project({
+        "tox.ini": "[testenv]\nrunner = uv-venv-lock-runner\npackage = skip",
+        "pyproject.toml": "[project]\nname = 'demo'\nversion = '1'",
+        "uv.lock": lock,
+        "lib": {"pyproject.toml": "[project]\nname = 'lib'\nversion = '1'"},
+        "vendor": {"vendored-1.0-py3-none-any.whl": "a"},
+    })
+    execute_calls = project.patch_execute(lambda r: 0 if r.run_id != "venv" else None)
+
+    def sync_calls() -> int:
+        return sum(i[0][3].run_id == "uv-sync" for i in execute_calls.call_args_list)
+
+    project.run("run", "--notest").assert_success()
+    project.run("run", "--notest").assert_success()
+    assert sync_calls() == 1
+
+    (project.path / "lib" / "pyproject.toml").write_text("[project]\nname = 'lib'\nversion = '2'")
+    project.run("run", "--notest").assert_success()
+    assert sync_calls() == 2
+
+    (project.path / "vendor" / "vendored-1.0-py3-none-any.whl").write_text("b")
+    project.run("run", "--notest").assert_success()
+    assert sync_calls() == 3
+
+    (project.path / "uv.lock").write_text("version = [")  # uv reports it, the sync runs regardless
+    project.run("run", "--notest").assert_success()
+    project.run("run", "--notest").assert_success()
+    assert sync_calls() == 4
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import shutil
+import subprocess
+import sys
 from typing import TYPE_CHECKING
 
 import pytest
 
+from tox_uv._fingerprint import fingerprint
+
 if TYPE_CHECKING:
     from pathlib import Path
 
+    from pytest_mock import MockerFixture
     from tox.pytest import ToxProjectCreator
 
 
@@ -87,6 +93,36 @@ def test_uv_package_workspace(tox_project: ToxProjectCreator, demo_pkg_workspace
     result.assert_success()
 
 
+def test_uv_package_workspace_with_several_members(tox_project: ToxProjectCreator, demo_pkg_workspace: Path) -> None:
+    root = (demo_pkg_workspace / "pyproject.toml").read_text(encoding="utf-8")
+    root = root.replace('"demo-foo", ', '"demo-foo", "demo-bar", ')
+    root = root.replace("sources.demo-foo =", "sources.demo-bar = { workspace = true }\nsources.demo-foo =")
+    bar = '[build-system]\nbuild-backend = "uv_build"\nrequires = [ "uv-build>=0.8.9,<0.9" ]\n'
+    bar += '[project]\nname = "demo-bar"\nversion = "0.1.0"\n'
+    files = {
+        "tox.ini": "[testenv]\npackage = wheel\ncommands = python -c 'import demo_bar, demo_foo'",
+        "pyproject.toml": root,
+        "packages": {"demo_bar": {"pyproject.toml": bar, "src": {"demo_bar": {"__init__.py": ""}}}},
+    }
+    project = tox_project(files, base=demo_pkg_workspace)
+    result = project.run()
+    result.assert_success()
+
+
+@pytest.mark.parametrize("package", ["uv", "uv-editable"])
+def test_uv_package_workspace_reinstalls_only_projects(
+    tox_project: ToxProjectCreator, demo_pkg_workspace: Path, package: str
+) -> None:
+    project = tox_project({"tox.ini": f"[testenv]\npackage = {package}"}, base=demo_pkg_workspace)
+    execute_calls = project.patch_execute(lambda r: 0 if r.run_id == "install_package" else None)
+    project.run().assert_success()
+    installs = [i[0][3].cmd for i in execute_calls.call_args_list if i[0][3].run_id == "install_package"]
+    assert len(installs) == 1
+    assert "--reinstall" not in installs[0]
+    assert "--reinstall-package=demo-root" in installs[0]
+    assert "--reinstall-package=demo-foo" in installs[0]
+
+
 def test_uv_package_no_pyproject(tox_project: ToxProjectCreator, demo_pkg_no_pyproject: Path) -> None:
     """Tests ability to install uv workspace projects."""
     ini = """
@@ -98,3 +134,112 @@ def test_uv_package_no_pyproject(tox_project: ToxProjectCreator, demo_pkg_no_pyp
     project = tox_project({"tox.ini": ini}, base=demo_pkg_no_pyproject)
     result = project.run()
     result.assert_success()
+
+
+def test_uv_package_installed_with_its_dependencies(tox_project: ToxProjectCreator) -> None:
+    toml = """
+    [build-system]
+    requires = ["setuptools>=61"]
+    build-backend = "setuptools.build_meta"
+    [project]
+    name = "demo"
+    version = "0.1"
+    dependencies = ["tomli"]
+    """
+    project = tox_project({"tox.ini": "[testenv]\npackage=wheel", "pyproject.toml": toml, "demo.py": ""})
+    execute_calls = project.patch_execute(lambda _: None)
+    project.run().assert_success()
+    installs = [
+        i[0][3].cmd for i in execute_calls.call_args_list if i[0][0].conf.name == "py" and "install" in i[0][3].run_id
+    ]
+    assert len(installs) == 1
+    assert "--reinstall-package=demo" in installs[0]
+    assert "tomli" in installs[0]
+    assert "--no-deps" not in installs[0]
+
+    execute_calls.reset_mock()
+    project.run().assert_success()
+    installs = [
+        i[0][3].cmd for i in execute_calls.call_args_list if i[0][0].conf.name == "py" and "install" in i[0][3].run_id
+    ]
+    assert len(installs) == 1
+    assert "--no-deps" in installs[0]
+    assert "tomli" not in installs[0]
+
+
+def test_uv_package_reinstall_skipped_for_unchanged_sources(tox_project: ToxProjectCreator) -> None:
+    toml = """
+    [build-system]
+    requires = ["setuptools>=61"]
+    build-backend = "setuptools.build_meta"
+    [project]
+    name = "demo"
+    version = "0.1"
+    """
+    project = tox_project({"tox.ini": "[testenv]\npackage=uv", "pyproject.toml": toml, "demo.py": ""})
+    execute_calls = project.patch_execute(lambda _: None)
+    project.run().assert_success()
+    assert [i[0][3].run_id for i in execute_calls.call_args_list].count("install_package") == 1
+
+    execute_calls.reset_mock()
+    result = project.run("-v")
+    result.assert_success()
+    assert "install_package" not in [i[0][3].run_id for i in execute_calls.call_args_list]
+    assert "sources unchanged" in result.out
+
+    execute_calls.reset_mock()
+    (project.path / "demo.py").write_text("value = 1\n")
+    project.run().assert_success()
+    assert [i[0][3].run_id for i in execute_calls.call_args_list].count("install_package") == 1
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+def test_uv_package_reinstalled_after_commit(tox_project: ToxProjectCreator) -> None:
+    toml = '[build-system]\nrequires = ["setuptools>=61"]\nbuild-backend = "setuptools.build_meta"\n'
+    toml += '[project]\nname = "demo"\nversion = "0.1"\n'
+    files = {"tox.ini": "[testenv]\npackage=uv", "pyproject.toml": toml, "demo.py": "", ".gitignore": ".tox\n"}
+    project = tox_project(files)
+    git = ["git", "-C", str(project.path), "-c", "user.name=a", "-c", "user.email=a@b", "-c", "commit.gpgsign=false"]
+    subprocess.run([*git, "init", "-q"], check=True)
+    subprocess.run([*git, "add", "-A"], check=True)
+    subprocess.run([*git, "commit", "-q", "-m", "first"], check=True)
+    execute_calls = project.patch_execute(lambda _: None)
+    project.run().assert_success()
+
+    execute_calls.reset_mock()
+    project.run().assert_success()  # the build output setuptools leaves in the tree is not a change
+    assert "install_package" not in [i[0][3].run_id for i in execute_calls.call_args_list]
+
+    subprocess.run([*git, "commit", "-q", "--allow-empty", "-m", "second"], check=True)
+    project.run().assert_success()
+    assert [i[0][3].run_id for i in execute_calls.call_args_list].count("install_package") == 1
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="creates a dangling symlink")
+def test_uv_package_fingerprint_without_git(tmp_path: Path, mocker: MockerFixture) -> None:
+    mocker.patch("tox_uv._fingerprint.shutil.which", return_value=None)
+    root, index = tmp_path / "src", tmp_path / "index.json"
+    (root / "work").mkdir(parents=True)
+    (root / "__pycache__").mkdir()
+    (root / "demo.py").write_text("")
+    (root / "broken").symlink_to(root / "missing")
+    first = fingerprint(root, index, exclude=root / "work")
+
+    (root / "work" / "out").write_text("")
+    (root / "__pycache__" / "demo.pyc").write_text("")
+    assert fingerprint(root, index, exclude=root / "work") == first
+
+    (root / "demo.py").write_text("value = 1\n")
+    assert fingerprint(root, index, exclude=root / "work") != first
+
+
+@pytest.mark.parametrize("fails", ["start", "wait"])
+def test_uv_package_fingerprint_git_failure_walks_tree(tmp_path: Path, mocker: MockerFixture, fails: str) -> None:
+    (tmp_path / "demo.py").write_text("")
+    index = tmp_path.parent / f"{tmp_path.name}-index.json"
+    mocker.patch("tox_uv._fingerprint.shutil.which", return_value=None)
+    expected = fingerprint(tmp_path, index)
+    mocker.patch("tox_uv._fingerprint.shutil.which", return_value="git")
+    popen = mocker.patch("tox_uv._fingerprint.subprocess.Popen", side_effect=OSError if fails == "start" else None)
+    popen.return_value.communicate.side_effect = subprocess.TimeoutExpired("git", 30)
+    assert fingerprint(tmp_path, index) == expected
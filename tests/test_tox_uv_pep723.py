@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import sys
-from pathlib import Path
 from textwrap import dedent
 from typing import TYPE_CHECKING
 
@@ -170,10 +169,9 @@ def test_uses_uv_venv(tox_project: ToxProjectCreator, runner: str) -> None:
     """)
     result, execute_calls = _run(tox_project, {"tox.ini": _tox_ini(runner=runner), "check.py": script}, "-vv")
     result.assert_success()
-    venv_calls = [i[0][3].cmd for i in execute_calls.call_args_list if i[0][3].run_id == "venv"]
-    assert venv_calls
-    assert Path(venv_calls[0][0]).stem == "uv"
-    assert venv_calls[0][1] == "venv"
+    # the interpreter is already known, so the environment is laid out the way uv venv would without running it
+    assert not [i for i in execute_calls.call_args_list if i[0][3].run_id == "venv"]
+    assert "include-system-site-packages = false" in (result.cwd / ".tox" / "check" / "pyvenv.cfg").read_text()
 
 
 @pytest.mark.parametrize(
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from typing import TYPE_CHECKING
+
+from tox.tox_env.register import ToxEnvRegister
+
+from tox_uv._package import UvVenvCmdBuilder, UvVenvPep517Packager
+from tox_uv._run import UvVenvRunner
+from tox_uv._run_lock import UvVenvLockRunner
+from tox_uv.plugin import tox_register_tox_env
+
+if TYPE_CHECKING:
+    from tox.pytest import ToxProjectCreator
+
+# every tox invocation, tox l and shell completion included, imports these; raise it only for a module that must load
+_MODULE_BUDGET = 23
+
+
+def test_plugin_import_budget() -> None:
+    script = (
+        "import json, sys\n"
+        "import tox.plugin.manager\n"  # tox imports its own environments, and their dependencies, before any plugin
+        "before = set(sys.modules)\n"
+        "import tox_uv.plugin\n"
+        "print(json.dumps(sorted(set(sys.modules) - before)))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+
+    added = json.loads(result.stdout)
+    assert [i for i in added if i.split(".")[0] != "tox_uv"] == []  # no dependency tox does not load itself
+    assert len(added) <= _MODULE_BUDGET, added
+
+
+def test_plugin_registers_environment_types() -> None:
+    register = ToxEnvRegister()
+    tox_register_tox_env(register)
+
+    assert register.runner("uv-venv-runner") is UvVenvRunner
+    assert register.runner("uv-venv-lock-runner") is UvVenvLockRunner
+    assert register.default_env_runner == "uv-venv-runner"
+    assert register.package("uv-venv-pep-517") is UvVenvPep517Packager
+    assert register.package("uv-venv-cmd-builder") is UvVenvCmdBuilder
+
+
+def test_plugin_default_runner(tox_project: ToxProjectCreator) -> None:
+    project = tox_project({"tox.ini": "[testenv]\npackage=skip\ncommands=python -c 'print(1)'"})
+    result = project.run("c", "-e", "py", "-k", "runner")
+    result.assert_success()
+    assert "runner = uv-venv-runner" in result.out
@@ -1,21 +1,47 @@
 from __future__ import annotations
 
 import importlib.util
+import json
 import os
 import os.path
 import pathlib
 import platform
+import runpy
 import shutil
 import subprocess
 import sys
+import sysconfig
+import time
 from configparser import ConfigParser
-from typing import TYPE_CHECKING, get_args
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, cast, get_args
 from unittest import mock
 
+import filelock
 import pytest
 import tox.tox_env.errors
+from packaging.requirements import Requirement
+from platformdirs import user_cache_dir
 from tox.tox_env.python.api import PythonInfo, VersionInfo
 
+import tox_uv
+from tox_uv._cache import cache_dir
+from tox_uv._clone import _REFLINK
+from tox_uv._create import (
+    base_executable,
+    reference_venv,
+    relocate_venv,
+    repair_venv,
+    venv_matches,
+    write_venv,
+)
+from tox_uv._discovery import find_installation, find_interpreter, interpreter_info, interpreter_missing
+from tox_uv._interpreter import _LOADED, load_interpreter, query_interpreter, store_interpreter
+from tox_uv._layer import collect_layers, layer_conflicts
+from tox_uv._recreate import MISSING, cache_diff, leftovers, move_aside, restore
+from tox_uv._snapshot import rollback, take_snapshot
+from tox_uv._store import acquire_entry, release_entry, store_entry
+from tox_uv._uv import _UNSUPPORTED, _discover, ensure_uv_supports, find_uv
 from tox_uv._venv import PythonPreference, UvVenv
 
 if TYPE_CHECKING:
@@ -180,7 +206,7 @@ def test_uv_venv_spec_pypy(
 
     project = tox_project({"tox.ini": f"[tox]\nenv_list = {pypy}"})
     try:
-        result = project.run("config", "-vv")
+        result = project.run("run", "-vv")
     except tox.tox_env.errors.Skip:  # pragma: no cover (PyPy might be available on the system)
         stdout, _ = capfd.readouterr()
     else:  # pragma: no cover (PyPy might not be available on the system)
@@ -338,6 +364,28 @@ def test_uv_venv_skip_missing_interpreters_pass(tox_project: ToxProjectCreator)
     result.assert_failed(code=1)
 
 
+def test_uv_venv_skip_missing_interpreters_without_uv_venv(tox_project: ToxProjectCreator) -> None:
+    project = tox_project({
+        "tox.ini": "[tox]\nskip_missing_interpreters=true\n[testenv]\npackage=skip\nbase_python=1.0"
+    })
+    execute_calls = project.patch_execute(lambda _: 0)
+    result = project.run("-vv")
+    result.assert_failed(code=1)
+    assert "could not find python interpreter with spec(s): cpython1" in result.out
+    assert not execute_calls.call_args_list
+
+
+def test_uv_venv_skip_missing_interpreters_uv_venv_fails(tox_project: ToxProjectCreator) -> None:
+    ini = "[tox]\nskip_missing_interpreters=true\n[testenv]\npackage=skip\nuv_seed=true\nuv_relocatable=true\n"
+    project = tox_project({"tox.ini": ini + "system_site_packages=true"})
+    execute_calls = project.patch_execute(lambda r: 2 if r.run_id == "venv" else None)
+    result = project.run("-vv")
+    result.assert_failed(code=1)
+    assert "py: SKIP" in result.out
+    venv = next(i[0][3].cmd for i in execute_calls.call_args_list if i[0][3].run_id == "venv")
+    assert {"--seed", "--relocatable", "--system-site-packages"} <= set(venv)
+
+
 def test_uv_venv_platform_check(tox_project: ToxProjectCreator) -> None:
     project = tox_project({"tox.ini": f"[testenv]\nplatform={sys.platform}\npackage=skip"})
     result = project.run("-vv")
@@ -459,6 +507,218 @@ def test_uv_env_site_package_dir_conf(tox_project: ToxProjectCreator) -> None:
     assert path in result.out
 
 
+def test_uv_env_site_package_dir_conf_creates_nothing(tox_project: ToxProjectCreator) -> None:
+    ver = sys.version_info
+    ini = f"[tox]\nenv_list=py,{ver.major}.{ver.minor}\n[testenv]\npackage=skip\ncommands={{envsitepackagesdir}}"
+    project = tox_project({"tox.ini": ini})
+    execute_calls = project.patch_execute(lambda _: 0)
+    result = project.run("c", "-k", "commands")
+    result.assert_success()
+
+    assert not execute_calls.call_args_list
+    assert not (project.path / ".tox").exists()
+    for env in ("py", f"{ver.major}.{ver.minor}"):
+        if sys.platform == "win32":  # pragma: win32 cover
+            path = project.path / ".tox" / env / "Lib" / "site-packages"
+        else:  # pragma: win32 no cover
+            impl = "pypy" if sys.implementation.name.lower() == "pypy" else "python"
+            threaded = "t" if sysconfig.get_config_var("Py_GIL_DISABLED") and env == "py" else ""
+            path = project.path / ".tox" / env / "lib" / f"{impl}{ver.major}.{ver.minor}{threaded}" / "site-packages"
+        assert str(path) in result.out
+
+
+def test_uv_venv_created_without_uv(tox_project: ToxProjectCreator) -> None:
+    if base_executable(find_installation("uv", "none", sys.executable) or {}) is None:
+        pytest.skip("the running interpreter needs uv to set up environments")  # pragma: no cover
+    project = tox_project({"tox.ini": "[testenv]\npackage=skip\ncommands=python -c 'import sys; print(sys.prefix)'"})
+    execute_calls = project.patch_execute(lambda _: None)
+    result = project.run("-vv")
+    result.assert_success()
+
+    assert [i[0][3].run_id for i in execute_calls.call_args_list] == ["commands[0]"]
+    venv_dir = project.path / ".tox" / "py"
+    assert str(venv_dir) in result.out
+    assert f"prompt = {project.path.name}[py]" in (venv_dir / "pyvenv.cfg").read_text()
+    assert (venv_dir / "bin" / "activate").is_file()
+
+
+def test_uv_venv_seed_env_var_left_to_uv(tox_project: ToxProjectCreator) -> None:
+    ini = "[testenv]\npackage = skip\nset_env = UV_VENV_SEED = 1\ncommands = python -c 'import pip'"
+    result = tox_project({"tox.ini": ini}).run("run")
+    result.assert_success()
+    assert " venv> " in result.out
+
+
+@pytest.mark.skipif(sys.platform in {"win32", "darwin"}, reason="environments are set up by uv")
+def test_uv_venv_existing_validated_from_pyvenv_cfg(tmp_path: pathlib.Path) -> None:
+    installation = find_installation("uv", "none", sys.executable)
+    assert installation is not None
+    if (python := base_executable(installation)) is None:
+        pytest.skip("the running interpreter needs uv to set up environments")  # pragma: no cover
+    venv_dir = tmp_path / "venv"
+    reference = reference_venv(find_uv(), python, installation, relocatable=False)
+    assert reference is not None
+    assert write_venv(venv_dir, python, installation, reference, prompt="demo", system_site_packages=False)
+
+    assert venv_matches(venv_dir, python, installation, system_site_packages=False)
+    assert not venv_matches(venv_dir, python, installation, system_site_packages=True)
+    assert not venv_matches(venv_dir, python, {**installation, "version": "3.0.0"}, system_site_packages=False)
+    assert not venv_matches(tmp_path / "missing", python, installation, system_site_packages=False)
+    prefix = subprocess.check_output([venv_dir / "bin" / "python", "-c", "import sys; print(sys.prefix)"], text=True)
+    assert prefix.strip() == str(venv_dir)
+
+
+@pytest.mark.skipif(sys.platform in {"win32", "darwin"}, reason="environments are set up by uv")
+@pytest.mark.parametrize("relocatable", [False, True], ids=["absolute", "relocatable"])
+@pytest.mark.parametrize("system_site_packages", [False, True], ids=["isolated", "system-site-packages"])
+def test_uv_venv_written_like_uv_venv(tmp_path: pathlib.Path, relocatable: bool, system_site_packages: bool) -> None:
+    installation = find_installation("uv", "none", sys.executable)
+    assert installation is not None
+    if (python := base_executable(installation)) is None:
+        pytest.skip("the running interpreter needs uv to set up environments")  # pragma: no cover
+    reference = reference_venv(find_uv(), python, installation, relocatable=relocatable)
+    assert reference is not None
+    assert reference_venv(find_uv(), python, installation, relocatable=relocatable) == reference  # set up once
+    venv_dir, prompt = tmp_path / "venv", "demo[py]"
+    assert write_venv(
+        venv_dir, python, installation, reference, prompt=prompt, system_site_packages=system_site_packages
+    )
+    written = _venv_files(venv_dir)
+
+    shutil.rmtree(venv_dir)
+    cmd = [find_uv(), "venv", "-q", "-p", str(python), f"--prompt={prompt}", str(venv_dir)]
+    cmd.extend(["--relocatable"] * relocatable + ["--system-site-packages"] * system_site_packages)
+    subprocess.run(cmd, check=True)
+    assert written == _venv_files(venv_dir)
+
+
+def _venv_files(venv_dir: pathlib.Path) -> dict[str, str]:
+    result = {}
+    for path in sorted(venv_dir.rglob("*")):
+        name = str(path.relative_to(venv_dir))
+        if path.is_symlink():
+            result[name] = f"-> {path.readlink()}"
+        elif path.is_file():
+            result[name] = path.read_text(encoding="utf-8")
+    return result
+
+
+@pytest.mark.parametrize(
+    ("location", "prompt"),
+    [pytest.param("with space", "demo", id="location"), pytest.param("venv", "$demo", id="prompt")],
+)
+def test_uv_venv_write_needs_quoting(tmp_path: pathlib.Path, location: str, prompt: str) -> None:
+    installation = {"version": "3.12.0"}
+    python, venv_dir = pathlib.Path(sys.executable), tmp_path / location
+    assert not write_venv(venv_dir, python, installation, tmp_path, prompt=prompt, system_site_packages=False)
+    assert not venv_dir.exists()  # left to uv venv
+
+
+def test_uv_venv_reference_left_to_uv(tmp_path: pathlib.Path, mocker: MockerFixture) -> None:
+    installation = {"version": "3.12.0"}
+    python = pathlib.Path(sys.executable)
+    assert reference_venv(str(tmp_path / "missing"), python, installation, relocatable=False) is None
+    mocker.patch("subprocess.run", return_value=subprocess.CompletedProcess([], 2, "", "error"))
+    assert reference_venv(find_uv(), python, installation, relocatable=False) is None
+    mocker.patch("subprocess.run", side_effect=subprocess.TimeoutExpired("uv", 60))
+    assert reference_venv(find_uv(), python, installation, relocatable=False) is None
+    mocker.patch("tox_uv._create.cache_dir", return_value=tmp_path / "with space")
+    assert reference_venv(find_uv(), python, installation, relocatable=False) is None
+    assert not list(cache_dir().glob("references/*"))
+
+
+@pytest.mark.parametrize(
+    "installation",
+    [
+        pytest.param({"implementation": "pypy", "variant": "default"}, id="pypy"),
+        pytest.param({"implementation": "cpython", "variant": "default"}, id="no-path"),
+        pytest.param({"implementation": "cpython", "variant": "default", "path": "missing"}, id="missing"),
+    ],
+)
+def test_uv_venv_base_executable_left_to_uv(installation: dict[str, str]) -> None:
+    assert base_executable(installation) is None
+
+
+@pytest.mark.skipif(sys.platform in {"win32", "darwin"}, reason="environments are set up by uv")
+def test_uv_venv_base_executable_shim_left_to_uv(tmp_path: pathlib.Path) -> None:
+    shim = tmp_path / "python"
+    shim.write_text('#!/bin/sh\nexec python3 "$@"\n')
+    installation = {"implementation": "cpython", "variant": "default", "path": str(shim), "version": "3.12.0"}
+    assert base_executable(installation) is None
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses symlinks")
+def test_uv_venv_write_without_lib64(tmp_path: pathlib.Path) -> None:
+    installation = {"version": "3.12.0", "arch": "aarch32"}
+    reference = tmp_path / "reference"
+    (reference / "venv" / "bin").mkdir(parents=True)
+    for name in (".gitignore", "CACHEDIR.TAG", "pyvenv.cfg"):
+        (reference / "venv" / name).touch()
+    (reference / "origin").write_text(str(reference / "venv"), encoding="utf-8")
+    python = pathlib.Path(sys.executable)
+    assert write_venv(tmp_path / "venv", python, installation, reference, prompt="x", system_site_packages=False)
+    assert (tmp_path / "venv" / "bin" / "python").is_symlink()
+    assert not (tmp_path / "venv" / "lib64").exists()
+
+
+@pytest.mark.parametrize("config", [None, "[venv]\nversion_info = 3.x\n"], ids=["missing", "bad-version"])
+def test_uv_venv_repair_needs_config(tmp_path: pathlib.Path, config: str | None) -> None:
+    if config is not None:
+        (tmp_path / "pyvenv.cfg").write_text(config, encoding="utf-8")
+    assert not repair_venv(tmp_path, pathlib.Path(sys.executable), {"version": "3.12.0"})
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses symlinks")
+def test_uv_venv_relocate_files(tmp_path: pathlib.Path) -> None:
+    old, new = tmp_path / "old", tmp_path / "new"
+    (new / "bin").mkdir(parents=True)
+    (new / "pyvenv.cfg").write_text(f"prompt = {old}\n", encoding="utf-8")
+    (new / "bin" / "python").symlink_to("/usr/bin/python3")
+    (new / "bin" / "tool").symlink_to(old / "bin" / "python")
+    assert relocate_venv(new, str(old))
+    assert (new / "bin" / "tool").readlink() == new / "bin" / "python"
+    assert (new / "bin" / "python").readlink() == pathlib.Path("/usr/bin/python3")
+    assert (new / "pyvenv.cfg").read_text(encoding="utf-8") == f"prompt = {new}\n"
+
+    (new / "bin" / "launcher").write_bytes(b"\0" + str(old).encode())
+    assert not relocate_venv(new, str(old))
+
+
+def test_uv_venv_relocate_unreadable(tmp_path: pathlib.Path, mocker: MockerFixture) -> None:
+    (tmp_path / "pyvenv.cfg").write_text("home = /x\n", encoding="utf-8")
+    mocker.patch.object(pathlib.Path, "read_bytes", side_effect=PermissionError)
+    assert not relocate_venv(tmp_path, "/old")
+
+
+@pytest.mark.parametrize(
+    ("venv_scheme", "installed"),
+    [
+        pytest.param(True, True, id="venv-scheme"),
+        pytest.param(False, True, id="patched-scheme"),
+        pytest.param(True, False, id="not-installed"),
+    ],
+)
+def test_uv_env_site_package_dir_conf_from_interpreter_scheme(
+    tox_project: ToxProjectCreator, mocker: MockerFixture, venv_scheme: bool, installed: bool
+) -> None:
+    query = {"purelib": "lib/pure", "platlib": "lib64/plat", "scripts": "bin", "venv_scheme": venv_scheme}
+    query_interpreter = mocker.patch("tox_uv._venv.query_interpreter", return_value=query)
+    env = "py" if installed else f"{sys.version_info.major}.{sys.version_info.minor}"
+    if not installed:  # uv downloads it, so cannot be asked before
+        mocker.patch("tox_uv._venv.find_interpreter", return_value=None)
+    ini = "[testenv]\npackage=skip\ncommands={env_site_packages_dir} {env_site_packages_dir_plat}"
+    project = tox_project({"tox.ini": ini})
+    result = project.run("c", "-e", env, "-k", "commands")
+    result.assert_success()
+
+    env_dir = project.path / ".tox" / env
+    expected = venv_scheme and installed
+    assert query_interpreter.called is installed
+    # without the venv scheme the environment is created and asked instead
+    assert (f"{env_dir / 'lib' / 'pure'} {env_dir / 'lib64' / 'plat'}" in result.out) is expected
+    assert env_dir.exists() is not expected
+
+
 def test_uv_env_python_not_in_path(tox_project: ToxProjectCreator) -> None:
     # Make sure there is no pythonX.Y in the search path
     ver = sys.version_info
@@ -1013,25 +1273,386 @@ def test_uv_path_env_var_valid(tox_project: ToxProjectCreator, monkeypatch: pyte
     result.assert_success()
 
 
-def test_uv_version_timeout(tox_project: ToxProjectCreator, mocker: MockerFixture) -> None:
+def test_uv_version_timeout(
+    tox_project: ToxProjectCreator, mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("TOX_UV_PATH", "uv")  # logs the version, the environment itself is set up without uv
     mock_run = mocker.patch("subprocess.run", side_effect=subprocess.TimeoutExpired("uv", 5))
     project = tox_project({"tox.ini": "[testenv]\npackage=skip\ncommands=python --version"})
-    result = project.run()
+    result = project.run("-vv")
     result.assert_success()
     mock_run.assert_called()
 
 
-def test_uv_version_os_error(tox_project: ToxProjectCreator, mocker: MockerFixture) -> None:
+def test_uv_version_os_error(
+    tox_project: ToxProjectCreator, mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("TOX_UV_PATH", "uv")  # logs the version, the environment itself is set up without uv
     mock_run = mocker.patch("subprocess.run", side_effect=OSError("mock error"))
     project = tox_project({"tox.ini": "[testenv]\npackage=skip\ncommands=python --version"})
-    result = project.run()
+    result = project.run("-vv")
     result.assert_success()
     mock_run.assert_called()
 
 
+def test_uv_version_not_probed_unless_logged(tox_project: ToxProjectCreator, mocker: MockerFixture) -> None:
+    mock_run = mocker.patch("subprocess.run", return_value=subprocess.CompletedProcess([], 0, "", ""))
+    project = tox_project({"tox.ini": "[testenv]\npackage=skip\ncommands=python --version"})
+    result = project.run()
+    result.assert_success()
+    assert ["--version"] not in [call.args[0][1:] for call in mock_run.call_args_list]
+
+
+def test_uv_discovered_once_for_all_envs(
+    tox_project: ToxProjectCreator, mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("TOX_UV_PATH", "uv")  # logs the version, unlike a bundled uv
+    discover = mocker.patch("tox_uv._uv._discover", wraps=_discover)
+    mock_run = mocker.patch("subprocess.run", return_value=subprocess.CompletedProcess([], 0, "uv 1.0", ""))
+    ini = "[tox]\nenv_list=a,b,c\n[testenv]\npackage=skip\ncommands=python --version"
+    project = tox_project({"tox.ini": ini})
+    result = project.run("-vv")
+    result.assert_success()
+    assert discover.call_count == 1
+    assert [call.args[0][1:] for call in mock_run.call_args_list].count(["--version"]) == 1
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shell script as fake uv")
+def test_uv_capabilities_probed_once_and_persisted(tmp_path: pathlib.Path, mocker: MockerFixture) -> None:
+    fake_uv = tmp_path / "uv"
+    fake_uv.write_text(
+        '#!/bin/sh\nfor arg in "$@"; do\n  if [ "$arg" = "--only-group" ]; then\n'
+        "    echo \"error: unexpected argument '--only-group' found\" >&2\n    exit 2\n  fi\ndone\n"
+    )
+    fake_uv.chmod(0o755)
+
+    ensure_uv_supports(str(fake_uv), "sync", ["--group", "x", "--locked"])
+    with pytest.raises(tox.tox_env.errors.Fail, match=r"does not support --only-group for uv sync, upgrade uv"):
+        ensure_uv_supports(str(fake_uv), "sync", ["--only-group", "x"])
+
+    _UNSUPPORTED.clear()  # a new tox process reads the result from the cache without probing again
+    mock_run = mocker.patch("subprocess.run", side_effect=OSError)
+    with pytest.raises(tox.tox_env.errors.Fail, match=r"--only-group"):
+        ensure_uv_supports(str(fake_uv), "sync", ["--only-group=x"])
+    ensure_uv_supports(str(fake_uv), "pip install", ["--only-group"])
+    mock_run.assert_not_called()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shell script as fake uv")
+def test_uv_capabilities_all_flags_unsupported(tmp_path: pathlib.Path) -> None:
+    fake_uv = tmp_path / "uv"
+    fake_uv.write_text(
+        '#!/bin/sh\nfor arg in "$@"; do\n  case "$arg" in\n    --help) exit 0 ;;\n'
+        "    --*) echo \"error: unexpected argument '$arg' found\" >&2; exit 2 ;;\n  esac\ndone\n"
+    )
+    fake_uv.chmod(0o755)
+    with pytest.raises(tox.tox_env.errors.Fail, match=r"does not support --seed, --system-site-packages for uv venv"):
+        ensure_uv_supports(str(fake_uv), "venv", ["--seed", "--system-site-packages"])
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shell script as fake uv")
+def test_uv_capabilities_unknown_not_persisted(tmp_path: pathlib.Path, mocker: MockerFixture) -> None:
+    fake_uv = tmp_path / "uv"
+    fake_uv.write_text("#!/bin/sh\necho 'error: something else' >&2\nexit 2\n")
+    fake_uv.chmod(0o755)
+    dump = mocker.patch("tox_uv._uv.dump_json")
+    ensure_uv_supports(str(fake_uv), "venv", ["--seed"])  # uv reports the error itself if the flag is unknown
+
+    _UNSUPPORTED.clear()
+    mocker.patch("subprocess.run", side_effect=subprocess.TimeoutExpired("uv", 10))
+    ensure_uv_supports(str(fake_uv), "venv", ["--seed"])
+    ensure_uv_supports(str(tmp_path / "missing"), "venv", ["--seed"])
+    dump.assert_not_called()
+
+
+def test_uv_unsupported_flag_fails_before_venv(tox_project: ToxProjectCreator, mocker: MockerFixture) -> None:
+    mocker.patch("tox_uv._uv._probe_flags", side_effect=lambda _, cmd, __: ["--python-preference"] * (cmd == "venv"))
+    ini = "[testenv]\npackage=skip\nuv_seed=true\nuv_python_preference=only-managed"
+    project = tox_project({"tox.ini": ini})
+    execute_calls = project.patch_execute(lambda _: 0)
+    result = project.run()
+    result.assert_failed()
+    assert "does not support --python-preference for uv venv" in result.out
+    assert not execute_calls.call_args_list
+
+
+def test_uv_unsupported_flag_fails_before_pip_install(tox_project: ToxProjectCreator, mocker: MockerFixture) -> None:
+    unsupported = ["--reinstall-package"]
+    mocker.patch("tox_uv._uv._probe_flags", side_effect=lambda _, cmd, __: unsupported * (cmd == "pip install"))
+    toml = '[build-system]\nrequires = ["setuptools>=61"]\nbuild-backend = "setuptools.build_meta"\n'
+    toml += '[project]\nname = "demo"\nversion = "0.1"\n'
+    project = tox_project({"tox.ini": "[testenv]\npackage=uv", "pyproject.toml": toml})
+    execute_calls = project.patch_execute(lambda _: 0)
+    result = project.run()
+    result.assert_failed()
+    assert "does not support --reinstall-package for uv pip install" in result.out
+    assert "install_package" not in [i[0][3].run_id for i in execute_calls.call_args_list]
+
+
+def test_uv_venv_interpreters_resolved_with_one_query(tox_project: ToxProjectCreator, mocker: MockerFixture) -> None:
+    ver = sys.version_info
+    installation = {
+        "implementation": sys.implementation.name,
+        "version_parts": {"major": ver.major, "minor": ver.minor, "patch": ver.micro},
+        "variant": "freethreaded" if sysconfig.get_config_var("Py_GIL_DISABLED") else "default",
+        "path": sys.executable,
+    }
+    list_installations = mocker.patch("tox_uv._discovery._list_installations", return_value=[installation])
+    envs = f"{ver.major}.{ver.minor}-a,{ver.major}.{ver.minor}-b"
+    project = tox_project({"tox.ini": f"[tox]\nenv_list={envs}\n[testenv]\npackage=skip\nuv_seed=true"})
+    execute_calls = project.patch_execute(lambda _: None)
+    project.run("r").assert_success()
+    venvs = [i[0][3].cmd for i in execute_calls.call_args_list if i[0][3].run_id == "venv"]
+    assert len(venvs) == 2
+    assert all(cmd[2:4] == ["-p", sys.executable] for cmd in venvs)
+    list_installations.assert_called_once()
+
+
+def _listed(version: str, variant: str, path: str | None, key: str = "") -> dict[str, object]:
+    major, minor, patch = (int(i) for i in version.split("."))
+    parts = {"major": major, "minor": minor, "patch": patch}
+    arch = {"os": "linux", "arch": "x86_64", "libc": "gnu"}
+    where = None if path is None else str(pathlib.Path(path))
+    return {"key": key, "implementation": "cpython", "version_parts": parts, "variant": variant, "path": where, **arch}
+
+
+@pytest.mark.parametrize(
+    ("spec", "expected"),
+    [
+        ("cpython3.12", "/first/python3.12"),
+        ("cpython3", "/first/python3.12"),
+        ("cpython3.13+freethreaded", "/opt/python3.13t"),
+        ("cpython-3.12-linux-x86_64-gnu", "/first/python3.12"),
+        ("cpython-3.12-linux-aarch64-gnu", None),
+        ("pypy3.12", None),
+        ("cpython9.99", None),
+        ("3.12", None),
+    ],
+)
+def test_uv_find_interpreter(mocker: MockerFixture, spec: str, expected: str | None) -> None:
+    installations = [  # newest first, as uv lists them
+        _listed("3.14.0", "default", None),  # available download only
+        _listed("3.13.0", "freethreaded", "/opt/python3.13t"),  # not on PATH
+        _listed("3.12.5", "default", "/second/python3.12"),
+        _listed("3.12.4", "default", "/first/python3.12"),
+    ]
+    listing = subprocess.CompletedProcess([], 0, json.dumps(installations), "")
+    mock_run = mocker.patch("subprocess.run", return_value=listing)
+    mocker.patch.dict(os.environ, {"PATH": os.pathsep.join(["/first", "/second"])})
+
+    found = find_interpreter("uv", "only-system", spec)
+    assert find_interpreter("uv", "only-system", spec) == found
+    assert found == (None if expected is None else str(pathlib.Path(expected)))
+    find_interpreter("uv", "only-system", "cpython3.11")  # another request answered from the same listing
+    cmd = mock_run.call_args.args[0]
+    assert mock_run.call_count == 1  # the choice among the listed interpreters needs no uv python find
+    assert cmd[2] == "list"
+    assert cmd[-2:] == ["--python-preference", "only-system"]
+
+
+@pytest.mark.parametrize(
+    ("preference", "expected"),
+    [
+        pytest.param("none", "/uv/cpython-3.12.4-linux-x86_64-gnu/bin/python3.12", id="default"),
+        pytest.param("managed", "/uv/cpython-3.12.4-linux-x86_64-gnu/bin/python3.12", id="managed"),
+        pytest.param("system", "/usr/bin/python3.12", id="system"),
+    ],
+)
+def test_uv_find_interpreter_preference_order(mocker: MockerFixture, preference: str, expected: str) -> None:
+    installations = [
+        _listed("3.12.6", "default", "/opt/python3.12"),  # not on PATH, found by uv after those that are
+        _listed("3.12.5", "default", "/usr/bin/python3.12"),
+        _listed(
+            "3.12.4", "default", "/uv/cpython-3.12.4-linux-x86_64-gnu/bin/python3.12", "cpython-3.12.4-linux-x86_64-gnu"
+        ),
+    ]
+    mocker.patch("subprocess.run", return_value=subprocess.CompletedProcess([], 0, json.dumps(installations), ""))
+    mocker.patch.dict(os.environ, {"PATH": str(pathlib.Path("/usr/bin"))})
+    assert find_interpreter("uv", preference, "cpython3.12") == str(pathlib.Path(expected))
+
+
+@pytest.mark.parametrize(
+    "listing",
+    [
+        pytest.param(OSError(), id="no-uv"),
+        pytest.param(subprocess.CompletedProcess([], 2, "", "error"), id="failed"),
+        pytest.param(subprocess.CompletedProcess([], 0, "not json", ""), id="not-json"),
+        pytest.param(subprocess.CompletedProcess([], 0, "{}", ""), id="not-a-list"),
+    ],
+)
+def test_uv_find_interpreter_listing_unusable(mocker: MockerFixture, listing: object) -> None:
+    mocker.patch("subprocess.run", side_effect=[listing])
+    assert find_interpreter("uv", "none", "cpython3.12") is None
+    assert not interpreter_missing("uv", "none", "cpython3.12")  # each environment discovers its own
+
+
+@pytest.mark.parametrize(
+    ("listed", "expected"),
+    [
+        pytest.param([], None, id="not-python"),
+        pytest.param([{"implementation": "cpython", "version": "3.x"}], None, id="bad-version"),
+        pytest.param([{"implementation": "cpython", "version": "3.12.1"}], "3.12.1", id="uncached"),
+    ],
+)
+def test_uv_interpreter_info_from_uv(
+    tmp_path: pathlib.Path, mocker: MockerFixture, listed: list[dict[str, str]], expected: str | None
+) -> None:
+    mocker.patch("tox_uv._discovery._list_installations", return_value=listed)
+    store = mocker.patch("tox_uv._discovery.store_interpreter")
+    info = interpreter_info("uv", tmp_path / "missing")  # cannot be keyed, so is not stored
+    assert (info.version if info else None) == expected
+    store.assert_not_called()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Bug https://github.com/tox-dev/tox-uv/issues/193")
+def test_uv_python_spec_for_path_from_uv(tmp_path: pathlib.Path, mocker: MockerFixture) -> None:
+    python = tmp_path / "python3"
+    python.write_bytes(b"")
+    found = {
+        "implementation": "cpython",
+        "version": "3.14.0rc2",
+        "variant": "freethreaded",
+        "os": "linux",
+        "arch": "x86_64",
+    }
+    list_installations = mocker.patch("tox_uv._discovery._list_installations", return_value=[found])
+
+    spec = UvVenv.python_spec_for_path(python)
+    assert str(spec) == "PythonSpec(implementation=cpython, major=3, minor=14, architecture=64, free_threaded=True)"
+    assert list_installations.call_args.args[2] == str(python)
+
+    _LOADED.clear()  # a new tox process reads the result from the cache without asking uv again
+    list_installations.reset_mock()
+    info = UvVenv._get_interpreter_info(python)  # ruff:ignore[private-member-access]
+    assert (info.implementation, info.version_info[:4], info.platform) == ("CPython", (3, 14, 0, "candidate"), "linux")
+    list_installations.assert_not_called()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="site-packages is not queried on Windows")
+def test_uv_env_site_package_dirs_from_query(tox_project: ToxProjectCreator, mocker: MockerFixture) -> None:
+    query = {"purelib": "lib/python3.13t/site-packages", "platlib": "lib64/python3.13t/site-packages"}
+    mocker.patch("tox_uv._venv.load_interpreter", return_value=query)
+    command = "python -c 'print(\"{env_site_packages_dir} {env_site_packages_dir_plat}\")'"
+    ini = f"[testenv]\npackage=skip\ncommands={command}"
+    project = tox_project({"tox.ini": ini})
+    result = project.run("r", "-e", "py")
+    result.assert_success()
+
+    env_dir = project.path / ".tox" / "py"
+    assert f"{env_dir / query['purelib']} {env_dir / query['platlib']}" in result.out
+
+
+def test_uv_venv_query_not_cached_without_key(tox_project: ToxProjectCreator, mocker: MockerFixture) -> None:
+    mocker.patch("tox_uv._venv.interpreter_key", return_value=None)
+    store = mocker.patch("tox_uv._venv.store_interpreter")
+    project = tox_project({
+        "tox.ini": "[testenv]\npackage=skip\ncommands=python -c 'print(\"{env_site_packages_dir}\")'"
+    })
+    project.run("r").assert_success()
+    store.assert_not_called()
+
+
+@pytest.mark.skipif(sys.platform in {"win32", "darwin"}, reason="environments are set up by uv")
+def test_uv_venv_set_up_for_other_interpreter_left_to_uv(tox_project: ToxProjectCreator) -> None:
+    project = tox_project({"tox.ini": "[testenv]\npackage=skip"})
+    project.run("r").assert_success()
+    env_dir = project.path / ".tox" / "py"
+    cfg = env_dir / "pyvenv.cfg"
+    cfg.write_text(cfg.read_text(encoding="utf-8").replace("version_info = ", "version_info = 0"), encoding="utf-8")
+    (env_dir / ".tox-info.json").unlink()  # as if set up outside of tox
+
+    execute_calls = project.patch_execute(lambda _: None)
+    project.run("r").assert_success()
+    assert "venv" in [i[0][3].run_id for i in execute_calls.call_args_list]
+
+
+def test_uv_venv_query_cached_across_runs(tox_project: ToxProjectCreator) -> None:
+    ini = "[tox]\nenv_list=a,b\n[testenv]\npackage=skip\ncommands=python -c 'print(\"{env_site_packages_dir}\")'"
+    project = tox_project({"tox.ini": ini})
+    execute_calls = project.patch_execute(lambda _: None)
+    project.run("r").assert_success()
+    _LOADED.clear()  # a new tox process reads the result from the cache without querying again
+    project.run("r").assert_success()
+
+    run_ids = [call.args[3].run_id for call in execute_calls.call_args_list]
+    assert run_ids.count("venv-query") == 1  # both runs and both environments share the same base interpreter
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shell script as fake interpreter")
+@pytest.mark.parametrize("script", ["exit 1", "echo not-json", "echo '[1]'"])
+def test_uv_query_interpreter_unusable(tmp_path: pathlib.Path, script: str) -> None:
+    python = tmp_path / "python"
+    python.write_text(f"#!/bin/sh\n{script}\n")
+    python.chmod(0o755)
+    assert query_interpreter(python) is None
+    assert query_interpreter(tmp_path / "missing") is None
+
+
+def test_uv_query_interpreter_cached(mocker: MockerFixture) -> None:
+    result = query_interpreter(pathlib.Path(sys.executable))
+    assert result is not None
+    assert result["venv_scheme"] is ("venv" in sysconfig.get_scheme_names())
+    run = mocker.patch("subprocess.run")
+    assert query_interpreter(pathlib.Path(sys.executable)) == result
+    run.assert_not_called()
+
+
+def _run_query(capsys: pytest.CaptureFixture[str]) -> dict[str, Any]:
+    runpy.run_path(str(pathlib.Path(tox_uv.__file__).parent / "_venv_query.py"))
+    return cast("dict[str, Any]", json.loads(capsys.readouterr().out))
+
+
+@pytest.mark.parametrize(
+    ("confstr", "target", "libc"),
+    [
+        pytest.param(ValueError, "x86_64-linux-musl", ["musl", ""], id="musl"),
+        pytest.param(AttributeError, "", ["", ""], id="no-confstr"),
+        pytest.param("", "x86_64-apple-darwin", ["", ""], id="other"),
+    ],
+)
+def test_uv_query_libc_without_glibc(
+    mocker: MockerFixture,
+    capsys: pytest.CaptureFixture[str],
+    confstr: str | type[Exception],
+    target: str,
+    libc: list[str],
+) -> None:
+    confstr_effect = confstr if isinstance(confstr, type) else None
+    mocker.patch("os.confstr", create=True, side_effect=confstr_effect, return_value=confstr)  # POSIX only
+    config_var = sysconfig.get_config_var
+    mocker.patch("sysconfig.get_config_var", side_effect=lambda k: target if k == "MULTIARCH" else config_var(k))
+    assert _run_query(capsys)["libc"] == libc
+
+
+def test_uv_query_markers_of_prerelease(mocker: MockerFixture, capsys: pytest.CaptureFixture[str]) -> None:
+    version = SimpleNamespace(major=3, minor=15, micro=0, releaselevel="beta", serial=2)
+    mocker.patch.object(sys, "implementation", SimpleNamespace(**{**vars(sys.implementation), "version": version}))
+    assert _run_query(capsys)["markers"]["implementation_version"] == "3.15.0b2"
+
+
+def test_uv_interpreter_store_drops_previous_builds() -> None:
+    store_interpreter("/usr/bin/python|1|10|uv", {"build": 1})
+    store_interpreter("/usr/bin/python|1|10|venv", {"build": 1})  # same build, queried another way
+    store_interpreter("/usr/bin/python|2|10|uv", {"build": 2})  # upgraded in place
+    _LOADED.clear()
+    assert load_interpreter("/usr/bin/python|1|10|uv") is None
+    assert load_interpreter("/usr/bin/python|1|10|venv") is None
+    assert load_interpreter("/usr/bin/python|2|10|uv") == {"build": 2}
+
+
+def test_uv_venv_unchanged_rerun_starts_only_commands(tox_project: ToxProjectCreator, mocker: MockerFixture) -> None:
+    project = tox_project({"tox.ini": "[testenv]\npackage=skip\ndeps=iniconfig\ncommands=python -c pass"})
+    project.run("r").assert_success()
+
+    execute_calls = project.patch_execute(lambda _: 0)
+    run = mocker.patch("subprocess.run", side_effect=AssertionError("no subprocess expected"))
+    project.run("r").assert_success()
+    assert [call.args[3].run_id for call in execute_calls.call_args_list] == ["commands[0]"]
+    run.assert_not_called()
+
+
 def test_uv_bundled_import_error(tox_project: ToxProjectCreator, mocker: MockerFixture) -> None:
     import builtins  # ruff:ignore[import-outside-top-level]
-    from typing import Any  # ruff:ignore[import-outside-top-level]
 
     original_import = builtins.__import__
 
@@ -1045,3 +1666,450 @@ def test_uv_bundled_import_error(tox_project: ToxProjectCreator, mocker: MockerF
     project = tox_project({"tox.ini": "[testenv]\npackage=skip\ncommands=python --version"})
     result = project.run()
     result.assert_success()
+
+
+def test_uv_venv_shared_env(tox_project: ToxProjectCreator) -> None:
+    project = tox_project({
+        "tox.ini": """
+    [tox]
+    env_list = a, b
+    [testenv]
+    package = skip
+    uv_shared_env = true
+    deps = tomli
+    """
+    })
+    result = project.run("run", "-e", "a,b")
+    result.assert_success()
+    venv_a, venv_b = (project.path / ".tox" / name / "venv" for name in ("a", "b"))
+    assert venv_a.readlink() == venv_b.readlink()
+    entry = venv_a.readlink().parent
+    assert len(list((entry / "refs").iterdir())) == 2
+
+    result = project.run("run", "-e", "a", "-r")
+    result.assert_success()
+    assert "remove shared environment" not in result.out
+    assert venv_a.readlink() == venv_b.readlink()
+
+    shutil.rmtree(project.path / ".tox" / "b")
+    result = project.run("run", "-e", "a", "-r")
+    result.assert_success()
+    assert f"remove shared environment {entry}" in result.out
+    assert _removed_in_background(entry)
+    assert [ref.read_text() for ref in (entry / "refs").iterdir()] == [str(project.path / ".tox" / "a")]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses symlinks")
+def test_uv_venv_shared_env_entry_removed_in_place(tmp_path: pathlib.Path, mocker: MockerFixture) -> None:
+    entry = store_entry({"demo": 1})
+    (entry / "venv").mkdir(parents=True)
+    acquire_entry(entry, tmp_path)
+    acquire_entry(entry, tmp_path)  # the pointer is left as is
+    assert (tmp_path / "venv").readlink() == entry / "venv"
+
+    mocker.patch("tox_uv._store.move_aside", return_value=None)  # e.g. a file in it is held open
+    release_entry(entry, tmp_path)
+    assert not entry.exists()
+
+
+def test_uv_venv_shared_env_unreadable_deps(tox_project: ToxProjectCreator) -> None:
+    project = tox_project({"tox.ini": "[testenv]\npackage = skip\nuv_shared_env = true\ndeps = -r missing.txt"})
+    result = project.run("run")
+    result.assert_failed()
+    assert "missing.txt" in result.out
+
+
+def test_uv_venv_shared_env_keyed_on_install_env_vars(tox_project: ToxProjectCreator) -> None:
+    project = tox_project({
+        "tox.ini": """
+    [testenv]
+    package = skip
+    uv_shared_env = true
+    [testenv:a]
+    setenv = UV_EXCLUDE_NEWER = 2024-01-01T00:00:00Z
+    [testenv:b]
+    setenv = UV_EXCLUDE_NEWER = 2025-01-01T00:00:00Z
+    [testenv:c]
+    setenv = UV_EXCLUDE_NEWER = 2025-01-01T00:00:00Z
+    """
+    })
+    project.run("run", "-e", "a,b,c").assert_success()
+    venv_a, venv_b, venv_c = (project.path / ".tox" / name / "venv" for name in ("a", "b", "c"))
+    assert venv_a.readlink() != venv_b.readlink()
+    assert venv_b.readlink() == venv_c.readlink()
+
+
+def test_uv_venv_shared_env_locked_while_commands_run(tox_project: ToxProjectCreator) -> None:
+    envs = pathlib.Path(os.environ["TOX_UV_CACHE_DIR"]) / "envs"
+    check = (
+        "import pathlib, sys, filelock; "
+        "lock = filelock.ReadWriteLock(next(pathlib.Path(sys.argv[1]).glob('*.db')), blocking=False); "
+        "lock.acquire_read(); lock.release(); print('readable'); "
+        "lock.acquire_write()"
+    )
+    ini = f"""
+    [testenv]
+    package = skip
+    uv_shared_env = true
+    allowlist_externals = *
+    commands = {sys.executable} -c "{check}" {envs}
+    """
+    result = tox_project({"tox.ini": ini}).run("run")
+    result.assert_failed()
+    assert "readable" in result.out
+    assert "could not be acquired" in result.err
+    (db,) = envs.glob("*.db")
+    lock = filelock.ReadWriteLock(db, blocking=False)
+    with lock.write_lock():  # released once the commands ran
+        pass
+
+
+def test_uv_venv_base_layer(tox_project: ToxProjectCreator) -> None:
+    project = tox_project({
+        "tox.ini": """
+    [tox]
+    env_list = a, b
+    [testenv]
+    package = skip
+    uv_base_deps = tomli
+    deps = iniconfig
+    commands = python -c 'import sys, tomli, iniconfig; print(sys.prefix, tomli.__file__)'
+    """
+    })
+    result = project.run("run", "-e", "a,b")
+    result.assert_success()
+    assert result.out.count("base-layer-install>") == 1
+    assert result.out.count("--excludes") == 2
+    site_packages = next((project.path / ".tox" / "b").glob("lib/*/site-packages"))
+    assert not (site_packages / "tomli").exists()
+    assert (site_packages / "iniconfig").exists()
+    layer = (site_packages / "_tox_uv_base_layer.pth").read_text().strip()
+    assert f"{project.path / '.tox' / 'b'} {layer}" in result.out
+
+
+def test_uv_venv_base_layer_skipped_for_conflicting_pin(tox_project: ToxProjectCreator) -> None:
+    ini = "[testenv]\npackage = skip\nuv_base_deps = tomli==2.0.1\ndeps = {}\n"
+    project = tox_project({"tox.ini": ini.format("tomli==2.0.2")})
+    result = project.run("run")
+    result.assert_success()
+    assert "skip base layer" in result.out
+    assert "tomli==2.0.2 (base layer has 2.0.1)" in result.out
+    assert "--excludes" not in result.out
+    site_packages = next((project.path / ".tox" / "py").glob("lib/*/site-packages"))
+    assert not (site_packages / "_tox_uv_base_layer.pth").exists()
+    assert (site_packages / "tomli-2.0.2.dist-info").exists()
+
+    (project.path / "tox.ini").write_text(ini.format("tomli>=2"), encoding="utf-8")
+    result = project.run("run", "-r")
+    result.assert_success()
+    assert "skip base layer" not in result.out
+    assert "--excludes" in result.out
+
+
+def test_uv_venv_base_layer_install_options(tox_project: ToxProjectCreator) -> None:
+    ini = "[testenv]\npackage = skip\nuv_base_deps = tomli\npip_pre = true\nuv_resolution = highest\n"
+    ini += "uv_python_preference = none\ndeps = -r missing.txt\n"
+    project = tox_project({"tox.ini": ini})
+    result = project.run("run")
+    result.assert_failed()  # reported by the install of the dependencies, after the layer is set up
+    assert "--python-preference" not in result.out
+    assert "--prerelease allow --resolution highest tomli" in result.out
+    assert "missing.txt" in result.out
+
+
+def test_uv_venv_base_layer_collected_once_unused(tox_project: ToxProjectCreator) -> None:
+    ini = "[testenv]\npackage = skip\nuv_base_deps = {}\n"
+    project = tox_project({"tox.ini": ini.format("tomli")})
+    project.run("run").assert_success()
+    site_packages = next((project.path / ".tox" / "py").glob("lib/*/site-packages"))
+    old = pathlib.Path((site_packages / "_tox_uv_base_layer.pth").read_text(encoding="utf-8").split("/venv/")[0])
+    assert old.is_dir()
+
+    (project.path / "tox.ini").write_text(ini.format("iniconfig"), encoding="utf-8")
+    result = project.run("run")
+    result.assert_success()
+    assert f"remove unused base layer {old}" in result.out
+    assert not old.exists()
+    assert (site_packages / "_tox_uv_base_layer.pth").read_text(encoding="utf-8").startswith(str(old.parent))
+
+
+def test_uv_venv_base_layer_collected_without_base_layer(tox_project: ToxProjectCreator) -> None:
+    project = tox_project({"tox.ini": "[testenv]\npackage = skip\nuv_base_deps = tomli\n"})
+    project.run("run").assert_success()
+    layers = cache_dir() / "layers"
+    assert [i for i in layers.iterdir() if i.is_dir()]
+
+    (project.path / "tox.ini").write_text("[testenv]\npackage = skip\n", encoding="utf-8")
+    result = project.run("run", "-r")
+    result.assert_success()
+    assert "remove unused base layer" in result.out
+    assert not [i for i in layers.iterdir() if i.is_dir() and not i.name.startswith(".")]
+
+
+def test_uv_venv_base_layer_collect_skips_busy_and_dangling(mocker: MockerFixture) -> None:
+    collect_layers()  # nothing built yet
+
+    busy, dangling = cache_dir() / "layers" / "busy", cache_dir() / "layers" / "dangling"
+    for entry in (busy, dangling):
+        (entry / "refs").mkdir(parents=True)
+    (dangling / "refs" / "gone").write_text(str(cache_dir() / "gone.pth"), encoding="utf-8")
+    mocker.patch("tox_uv._layer.move_aside", return_value=None)  # e.g. a file in it is held open
+    with filelock.FileLock(busy.with_name("busy.lock")):  # another tox process builds it
+        collect_layers()
+    assert busy.exists()
+    assert not dangling.exists()
+    assert layer_conflicts(dangling, [Requirement("tomli")], {}) == []  # nothing recorded for the layer
+
+
+def test_uv_cache_dir_default(mocker: MockerFixture) -> None:
+    mocker.patch.dict(os.environ, {"TOX_UV_CACHE_DIR": ""})
+    assert cache_dir() == pathlib.Path(user_cache_dir("tox-uv", appauthor=False))
+
+
+def test_uv_venv_recreate_moves_old_environment_aside(tox_project: ToxProjectCreator) -> None:
+    project = tox_project({"tox.ini": "[testenv]\npackage = skip\ndeps = tomli"})
+    project.run("run").assert_success()
+    env_dir = project.path / ".tox" / "py"
+    (env_dir / "marker").touch()
+
+    result = project.run("run", "-r")
+    result.assert_success()
+    assert not (env_dir / "marker").exists()
+    assert (env_dir / "pyvenv.cfg").exists()
+    assert _removed_in_background(env_dir)
+
+
+def test_uv_venv_recreate_package_env_moves_it_aside(tox_project: ToxProjectCreator) -> None:
+    toml = '[build-system]\nrequires = ["setuptools>=61"]\nbuild-backend = "setuptools.build_meta"\n'
+    toml += '[project]\nname = "demo"\nversion = "0.1"\n'
+    project = tox_project({"tox.ini": "[testenv]\npackage = wheel", "pyproject.toml": toml, "demo.py": ""})
+    project.run("run", "-r").assert_success()  # nothing to move aside yet
+    pkg_dir = project.path / ".tox" / ".pkg"
+    (pkg_dir / "marker").touch()
+
+    project.run("run", "-r").assert_success()
+    assert not (pkg_dir / "marker").exists()
+    assert _removed_in_background(pkg_dir)
+
+
+def test_uv_venv_recreate_deletes_when_move_fails(tox_project: ToxProjectCreator, mocker: MockerFixture) -> None:
+    project = tox_project({"tox.ini": "[testenv]\npackage = skip"})
+    project.run("run").assert_success()
+    env_dir = project.path / ".tox" / "py"
+    (env_dir / "marker").touch()
+
+    mocker.patch("tox_uv._venv.move_aside", return_value=None)  # e.g. a file in it is held open
+    project.run("run", "-r").assert_success()
+    assert not (env_dir / "marker").exists()
+    assert (env_dir / "pyvenv.cfg").exists()
+
+
+def test_uv_venv_recreate_failure_keeps_old_environment(tox_project: ToxProjectCreator) -> None:
+    project = tox_project({"tox.ini": "[testenv]\npackage = skip\ndeps = tomli"})
+    project.run("run").assert_success()
+    env_dir = project.path / ".tox" / "py"
+    (env_dir / "marker").touch()
+
+    project.patch_execute(lambda r: 1 if r.run_id == "install_deps" else None)
+    result = project.run("run", "-r")
+    result.assert_failed()
+    assert "restore previous environment" in result.out
+    assert (env_dir / "marker").exists()
+    assert _removed_in_background(env_dir)
+
+
+@pytest.mark.parametrize("tolerate", [True, False])
+def test_uv_venv_recreate_tolerated_change(tox_project: ToxProjectCreator, tolerate: bool) -> None:
+    ini = "[testenv]\npackage = skip\nuv_python_preference = system\n"
+    if tolerate:
+        ini += "uv_recreate_tolerate = python_preference\n"
+    project = tox_project({"tox.ini": ini})
+    project.run("run").assert_success()
+    (project.path / ".tox" / "py" / "marker").touch()
+
+    (project.path / "tox.ini").write_text(ini.replace("= system", "= only-system"), encoding="utf-8")
+    result = project.run("run", "--result-json", str(project.path / "result.json"))
+    result.assert_success()
+    change = "python changed python_preference='system'->'only-system'"
+    journal = json.loads((project.path / "result.json").read_text(encoding="utf-8"))["testenvs"]["py"]
+    if tolerate:
+        assert f"keep environment, tolerated {change}" in result.out
+        assert (project.path / ".tox" / "py" / "marker").exists()
+        assert "recreate" not in journal
+    else:
+        assert f"recreate env because {change}" in result.out
+        assert not (project.path / ".tox" / "py" / "marker").exists()
+        assert journal["recreate"] == {"python_preference": {"old": "system", "new": "only-system"}}
+
+
+def test_uv_venv_move_aside_puts_back_on_failure(tmp_path: pathlib.Path, mocker: MockerFixture) -> None:
+    env_dir = tmp_path / "env"
+    env_dir.mkdir()
+    for name in ("a", "b", "file.lock"):
+        (env_dir / name).touch()
+    rename, moved = pathlib.Path.rename, []
+
+    def fail_second(self: pathlib.Path, target: pathlib.Path) -> pathlib.Path:
+        if target.parent != env_dir:
+            if moved:
+                raise OSError(self)  # e.g. held open on Windows
+            moved.append(self)
+        return rename(self, target)
+
+    mocker.patch.object(pathlib.Path, "rename", fail_second)
+    assert move_aside(env_dir) is None
+    assert sorted(i.name for i in env_dir.iterdir()) == ["a", "b", "file.lock"]
+    assert not leftovers(env_dir)
+
+    mocker.patch.object(pathlib.Path, "mkdir", side_effect=PermissionError)  # e.g. a read-only parent folder
+    assert move_aside(env_dir) is None
+    assert sorted(i.name for i in env_dir.iterdir()) == ["a", "b", "file.lock"]
+
+
+def test_uv_venv_restore_when_failed_build_cannot_move(tmp_path: pathlib.Path, mocker: MockerFixture) -> None:
+    env_dir, aside = tmp_path / "env", tmp_path / "aside"
+    env_dir.mkdir()
+    aside.mkdir()
+    (aside / "old").touch()
+    mocker.patch("tox_uv._recreate.move_aside", return_value=None)
+    background = mocker.patch("tox_uv._recreate.remove_in_background")
+    restore(aside, env_dir)
+    assert (env_dir / "old").exists()
+    assert not aside.exists()
+    background.assert_not_called()
+
+
+def test_uv_venv_cache_diff_nested() -> None:
+    old = {"a": {"b": 1, "c": 2}, "e": [1]}
+    new = {"a": {"b": 1, "c": 3}, "d": 1, "e": [1]}
+    assert cache_diff(old, new) == {"a.c": (2, 3), "d": (MISSING, 1)}
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Windows launchers embed the location, these recreate")
+def test_uv_venv_relocated(tox_project: ToxProjectCreator) -> None:
+    ini = "[tox]\nwork_dir = {}\n[testenv]\npackage = skip\ndeps = pytest\ncommands = pytest --version\n"
+    project = tox_project({"tox.ini": ini.format("a")})
+    project.run("run").assert_success()
+
+    (project.path / "a").rename(project.path / "b")
+    (project.path / "tox.ini").write_text(ini.format("b"), encoding="utf-8")
+    result = project.run("run")
+    result.assert_success()
+    assert f"relocated environment from {project.path / 'a' / 'py'} to {project.path / 'b' / 'py'}" in result.out
+    assert "recreate env because" not in result.out
+    assert str(project.path / "a") not in (project.path / "b" / "py" / "bin" / "pytest").read_text(encoding="utf-8")
+
+
+def test_uv_venv_relocate_fails_recreates(tox_project: ToxProjectCreator) -> None:
+    ini = "[tox]\nwork_dir = {}\n[testenv]\npackage = skip\n"
+    project = tox_project({"tox.ini": ini.format("a")})
+    project.run("run").assert_success()
+    scripts = "Scripts" if sys.platform == "win32" else "bin"
+    (project.path / "a" / "py" / scripts / "launcher").write_bytes(b"\0" + str(project.path / "a" / "py").encode())
+
+    (project.path / "a").rename(project.path / "b")
+    (project.path / "tox.ini").write_text(ini.format("b"), encoding="utf-8")
+    result = project.run("run")
+    result.assert_success()
+    assert f"recreate env because environment moved from {project.path / 'a' / 'py'}" in result.out
+    assert not (project.path / "b" / "py" / scripts / "launcher").exists()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Windows launchers embed the location, these recreate")
+def test_uv_venv_relocated_with_tolerated_change(tox_project: ToxProjectCreator) -> None:
+    ini = "[tox]\nwork_dir = {}\n[testenv]\npackage = skip\nuv_recreate_tolerate = python_preference\n"
+    project = tox_project({"tox.ini": ini.format("a") + "uv_python_preference = system\n"})
+    project.run("run").assert_success()
+
+    (project.path / "a").rename(project.path / "b")
+    (project.path / "tox.ini").write_text(ini.format("b") + "uv_python_preference = only-system\n", encoding="utf-8")
+    result = project.run("run")
+    result.assert_success()
+    assert "keep environment, tolerated python changed" in result.out
+    assert f"relocated environment from {project.path / 'a' / 'py'} to {project.path / 'b' / 'py'}" in result.out
+
+
+def test_uv_venv_relocatable(tox_project: ToxProjectCreator) -> None:
+    project = tox_project({"tox.ini": "[testenv]\npackage = skip\nuv_relocatable = true"})
+    result = project.run("run")
+    result.assert_success()
+    assert "relocatable = true" in (project.path / ".tox" / "py" / "pyvenv.cfg").read_text(encoding="utf-8")
+
+
+def test_uv_venv_snapshot_rollback(tox_project: ToxProjectCreator) -> None:
+    ini = '[testenv]\npackage = skip\nuv_snapshot = true\ndeps = tomli\ncommands = python -c "{}"'
+    mutate = (
+        "import pathlib, shutil, tomli; p = pathlib.Path(tomli.__file__).parent; "
+        "shutil.rmtree(p); (p.parent / 'x.py').touch()"
+    )
+    project = tox_project({"tox.ini": ini.format(mutate)})
+    project.run("run").assert_success()
+    site_packages = next((project.path / ".tox" / "py").glob("lib*/*/site-packages"), None) or (
+        project.path / ".tox" / "py" / "Lib" / "site-packages"
+    )
+    assert not (site_packages / "tomli").exists()
+
+    (project.path / "tox.ini").write_text(ini.format("import tomli"), encoding="utf-8")
+    result = project.run("run")
+    result.assert_success()
+    assert "rolled back changes made to" in result.out
+    assert (site_packages / "tomli" / "__init__.py").exists()
+    assert not (site_packages / "x.py").exists()
+
+    result = project.run("run")
+    result.assert_success()
+    assert "rolled back" not in result.out
+
+
+def test_uv_venv_snapshot_replaced_entries(tmp_path: pathlib.Path) -> None:
+    def replace(path: pathlib.Path, content: str) -> None:  # like installers do, the snapshot links to the old file
+        (tmp_path / "staging").write_text(content, encoding="utf-8")
+        (tmp_path / "staging").replace(path)
+
+    (tmp_path / "kept").mkdir()
+    replace(tmp_path / "kept" / "a", "a")
+    (tmp_path / "folder").mkdir()
+    take_snapshot(tmp_path)
+    replace(tmp_path / "kept" / "a", "changed")
+    take_snapshot(tmp_path)  # updates the snapshot in place
+
+    replace(tmp_path / "kept" / "a", "again")
+    (tmp_path / "kept" / "new").mkdir()
+    (tmp_path / "folder").rmdir()
+    replace(tmp_path / "folder", "")
+    assert rollback(tmp_path)
+    assert (tmp_path / "kept" / "a").read_text(encoding="utf-8") == "changed"
+    assert not (tmp_path / "kept" / "new").exists()
+    assert (tmp_path / "folder").is_dir()
+
+    (tmp_path / "folder").rmdir()
+    replace(tmp_path / "folder", "")
+    take_snapshot(tmp_path)
+    shutil.rmtree(tmp_path / "kept")
+    (tmp_path / "folder").unlink()
+    (tmp_path / "folder").mkdir()
+    assert rollback(tmp_path)
+    assert (tmp_path / "folder").is_file()
+    assert (tmp_path / "kept" / "a").read_text(encoding="utf-8") == "changed"
+
+
+@pytest.mark.parametrize("reflink", [True, False], ids=["reflinked", "copied"])
+def test_uv_venv_snapshot_unchanged_by_writes_in_place(
+    tmp_path: pathlib.Path, mocker: MockerFixture, reflink: bool
+) -> None:
+    mocker.patch.dict(_REFLINK, {"supported": reflink})
+    mocker.patch("tox_uv._clone._reflink", side_effect=shutil.copy2)  # a file system with copy on write
+    (tmp_path / "a").write_text("a", encoding="utf-8")
+    take_snapshot(tmp_path)
+
+    with (tmp_path / "a").open("a", encoding="utf-8") as file_handler:  # a command writing into an installed file
+        file_handler.write("ppended")
+    assert rollback(tmp_path)
+    assert (tmp_path / "a").read_text(encoding="utf-8") == "a"
+
+
+def _removed_in_background(env_dir: pathlib.Path) -> bool:
+    deadline = time.monotonic() + 30
+    while list(env_dir.parent.glob(f".{env_dir.name}.old-*")) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return not list(env_dir.parent.glob(f".{env_dir.name}.old-*"))